@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+MyCreator Analytics ETL - Backfill em streaming
+===============================================
+
+Extrai o histórico de posts página a página e grava cada lote direto
+nos sinks, sem montar a lista completa de PostData em memória.
+
+Sinks:
+- parquet: snapshot Parquet da execução (SNAPSHOT_DIR ou --snapshot-dir; requer pyarrow)
+- sqlite: tabela local (--sqlite-path / --sqlite-table)
+- sheets: aba do Google Sheets (--sheets-tab; nunca a aba principal por padrão)
+
+Sem --sinks, grava no sqlite e também no parquet se SNAPSHOT_DIR (ou
+--snapshot-dir) estiver configurado e o pyarrow instalado.
+
+Uso:
+    python run_backfill.py --since 2025-01-01
+    python run_backfill.py --since 2025-01-01 --sinks parquet sqlite --workspace Curitiba
+    python run_backfill.py --sinks sheets --sheets-tab backfill_posts
+"""
+import argparse
+import sys
+from datetime import datetime
+
+from src.config import get_config, setup_logging
+from src.extract import MyCreatorExtractor, TARGET_WORKSPACES
+from src.load import get_sheets_session
+from src.snapshots import SnapshotStore
+from src.stream import ParquetSink, SheetsSink, SQLiteSink, StreamingPipeline
+from src.throttle import THROTTLE_STATS
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Backfill em streaming do ETL MyCreator")
+    parser.add_argument("--since", help="Data de corte YYYY-MM-DD (padrão: BACKFILL_SINCE)")
+    parser.add_argument("--limit", type=int, default=0,
+                        help="Máximo de planos por workspace (0 = sem limite)")
+    parser.add_argument("--workspace", nargs="+", help="Nomes dos workspaces (padrão: todos)")
+    parser.add_argument("--sinks", nargs="+", choices=["parquet", "sqlite", "sheets"],
+                        help="Destinos (padrão: sqlite, mais parquet se SNAPSHOT_DIR estiver configurado)")
+    parser.add_argument("--snapshot-dir", help="Diretório Parquet (padrão: SNAPSHOT_DIR)")
+    parser.add_argument("--sqlite-path", default="mycreator_backfill.db")
+    parser.add_argument("--sqlite-table", default="dados_brutos")
+    parser.add_argument("--sheets-tab", help="Aba de destino do sink sheets")
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = _parse_args()
+    config = get_config()
+    logger = setup_logging(debug=config.debug_mode)
+    run_at = datetime.now()
+
+    workspaces = TARGET_WORKSPACES
+    if args.workspace:
+        wanted = {name.lower() for name in args.workspace}
+        workspaces = [ws for ws in TARGET_WORKSPACES if ws["name"].lower() in wanted]
+        if not workspaces:
+            logger.error(f"❌ Nenhum workspace encontrado: {args.workspace}")
+            return 1
+
+    snapshot_dir = args.snapshot_dir or config.snapshot_dir
+    sink_names = args.sinks or (["parquet", "sqlite"] if snapshot_dir else ["sqlite"])
+
+    sinks = []
+    if "parquet" in sink_names:
+        if not snapshot_dir:
+            logger.error("❌ Sink parquet requer SNAPSHOT_DIR ou --snapshot-dir")
+            return 1
+        try:
+            store = SnapshotStore(snapshot_dir, config.snapshot_compression)
+        except ImportError as e:
+            if args.sinks:
+                logger.error(f"❌ Sink parquet: {e}")
+                return 1
+            logger.warning(f"⚠️ Sink parquet ignorado: {e}")
+            sink_names = [name for name in sink_names if name != "parquet"]
+        else:
+            sinks.append(ParquetSink(store, "posts", run_at))
+    if "sqlite" in sink_names:
+        sinks.append(SQLiteSink(args.sqlite_path, args.sqlite_table))
+    if "sheets" in sink_names:
+        if not args.sheets_tab:
+            logger.error("❌ Sink sheets requer --sheets-tab")
+            return 1
+        sinks.append(SheetsSink(get_sheets_session(config), args.sheets_tab))
+
+    logger.info("=" * 60)
+    logger.info("🌊 BACKFILL EM STREAMING")
+    logger.info(f"📅 Desde: {args.since or config.backfill_since or 'início'}")
+    logger.info(f"🎯 Workspaces: {', '.join(ws['name'] for ws in workspaces)}")
+    logger.info(f"📥 Sinks: {', '.join(sink_names)}")
+    logger.info("=" * 60)
+
+    extractor = MyCreatorExtractor(config)
+    batches = extractor.iter_post_batches(workspaces, cutoff=args.since, max_posts=args.limit)
+    try:
+        stats = StreamingPipeline(sinks).run(batches)
+    except Exception as e:
+        logger.error(f"❌ Backfill interrompido: {e}")
+        THROTTLE_STATS.log_summary()
+        return 1
+
+    peak = f" | pico de memória {stats['peak_rss_mb']:.0f} MB" if stats["peak_rss_mb"] else ""
+    logger.info(
+        f"\n🏁 Backfill: {stats['posts']:,} posts em {stats['batches']} lotes "
+        f"({stats['removed']} agendamentos falhos removidos) em {stats['seconds']:.0f}s{peak}"
+    )
+    THROTTLE_STATS.log_summary()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
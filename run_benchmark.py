@@ -0,0 +1,518 @@
+#!/usr/bin/env python3
+"""
+MyCreator Analytics ETL - Micro-benchmarks
+==========================================
+
+Mede etapas locais do ETL (sem acessar APIs) com dados sintéticos.
+
+Benchmarks:
+- sheets: conversão DataFrame -> formato do Google Sheets
+  (_dataframe_to_sheets_format) comparada à implementação com iterrows
+- records: memória e tempo de N PostData (dataclass com __slots__ +
+  to_columns) comparados à dataclass comum + asdict
+- ranking: top 5 por perfil (top_posts_per_profile) comparado ao loop
+  com máscaras por workspace/fonte/perfil; valida que as linhas são
+  idênticas
+- etl: run_etl.py completo e offline (src/replay.py) contra a API
+  sintética (src/synthetic.py), com o Google Sheets em memória e o
+  Supabase em SQLite. Cada cenário (cidades x posts por cidade) roda em
+  um processo separado; reporta tempo, pico de RSS e requisições por
+  etapa. Com --http, a API sintética é servida por um servidor HTTP
+  local (requisições passam pelo curl_cffi). Com --record, grava as
+  respostas da API real em um cassete; com --replay, reproduz o
+  cassete (mesmo POSTS_LIMIT da gravação)
+- synthetic: gera o conjunto sintético (milhões de posts) em JSONL ou o
+  serve em um servidor HTTP local (MYCREATOR_BASE_URL)
+
+Uso:
+    python run_benchmark.py sheets
+    python run_benchmark.py sheets --cells 10000 100000
+    python run_benchmark.py records --n 100000
+    python run_benchmark.py ranking --profiles 2000
+    python run_benchmark.py etl --cities 1 10 100 --posts 50 5000
+    python run_benchmark.py etl --cities 10 --posts 5000 --http --latency-ms 80
+    python run_benchmark.py synthetic --cities 100 --posts 10000 --output sintetico.jsonl.gz
+    python run_benchmark.py synthetic --cities 100 --posts 5000 --serve --port 8765
+    python run_benchmark.py etl --record cassettes/api.jsonl.gz
+    python run_benchmark.py etl --replay cassettes/api.jsonl.gz
+"""
+import argparse
+import dataclasses
+import gc
+import json
+import logging
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import ExitStack
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.extract import PostData
+from src.load import GoogleSheetsLoader
+from src.ranking import RANK_TYPES, SOURCES, top_posts_per_profile
+from src.replay import Cassette, FakeSheetsClient, patch_sheets, patched, record_http, serve_http, sqlite_stand_in
+from src.synthetic import SyntheticAPI, SyntheticServer
+
+
+def _timeit(func, repeat: int = 3) -> float:
+    """Melhor tempo (segundos) entre `repeat` execuções."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+# =============================================================================
+# SHEETS: DataFrame -> lista de listas
+# =============================================================================
+def _legacy_sheets_format(df: pd.DataFrame) -> list[list]:
+    """Implementação anterior (iterrows + isinstance por célula), para comparação."""
+    df = df.fillna("")
+    header = df.columns.tolist()
+    rows = []
+    for _, row in df.iterrows():
+        clean_row = []
+        for val in row:
+            if isinstance(val, (np.integer,)):
+                clean_row.append(int(val))
+            elif isinstance(val, (np.floating,)):
+                clean_row.append(float(val))
+            elif isinstance(val, (int, float)):
+                clean_row.append(val)
+            else:
+                clean_row.append(str(val) if val != "" else "")
+        rows.append(clean_row)
+    return [header] + rows
+
+
+def _synthetic_posts_frame(n_rows: int, seed: int = 42) -> pd.DataFrame:
+    """DataFrame com o mesmo perfil de tipos da aba dados_brutos (10 colunas)."""
+    rng = np.random.default_rng(seed)
+    reach = rng.integers(0, 50_000, n_rows).astype(float)
+    reach[rng.random(n_rows) < 0.1] = np.nan  # posts sem analytics
+
+    return pd.DataFrame({
+        "cidade": rng.choice(["Florianópolis", "Curitiba", "Goiânia"], n_rows),
+        "perfil": rng.choice([f"perfil_{i}" for i in range(40)], n_rows),
+        "id_interno": [f"plan{i:08d}" for i in range(n_rows)],
+        "data_publicacao": (
+            pd.Timestamp("2026-01-01") + pd.to_timedelta(rng.integers(0, 365, n_rows), unit="D")
+        ).strftime("%d/%m/%Y"),
+        "curtidas": rng.integers(0, 5_000, n_rows),
+        "comentarios": rng.integers(0, 300, n_rows),
+        "alcance": reach,
+        "taxa_engajamento": rng.random(n_rows).round(4),
+        "legenda": np.where(rng.random(n_rows) < 0.05, None, "legenda #hashtag"),
+        "tem_erro": rng.random(n_rows) < 0.02,
+    })
+
+
+def bench_sheets(cells: list[int]):
+    """Compara a conversão vetorizada com a antiga em N células."""
+    loader = GoogleSheetsLoader.__new__(GoogleSheetsLoader)
+
+    print(f"{'células':>10} {'linhas':>8} {'iterrows (s)':>13} {'vetorizado (s)':>15} {'speedup':>8}")
+    for n_cells in cells:
+        df = _synthetic_posts_frame(max(1, n_cells // 10))
+        new = loader._dataframe_to_sheets_format(df)
+
+        # iterrows em 1M células é lento: uma única execução
+        repeat = 1 if n_cells >= 1_000_000 else 3
+        legacy_time = _timeit(lambda: _legacy_sheets_format(df), repeat)
+        new_time = _timeit(lambda: loader._dataframe_to_sheets_format(df), 3)
+
+        assert new == _legacy_sheets_format(df), "saída diferente da implementação anterior"
+        print(f"{n_cells:>10,} {len(new) - 1:>8,} {legacy_time:>13.3f} {new_time:>15.3f} {legacy_time / new_time:>7.1f}x")
+
+
+# =============================================================================
+# RECORDS: PostData -> DataFrame
+# =============================================================================
+def _legacy_record_class(cls):
+    """Cópia de `cls` como dataclass comum (com __dict__), para comparação."""
+    specs = []
+    for f in dataclasses.fields(cls):
+        if f.default is not dataclasses.MISSING:
+            specs.append((f.name, f.type, dataclasses.field(default=f.default)))
+        elif f.default_factory is not dataclasses.MISSING:
+            specs.append((f.name, f.type, dataclasses.field(default_factory=f.default_factory)))
+        else:
+            specs.append((f.name, f.type))
+    return dataclasses.make_dataclass(f"Legacy{cls.__name__}", specs)
+
+
+def _synthetic_posts(cls, n_records: int) -> list:
+    """N posts com o perfil de valores de uma extração real."""
+    return [
+        cls(
+            internal_id=f"plan{i:08d}",
+            external_id=f"179{i:012d}",
+            workspace_id="696689cc90763878ba06a27b",
+            workspace_name="Curitiba",
+            title=f"Post {i}",
+            caption=f"Legenda do post {i} #imoveis #curitiba",
+            platform="Instagram",
+            profile_name=f"perfil_{i % 40}",
+            post_type="Reels",
+            media_type="VIDEO",
+            published_at="2026-01-15T12:00:00",
+            permalink=f"https://www.instagram.com/p/{i:011d}/",
+            follower_count=10_000 + i % 500,
+            likes=i % 5_000,
+            comments=i % 300,
+            reach=i % 50_000,
+            engagement_rate=round((i % 1_000) / 10_000, 4),
+            extraction_timestamp="17/10/2026 08:00:00",
+        )
+        for i in range(n_records)
+    ]
+
+
+def _measure(func):
+    """
+    (resultado, segundos, pico de memória alocada em MB) de func().
+
+    O tempo vem de uma execução sem tracemalloc (que deixa tudo bem mais
+    lento); a memória, de uma segunda execução rastreada.
+    """
+    gc.collect()
+    elapsed = _timeit(func, repeat=1)
+
+    gc.collect()
+    tracemalloc.start()
+    result = func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak / 1024 / 1024
+
+
+def bench_records(n_records: int):
+    """Compara PostData (slots + to_columns) com a dataclass comum + asdict."""
+    legacy_cls = _legacy_record_class(PostData)
+
+    print(f"{n_records:,} registros PostData ({len(PostData.field_names())} campos)")
+    print(f"{'etapa':<28} {'dataclass (MB)':>15} {'slots (MB)':>11} {'dataclass (s)':>14} {'slots (s)':>10}")
+
+    legacy, legacy_t, legacy_mb = _measure(lambda: _synthetic_posts(legacy_cls, n_records))
+    slotted, slots_t, slots_mb = _measure(lambda: _synthetic_posts(PostData, n_records))
+    print(f"{'criar registros':<28} {legacy_mb:>15.1f} {slots_mb:>11.1f} {legacy_t:>14.3f} {slots_t:>10.3f}")
+
+    df_legacy, legacy_t, legacy_mb = _measure(
+        lambda: pd.DataFrame([dataclasses.asdict(post) for post in legacy])
+    )
+    df_slots, slots_t, slots_mb = _measure(lambda: pd.DataFrame(PostData.to_columns(slotted)))
+    print(f"{'DataFrame (asdict/colunas)':<28} {legacy_mb:>15.1f} {slots_mb:>11.1f} {legacy_t:>14.3f} {slots_t:>10.3f}")
+
+    pd.testing.assert_frame_equal(df_legacy, df_slots)
+
+
+# =============================================================================
+# RANKING: Top posts por perfil
+# =============================================================================
+def _legacy_top_posts(df_combined: pd.DataFrame, n: int = 5) -> pd.DataFrame:
+    """Implementação anterior (máscaras + nlargest por grupo), para comparação."""
+    slices = []
+    for rank_tipo in RANK_TYPES:
+        for ws_name in df_combined['workspace'].dropna().unique():
+            for fonte in SOURCES:
+                mask = (
+                    (df_combined['workspace'] == ws_name) &
+                    (df_combined['rank_tipo'] == rank_tipo) &
+                    (df_combined['fonte'] == fonte)
+                )
+                for perfil in df_combined[mask]['perfil'].dropna().unique():
+                    subset = df_combined[mask & (df_combined['perfil'] == perfil)]
+                    top = subset.nlargest(n, 'valor_metrica')
+                    if not top.empty:
+                        slices.append(top)
+    return pd.concat(slices, ignore_index=True)
+
+
+def _synthetic_top_candidates(n_profiles: int, seed: int = 42) -> pd.DataFrame:
+    """Candidatos da etapa 10.3 (ContentStudio + Analytics), já deduplicados."""
+    rng = np.random.default_rng(seed)
+    n_rows = n_profiles * 12
+    perfil = rng.choice([f"perfil_{i}" for i in range(n_profiles)], n_rows).astype(object)
+    perfil[rng.random(n_rows) < 0.01] = None
+    workspace = rng.choice(["Florianópolis", "Curitiba", "Goiânia"], n_rows).astype(object)
+    workspace[rng.random(n_rows) < 0.01] = None
+    fonte = rng.choice(SOURCES, n_rows)
+
+    df = pd.DataFrame({
+        "rank_tipo": rng.choice(RANK_TYPES, n_rows),
+        "fonte": fonte,
+        "workspace": workspace,
+        "perfil": perfil,
+        "data": "15/01/2026",
+        "valor_metrica": rng.integers(0, 200, n_rows),  # muitos empates
+        "taxa_engajamento": np.where(fonte == "instagram_nativo", rng.random(n_rows).round(4), np.nan),
+        "formato": rng.choice(["Reels", "IMAGE", "CAROUSEL_ALBUM"], n_rows),
+        "legenda_titulo": "Post",
+        "link": [f"https://www.instagram.com/p/{i:011d}/" for i in range(n_rows)],
+        "id_post": [f"179{i:012d}" for i in range(n_rows)],
+    })
+
+    # Mesmo pré-processamento do run_etl.py
+    df = df.sort_values('valor_metrica', ascending=False)
+    return df.drop_duplicates(subset=['link', 'rank_tipo', 'fonte', 'workspace'], keep='first')
+
+
+def bench_ranking(n_profiles: int):
+    """Compara top_posts_per_profile com o loop anterior."""
+    df = _synthetic_top_candidates(n_profiles)
+
+    legacy_time = _timeit(lambda: _legacy_top_posts(df), repeat=1)
+    new_time = _timeit(lambda: top_posts_per_profile(df), repeat=3)
+
+    result = top_posts_per_profile(df)
+    pd.testing.assert_frame_equal(result, _legacy_top_posts(df))
+
+    print(f"{n_profiles:,} perfis | {len(df):,} candidatos -> {len(result):,} top posts")
+    print(f"loop (s): {legacy_time:.3f} | vetorizado (s): {new_time:.3f} | speedup: {legacy_time / new_time:.1f}x")
+
+
+# =============================================================================
+# ETL: pipeline completo offline
+# =============================================================================
+ETL_STAGES = ["extract", "extract_growth", "transform", "hashtags", "top_posts",
+              "snapshots", "sheets", "consolidation", "supabase"]
+CALL_KINDS = ["http", "sheets", "db"]
+
+# Desliga o que depende de disco/rede fora do harness e os limites de taxa
+OFFLINE_ENV = {
+    "GOOGLE_SHEET_ID": "offline",
+    "WRITE_MODE": "overwrite",
+    "RATE_LIMIT_RPS": "0",
+    "SHEETS_RATE_LIMIT_RPS": "0",
+    "INCREMENTAL_MODE": "false",
+    "HTTP_CACHE_DIR": "",
+    "ACCOUNTS_CACHE_PATH": "",
+    "SNAPSHOT_DIR": "",
+    "HASHTAG_INDEX_PATH": "",
+    "APPS_SCRIPT_URL": "",
+    "URI": "",
+    "METRICS_PROMETHEUS_PATH": "",
+    "DEBUG_MODE": "false",
+}
+
+
+def etl_scenario(args) -> int:
+    """Uma execução do run_etl.py com as dependências externas substituídas."""
+    import run_etl
+    from src.extract import TARGET_WORKSPACES
+
+    env = dict(OFFLINE_ENV, METRICS_REPORT_DIR=args.report_dir)
+    if not args.record:
+        env.update(MYCREATOR_COOKIE="offline", MYCREATOR_TOKEN="Bearer offline",
+                   MYCREATOR_EMAIL="", MYCREATOR_PASSWORD="")
+    if not (args.record or args.replay):
+        env["POSTS_LIMIT"] = str(args.posts)
+    if args.use_async:
+        env["ASYNC_EXTRACTION"] = "true"
+    os.environ.update(env)
+
+    if not args.verbose:
+        logging.disable(logging.INFO)
+
+    cassette = Cassette() if args.record else None
+    with ExitStack() as stack:
+        if cassette is not None:
+            stack.enter_context(record_http(cassette))
+        elif args.replay:
+            stack.enter_context(serve_http(Cassette.load(args.replay).replay))
+        else:
+            api = SyntheticAPI(args.cities, args.posts, seed=args.seed, per_id_batches=args.per_id_batches)
+            if args.http:
+                server = stack.enter_context(SyntheticServer(api, latency=args.latency_ms / 1000))
+                os.environ["MYCREATOR_BASE_URL"] = server.url
+            else:
+                stack.enter_context(serve_http(api))
+            stack.callback(TARGET_WORKSPACES.__setitem__, slice(None), list(TARGET_WORKSPACES))
+            TARGET_WORKSPACES[:] = api.workspaces
+
+        stack.enter_context(patch_sheets(FakeSheetsClient()))
+        stack.enter_context(patched(
+            run_etl, "SupabaseDatabase", sqlite_stand_in(os.path.join(args.report_dir, "supabase.db"))
+        ))
+        ok = run_etl.run_etl()
+
+    if cassette is not None:
+        cassette.save(args.record)
+    return 0 if ok else 1
+
+
+def _run_scenario(cities: int, posts: int, args) -> dict:
+    """Roda etl_scenario em um processo novo (pico de RSS isolado) e lê o relatório."""
+    with tempfile.TemporaryDirectory(prefix="etl_bench_") as report_dir:
+        cmd = [sys.executable, os.path.abspath(__file__), "etl-scenario",
+               "--cities", str(cities), "--posts", str(posts), "--seed", str(args.seed),
+               "--report-dir", report_dir]
+        for flag, value in (("--record", args.record), ("--replay", args.replay)):
+            if value:
+                cmd += [flag, value]
+        cmd += ["--async"] if args.use_async else []
+        cmd += ["--per-id-batches"] if args.per_id_batches else []
+        cmd += ["--http", "--latency-ms", str(args.latency_ms)] if args.http else []
+        cmd += ["--verbose"] if args.verbose else []
+
+        proc = subprocess.run(cmd)
+        reports = sorted(Path(report_dir).glob("run_*.json"))
+        if not reports:
+            raise RuntimeError(f"cenário {cities}x{posts} não gerou relatório (exit {proc.returncode})")
+        return json.loads(reports[-1].read_text(encoding="utf-8"))
+
+
+def _stage_table(report: dict) -> list[str]:
+    """Linhas da tabela por etapa (tempo, pico de RSS e chamadas por tipo)."""
+    lines = [f"   {'etapa':<15}{'tempo (s)':>10}{'RSS (MB)':>10}" + "".join(f"{k:>8}" for k in CALL_KINDS)]
+    for stage in [s for s in ETL_STAGES if s in report["stages"]] + \
+                 [s for s in report["stages"] if s not in ETL_STAGES]:
+        calls = report["stage_calls"].get(stage, {})
+        rss = report["stage_peak_rss_mb"].get(stage)
+        lines.append(
+            f"   {stage:<15}{report['stages'][stage]:>10.2f}{rss if rss is not None else '-':>10}"
+            + "".join(f"{calls.get(kind, 0):>8}" for kind in CALL_KINDS)
+        )
+    return lines
+
+
+def bench_etl(args):
+    """run_etl.py offline para cada (cidades, posts por cidade)."""
+    if args.record or args.replay:
+        scenarios = [(0, 0)]  # Workspaces e volume vêm da API real / do cassete
+    else:
+        scenarios = [(cities, posts) for cities in args.cities for posts in args.posts]
+
+    if args.per_id_batches:
+        print("⚠️ --per-id-batches: respostas em lote separadas por ID (formato hipotético, "
+              "não confirmado na API real); os ganhos de lote medidos assim não são reais")
+
+    results = []
+    for cities, posts in scenarios:
+        report = _run_scenario(cities, posts, args)
+        requests = {kind: sum(s["count"] for s in report["calls"].get(kind, {}).values()) for kind in CALL_KINDS}
+        results.append({"cities": cities, "posts_per_city": posts, "report": report})
+
+        label = f"{cities} cidades x {posts:,} posts" if cities else ("gravação" if args.record else "replay")
+        print(f"\n{label}: {report.get('posts', 0):,} posts | {report['duration_seconds']:.1f}s | "
+              f"pico RSS {report.get('peak_rss_mb') or '-'} MB | sucesso: {report.get('success')}")
+        print(f"   requisições: " + " | ".join(f"{kind} {n:,}" for kind, n in requests.items()))
+        print("\n".join(_stage_table(report)))
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, ensure_ascii=False, indent=2), encoding="utf-8")
+        print(f"\nRelatórios completos: {args.output}")
+
+
+# =============================================================================
+# SYNTHETIC: conjunto sintético em disco ou via HTTP
+# =============================================================================
+def synthetic_data(args) -> int:
+    """Grava o conjunto sintético em JSONL e/ou o serve via HTTP."""
+    if not (args.output or args.serve):
+        print("Informe --output e/ou --serve")
+        return 2
+
+    api = SyntheticAPI(args.cities, args.posts, accounts_per_city=args.accounts, seed=args.seed,
+                       per_id_batches=args.per_id_batches)
+    if args.output:
+        start = time.perf_counter()
+        plans = api.dump(args.output, log_every=0)
+        elapsed = time.perf_counter() - start
+        size_mb = Path(args.output).stat().st_size / 1024 / 1024
+        print(f"{plans:,} planos de {args.cities} cidades -> {args.output} "
+              f"({size_mb:,.1f} MB | {elapsed:.1f}s | {plans / elapsed:,.0f} planos/s)")
+
+    if args.serve:
+        server = SyntheticServer(api, args.host, args.port, latency=args.latency_ms / 1000)
+        print(f"API sintética em {server.url} ({args.cities} cidades x {args.posts:,} posts)")
+        print("Workspaces (TARGET_WORKSPACES):")
+        for ws in api.workspaces[:5]:
+            print(f"   {ws}")
+        if args.cities > 5:
+            print(f"   ... e mais {args.cities - 5}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+    return 0
+
+
+# =============================================================================
+# CLI
+# =============================================================================
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Micro-benchmarks do ETL MyCreator")
+    sub = parser.add_subparsers(dest="benchmark", required=True)
+
+    sheets = sub.add_parser("sheets", help="DataFrame -> formato do Google Sheets")
+    sheets.add_argument("--cells", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+
+    records = sub.add_parser("records", help="PostData -> DataFrame (memória e tempo)")
+    records.add_argument("--n", type=int, default=100_000)
+
+    ranking = sub.add_parser("ranking", help="Top 5 posts por perfil (saída e tempo)")
+    ranking.add_argument("--profiles", type=int, default=2_000)
+
+    etl = sub.add_parser("etl", help="run_etl.py completo offline (tempo, RSS e requisições por etapa)")
+    etl.add_argument("--cities", type=int, nargs="+", default=[1, 10])
+    etl.add_argument("--posts", type=int, nargs="+", default=[50, 500], help="Posts por cidade")
+    etl.add_argument("--output", help="Grava os relatórios completos (JSON)")
+
+    scenario = sub.add_parser("etl-scenario", help="Uma execução do cenário etl (processo isolado)")
+    scenario.add_argument("--cities", type=int, default=1)
+    scenario.add_argument("--posts", type=int, default=50)
+    scenario.add_argument("--report-dir", default="reports")
+
+    for command in (etl, scenario):
+        command.add_argument("--seed", type=int, default=42)
+        command.add_argument("--record", metavar="CASSETE", help="Usa a API real e grava as respostas")
+        command.add_argument("--replay", metavar="CASSETE", help="Reproduz um cassete gravado")
+        command.add_argument("--async", dest="use_async", action="store_true", help="ASYNC_EXTRACTION=true")
+        command.add_argument("--verbose", action="store_true", help="Mantém os logs INFO do ETL")
+        command.add_argument("--http", action="store_true", help="API sintética via servidor HTTP local")
+        command.add_argument("--latency-ms", type=float, default=0.0, help="Latência mediana do servidor (--http)")
+        command.add_argument("--per-id-batches", action="store_true",
+                             help="Lotes respondidos por ID (formato hipotético; padrão: objeto agregado)")
+
+    synthetic = sub.add_parser("synthetic", help="Gera (JSONL) ou serve (HTTP) a API sintética")
+    synthetic.add_argument("--cities", type=int, default=100)
+    synthetic.add_argument("--posts", type=int, default=10_000, help="Posts por cidade")
+    synthetic.add_argument("--accounts", type=int, default=3, help="Contas Instagram por cidade")
+    synthetic.add_argument("--seed", type=int, default=42)
+    synthetic.add_argument("--output", help="Grava os payloads em JSONL (gzip se .gz)")
+    synthetic.add_argument("--serve", action="store_true", help="Servidor HTTP local (até Ctrl+C)")
+    synthetic.add_argument("--host", default="127.0.0.1")
+    synthetic.add_argument("--port", type=int, default=8765)
+    synthetic.add_argument("--latency-ms", type=float, default=0.0)
+    synthetic.add_argument("--per-id-batches", action="store_true",
+                           help="Lotes respondidos por ID (formato hipotético; padrão: objeto agregado)")
+
+    args = parser.parse_args()
+    if args.benchmark == "sheets":
+        bench_sheets(args.cells)
+    elif args.benchmark == "records":
+        bench_records(args.n)
+    elif args.benchmark == "ranking":
+        bench_ranking(args.profiles)
+    elif args.benchmark == "etl":
+        bench_etl(args)
+    elif args.benchmark == "etl-scenario":
+        return etl_scenario(args)
+    elif args.benchmark == "synthetic":
+        return synthetic_data(args)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
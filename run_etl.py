@@ -8,18 +8,16 @@ Extrai dados de performance das cidades configuradas:
 Fluxo:
 1. Extract: Busca dados da API MyCreator (multi-workspace)
 2. Transform: Converte PostData para DataFrame pandas
-3. Load: Atualiza Google Sheets
+3. Load: Atualiza Google Sheets (incluindo a base do Looker Studio, consolidada em Python)
+4. Supabase: Envia posts consolidados e seguidores
 
 Uso: python run_etl.py
 """
 import sys
-import time
 import logging
 from datetime import datetime
-from dataclasses import asdict
 
 import pandas as pd
-import re
 import requests
 
 # Força output imediato no terminal (sem buffer)
@@ -28,8 +26,16 @@ sys.stdout.reconfigure(line_buffering=True)
 
 from src.config import get_config, setup_logging
 from src.extract import MyCreatorExtractor, TARGET_WORKSPACES
-from src.load import load_to_sheets, get_sheet_data
+from src.load import write_sheets_tabs, get_sheet_data
+from src.consolidate import consolidate_posts, prepare_posts_for_supabase
+from src.snapshots import save_run_snapshots
+from src.stream import drop_failed_posts, posts_to_frame, to_dados_brutos
+from src.hashtags import HashtagIndex, hashtag_totals, to_hashtag_tab
+from src.ranking import top_posts_per_profile
+from src.growth import clean_audience_growth, growth_metrics
 from src.database import SupabaseDatabase
+from src.throttle import THROTTLE_STATS
+from src.metrics import RUN_METRICS, write_run_report
 
 
 def run_etl() -> bool:
@@ -41,6 +47,9 @@ def run_etl() -> bool:
     config = get_config()
     logger = setup_logging(debug=config.debug_mode)
     start_time = datetime.now()
+    RUN_METRICS.reset()
+    success = False
+    total_posts = 0
     
     logger.info("=" * 60)
     logger.info("🚀 INICIANDO ETL MyCreator Analytics")
@@ -55,6 +64,7 @@ def run_etl() -> bool:
         # ETAPA 1: EXTRACT
         # =====================================================================
         logger.info("\n📡 ETAPA 1: EXTRAÇÃO")
+        RUN_METRICS.start_stage("extract")
         extractor = MyCreatorExtractor(config)
         
         # Extrai de todos os workspaces (lista fixa em TARGET_WORKSPACES)
@@ -65,6 +75,7 @@ def run_etl() -> bool:
         
         # Extrai Crescimento de Seguidores (audience_growth)
         logger.info("\n📡 ETAPA 1.4: EXTRAÇÃO DE CRESCIMENTO DE SEGUIDORES")
+        RUN_METRICS.start_stage("extract_growth")
         audience_growth_data = extractor.extract_audience_growth()
         
         if not all_posts and not audience_growth_data:
@@ -76,93 +87,39 @@ def run_etl() -> bool:
         # ETAPA 2: TRANSFORM
         # =====================================================================
         logger.info("\n🔄 ETAPA 2: TRANSFORMAÇÃO")
+        RUN_METRICS.start_stage("transform")
         
-        # Converte lista de dataclass para DataFrame (Posts)
-        records_posts = [asdict(post) for post in all_posts]
-        df_posts = pd.DataFrame(records_posts)
+        # Converte lista de dataclass para DataFrame (Posts), coluna a coluna
+        df_posts = posts_to_frame(all_posts)
         
         # =================================================================
         # LIMPEZA ESPECIAL DE DADOS: REMOVER AGENDAMENTOS FALHOS
         # Remove os posts que a API retorna como 'published', 
         # mas não possuem link ou id externo (falharam na prática).
         # =================================================================
-        if not df_posts.empty:
-            posts_iniciais = len(df_posts)
-            # Filtro: Mantém apenas posts com permalink (link) válido e external_id
-            df_posts = df_posts[df_posts['permalink'].astype(str).str.strip().astype(bool) & df_posts['external_id'].notna()].copy()
-            posts_removidos = posts_iniciais - len(df_posts)
-            if posts_removidos > 0:
-                logger.warning(f"Removidos {posts_removidos} posts com link quebrado/falha (falso 'published') da base.")
+        df_posts, posts_removidos = drop_failed_posts(df_posts)
+        if posts_removidos > 0:
+            logger.warning(f"Removidos {posts_removidos} posts com link quebrado/falha (falso 'published') da base.")
         
 
         # Converte lista de dicts para DataFrame (Crescimento Seguidores)
         df_audience_growth = pd.DataFrame(audience_growth_data) if audience_growth_data else pd.DataFrame()
         
-        # Limpeza do audience_growth (Transform)
+        # Limpeza do audience_growth (Transform): remove dias sem dados e
+        # zera o spike inicial de cada (cidade, perfil)
+        df_audience_growth = clean_audience_growth(df_audience_growth)
+        
+        # Série diária sem buracos + crescimento 7d/28d (aba crescimento_metricas)
+        df_growth_metrics = growth_metrics(df_audience_growth)
+        
         if not df_audience_growth.empty:
-            # 1. Remove dias sem dados (seguidores = 0)
-            df_audience_growth = df_audience_growth[df_audience_growth["seguidores"] > 0].copy()
-            
-            # 2. Neutraliza spike inicial: para cada perfil, a primeira linha
-            #    tem variacao_diaria = total de seguidores (não é variação real)
-            for perfil in df_audience_growth["perfil"].unique():
-                mask = df_audience_growth["perfil"] == perfil
-                first_idx = df_audience_growth.loc[mask].index[0]
-                df_audience_growth.loc[first_idx, "variacao_diaria"] = 0
-            
             logger.info(f"📊 Crescimento: {len(df_audience_growth)} registros válidos após limpeza")
+            logger.info(f"📈 Métricas de crescimento: {len(df_growth_metrics)} dias (com preenchimento de buracos)")
         
         # =================================================================
-        # MAPEAMENTO DE COLUNAS - snake_case
+        # MAPEAMENTO DE COLUNAS - snake_case (POSTS_COLUMN_MAPPING)
         # =================================================================
-        column_mapping = {
-            # IDENTIFICAÇÃO
-            "workspace_name": "cidade",
-            "published_at": "data_publicacao",
-            "platform": "rede_social",
-            "profile_name": "perfil",
-            "follower_count": "seguidores",
-            "post_type": "formato",
-            "media_type": "tipo_midia",
-            
-            # CONTEÚDO
-            "title": "titulo",
-            "caption": "legenda",
-            
-            # ENGAJAMENTO
-            "likes": "curtidas",
-            "comments": "comentarios",
-            "saves": "salvos",
-            "shares": "compartilhamentos",
-            "engagement_rate": "taxa_engajamento",
-            
-            # PERFORMANCE
-            "reach": "alcance",
-            "reach_rate": "taxa_alcance",
-            
-            # TÉCNICO
-            "permalink": "link",
-            "external_id": "id_instagram",
-            "internal_id": "id_interno",
-            "analytics_error": "status_dados",
-            "extraction_timestamp": "timestamp",
-        }
-        
-        # Garante que as colunas existam antes do mapeamento para evitar erros
-        for col in ["reach", "engagement_rate", "reach_rate", "follower_count"]:
-            if col not in df_posts.columns:
-                df_posts[col] = 0
-        
-        # Seleciona e renomeia colunas (preserva a ordem abaixo)
-        columns_to_export = [col for col in column_mapping.keys() if col in df_posts.columns]
-        df_final = df_posts[columns_to_export].rename(columns=column_mapping)
-        
-        
-        # Formata Data de Publicação apenas como data (DD/MM/YYYY)
-        if "data_publicacao" in df_final.columns:
-            df_final["data_publicacao"] = pd.to_datetime(
-                df_final["data_publicacao"], errors='coerce'
-            ).dt.strftime("%d/%m/%Y")
+        df_final = to_dados_brutos(df_posts)
         
         # Ordena por cidade e data (mais recentes primeiro)
         if "data_publicacao" in df_final.columns and "cidade" in df_final.columns:
@@ -199,66 +156,28 @@ def run_etl() -> bool:
         # 6. Processamento de Hashtags (NOVO)
         # =================================================================
         logger.info("\n🏷️ PROCESSANDO HASHTAGS...")
+        RUN_METRICS.start_stage("hashtags")
         
-        # Função interna para extrair hashtags
-        def get_hashtags(text):
-            if not isinstance(text, str): return []
-            return re.findall(r"#(\w+)", text)
-            
-        if not df_posts.empty:
-            # Cria lista temporária para explosão
-            df_tags_temp = df_posts[["internal_id", "caption", "likes", "comments", "saves", "shares", "reach", "impressions"]].copy()
-            df_tags_temp["hashtags"] = df_tags_temp["caption"].apply(get_hashtags)
-            
-            # Explode para ter uma hashtag por linha
-            df_hashtags_exploded = df_tags_temp.explode("hashtags")
-            df_hashtags_exploded = df_hashtags_exploded[df_hashtags_exploded["hashtags"].notna()] # Remove vazios
-            
-            # Agregação por Hashtag
-            df_hashtags_final = df_hashtags_exploded.groupby("hashtags").agg({
-                "internal_id": "count",      # Qtd Usos
-                "likes": "sum",
-                "comments": "sum",
-                "saves": "sum",
-                "shares": "sum",
-                "reach": "sum",
-                "impressions": "sum"
-            }).reset_index()
-            
-            # Métricas calculadas
-            df_hashtags_final["engagement_total"] = (
-                df_hashtags_final["likes"] + 
-                df_hashtags_final["comments"] + 
-                df_hashtags_final["saves"] + 
-                df_hashtags_final["shares"]
-            )
-            
-            # Renomeia colunas para PT-BR
-            hashtag_mapping = {
-                "hashtags": "hashtag",
-                "internal_id": "qtd_usos",
-                "engagement_total": "engajamento_total",
-                "reach": "alcance_acumulado",
-                "impressions": "impressoes_acumuladas",
-                "likes": "total_likes",
-                "comments": "total_comentarios"
-            }
-            
-            cols_export_tags = [c for c in hashtag_mapping.keys() if c in df_hashtags_final.columns]
-            df_hashtags_final = df_hashtags_final[cols_export_tags].rename(columns=hashtag_mapping)
-            
-            # Ordena por qtd_usos
-            df_hashtags_final = df_hashtags_final.sort_values(by="qtd_usos", ascending=False)
-            
-            logger.info(f"✅ {len(df_hashtags_final)} hashtags identificadas.")
+        # Tokenização vetorizada (caixa e acentos normalizados). Com o índice
+        # persistente (HASHTAG_INDEX_PATH), só posts novos/alterados geram
+        # trabalho e a aba sai das somas do índice, que espelha os posts
+        # desta execução (os que saíram da listagem são removidos).
+        if config.hashtag_index_path:
+            hashtag_index = HashtagIndex(config.hashtag_index_path)
+            hashtag_index.update(df_posts, delete_missing=True)
+            df_hashtags_final = to_hashtag_tab(hashtag_index.totals())
+            hashtag_index.close()
         else:
-            df_hashtags_final = pd.DataFrame()
+            df_hashtags_final = to_hashtag_tab(hashtag_totals(df_posts))
+        
+        logger.info(f"✅ {len(df_hashtags_final)} hashtags identificadas.")
 
 
         # =================================================================
         # 7. Processamento de Destaques (Top Posts) (NOVO - FASE 3)
         # =================================================================
         logger.info("\n🏆 PROCESSANDO DESTAQUES...")
+        RUN_METRICS.start_stage("top_posts")
         
         # =================================================================
         # 8. Processamento de Destaques (MONITORAMENTO) (ATUALIZADO)
@@ -420,22 +339,7 @@ def run_etl() -> bool:
             df_combined = df_combined.drop_duplicates(subset=['link', 'rank_tipo', 'fonte', 'workspace'], keep='first')
 
             # top 5 por perfil por workspace por métrica — para ambas as fontes
-            slices = []
-            for rank_tipo in ['alcance', 'engajamento', 'impressoes']:
-                for ws_name in df_combined['workspace'].dropna().unique():
-                    for fonte in ['mycreator', 'instagram_nativo']:
-                        mask = (
-                            (df_combined['workspace'] == ws_name) &
-                            (df_combined['rank_tipo'] == rank_tipo) &
-                            (df_combined['fonte'] == fonte)
-                        )
-                        for perfil in df_combined[mask]['perfil'].dropna().unique():
-                            subset = df_combined[mask & (df_combined['perfil'] == perfil)]
-                            top5 = subset.nlargest(5, 'valor_metrica')
-                            if not top5.empty:
-                                slices.append(top5)
-
-            df_top_posts = pd.concat(slices, ignore_index=True)
+            df_top_posts = top_posts_per_profile(df_combined, n=5)
 
             # Garante colunas na ordem correta (taxa_* só existem em instagram_nativo)
             for col in ['taxa_engajamento', 'taxa_alcance']:
@@ -453,55 +357,66 @@ def run_etl() -> bool:
             df_top_posts = pd.DataFrame()
 
 
+        # Snapshot local (Parquet) dos DataFrames da execução
+        RUN_METRICS.start_stage("snapshots")
+        save_run_snapshots(config, {
+            "posts": df_posts,
+            "dados_brutos": df_final,
+            "analise_hashtag": df_hashtags_final,
+            "crescimento_seguidores": df_audience_growth,
+            "crescimento_metricas": df_growth_metrics,
+            "top_posts": df_top_posts,
+        }, run_at=start_time)
+
         # =====================================================================
         # ETAPA 3: LOAD (GOOGLE SHEETS)
         # =====================================================================
         logger.info("\n📤 ETAPA 3: CARGA NO GOOGLE SHEETS")
+        RUN_METRICS.start_stage("sheets")
         logger.info(f"📑 Sheet ID: {config.google_sheet_id}")
         logger.info(f"📑 Aba Posts: {config.sheet_tab_name}")
         logger.info(f"📑 Aba Analise Hashtag: analise_hashtag")
         logger.info(f"📑 Aba Top Posts: top_posts_mycreator")
         logger.info(f"📑 Aba Crescimento: crescimento_seguidores")
+        logger.info(f"📑 Aba Métricas de Crescimento: crescimento_metricas")
         logger.info(f"📝 Modo: {config.write_mode}")
         
-        # Carga 1: Posts (Aba padrão / Dados Brutos)
-        success_posts = True
-        if not df_final.empty:
-            logger.info(f"Uploading Posts ({len(df_final)} linhas)...")
-            success_posts = load_to_sheets(df_final, config, tab_name=config.sheet_tab_name)
-            time.sleep(5)
-            
-        # Carga 2: Hashtags 
-        success_hashtags = True
-        if not df_hashtags_final.empty:
-            logger.info(f"Uploading analise_hashtag ({len(df_hashtags_final)} linhas)...")
-            success_hashtags = load_to_sheets(df_hashtags_final, config, tab_name="analise_hashtag")
-            time.sleep(5)
-
-        # Carga 3a: Top Posts MyCreator
-        success_top = True
+        # Consolidação da base do Looker Studio (antes feita pelo Apps Script).
+        # Em overwrite/diff a aba de dados brutos fica igual ao df_final, então
+        # o join sai da memória e a aba vai no mesmo lote das demais.
+        df_looker = None
+        if config.native_consolidation and config.write_mode != "append":
+            logger.info("🔗 Consolidando base_looker_studio_posts (dados_brutos x dados_posts)...")
+            df_looker = consolidate_posts(df_final, get_sheet_data(config, "dados_posts", create=False))
+        
+        # Cargas: Posts (Dados Brutos), Hashtags, Top Posts, Crescimento (+ métricas) e Base Looker.
+        # Uma única sessão do Sheets; abas em overwrite vão juntas em lote.
+        frames = {
+            config.sheet_tab_name: df_final,
+            "analise_hashtag": df_hashtags_final,
+        }
         if not df_top_posts.empty:
-            df_mycreator_top = df_top_posts[df_top_posts['fonte'] == 'mycreator'].copy()
-            df_nativo_top    = df_top_posts[df_top_posts['fonte'] == 'instagram_nativo'].copy()
-
-            if not df_mycreator_top.empty:
-                logger.info(f"Uploading top_posts_mycreator ({len(df_mycreator_top)} linhas)...")
-                success_top = load_to_sheets(df_mycreator_top, config, tab_name="top_posts_mycreator")
-                time.sleep(5)
-
-            if not df_nativo_top.empty:
-                logger.info(f"Uploading top_posts_pessoais ({len(df_nativo_top)} linhas)...")
-                success_top = load_to_sheets(df_nativo_top, config, tab_name="top_posts_pessoais") and success_top
-                time.sleep(5)
-
-        # Carga 4: Crescimento de Seguidores
-        success_growth = True
-        if not df_audience_growth.empty:
-            logger.info(f"Uploading crescimento_seguidores ({len(df_audience_growth)} linhas)...")
-            success_growth = load_to_sheets(df_audience_growth, config, tab_name="crescimento_seguidores")
-            time.sleep(5)
-
-        if not all([success_posts, success_hashtags, success_top, success_growth]):
+            frames["top_posts_mycreator"] = df_top_posts[df_top_posts['fonte'] == 'mycreator'].copy()
+            frames["top_posts_pessoais"] = df_top_posts[df_top_posts['fonte'] == 'instagram_nativo'].copy()
+        frames["crescimento_seguidores"] = df_audience_growth
+        frames["crescimento_metricas"] = df_growth_metrics
+        if df_looker is not None:
+            frames["base_looker_studio_posts"] = df_looker
+        
+        for tab_name, df_tab in frames.items():
+            if not df_tab.empty:
+                logger.info(f"Uploading {tab_name} ({len(df_tab)} linhas)...")
+        
+        sheets_results = write_sheets_tabs(
+            frames, config,
+            key_columns={
+                config.sheet_tab_name: ["id_interno", "id_instagram"],
+                "crescimento_seguidores": ["data", "cidade", "perfil"],
+            },
+            write_modes={"base_looker_studio_posts": "overwrite", "crescimento_metricas": "overwrite"},
+        )
+
+        if not all(sheets_results.values()):
             logger.error("❌ Falha parcial na atualização do Google Sheets!")
         else:
             logger.info("✅ Google Sheets (4 abas essenciais) atualizado com sucesso!")
@@ -516,13 +431,30 @@ def run_etl() -> bool:
         logger.info(f"⏱️ Duração: {duration:.2f} segundos")
         logger.info(f"⏱️ Duração: {duration:.2f} segundos")
         logger.info(f"📊 Posts processados: {total_posts}")
+        if extractor.cache:
+            extractor.cache.log_stats()
+        THROTTLE_STATS.log_summary()
         logger.info(f"📄 Sheets: https://docs.google.com/spreadsheets/d/{config.google_sheet_id}")
         logger.info("=" * 60)
         
         # =====================================================================
-        # ETAPA 4: ACIONAR GOOGLE APPS SCRIPT
+        # ETAPA 4: CONSOLIDAÇÃO (BASE LOOKER STUDIO)
         # =====================================================================
-        if config.apps_script_url:
+        RUN_METRICS.start_stage("consolidation")
+        if config.native_consolidation:
+            if df_looker is None:
+                # Modo append: a aba de dados brutos acumula histórico, então o
+                # join usa a aba inteira (como o Apps Script fazia)
+                logger.info("\n🔗 ETAPA 4: CONSOLIDAÇÃO DA BASE LOOKER STUDIO")
+                df_looker = consolidate_posts(
+                    get_sheet_data(config, config.sheet_tab_name),
+                    get_sheet_data(config, "dados_posts", create=False),
+                )
+                write_sheets_tabs(
+                    {"base_looker_studio_posts": df_looker}, config,
+                    write_modes={"base_looker_studio_posts": "overwrite"},
+                )
+        elif config.apps_script_url:
             logger.info("\n🔄 ETAPA 4: ACIONANDO GOOGLE APPS SCRIPT (CONSOLIDAÇÃO)...")
             logger.info(f"🌐 URL: {config.apps_script_url}")
             try:
@@ -534,53 +466,33 @@ def run_etl() -> bool:
                         logger.info(f"✅ Google Apps Script executado com sucesso: {resp_json}")
                     except ValueError:
                         logger.info("✅ Google Apps Script executado com sucesso (sem JSON).")
-                    
-                    # Wait for GAS to complete (5-10 seconds as planned)
-                    logger.info("⏳ Aguardando 15s para consolidação finalizar no Google...")
-                    time.sleep(15)
+                    # doGet só responde após a consolidação terminar: a leitura
+                    # da ETAPA 5 pode seguir direto (com retentativa em 429/5xx)
                 else:
                     logger.warning(f"⚠️ Google Apps Script retornou status HTTP {response.status_code}")
                     logger.warning("⚠️ Prosseguindo para sincronização com dados possivelmente desatualizados.")
             except Exception as e:
                 logger.error(f"❌ Erro ao acionar Apps Script: {e}")
         # =====================================================================
-        # ETAPA 5: FETCH CONSOLIDATED DATA & SAVE TO SUPABASE
+        # ETAPA 5: SAVE CONSOLIDATED DATA TO SUPABASE
         # =====================================================================
         logger.info("\n🗄️ ETAPA 5: SINCRONIZAÇÃO CLOUD (SUPABASE)")
+        RUN_METRICS.start_stage("supabase")
         
         try:
-            # 5.1 Sincronizar Posts Consolidados
-            df_consolidated = get_sheet_data(config, "base_looker_studio_posts")
+            # 5.1 Sincronizar Posts Consolidados (da memória; lê a aba só no modo Apps Script)
+            if df_looker is not None:
+                df_consolidated = df_looker
+            else:
+                df_consolidated = get_sheet_data(config, "base_looker_studio_posts")
             
             if not df_consolidated.empty:
                 logger.info(f"🧹 Limpando e formatando posts para Supabase...")
-                
-                cols_to_clean = ["curtidas", "comentarios", "salvos", "compartilhamentos", "alcance"]
-                cols_rate = ["taxa_engajamento", "taxa_alcance"]
-                
-                for col in cols_to_clean:
-                    if col in df_consolidated.columns:
-                        df_consolidated[col] = pd.to_numeric(
-                            df_consolidated[col].astype(str).str.replace(".", "").replace("", "0"), 
-                            errors='coerce'
-                        ).fillna(0).astype(int)
-                        
-                for col in cols_rate:
-                    if col in df_consolidated.columns:
-                        def clean_rate(val):
-                            if not val: return 0.0
-                            val_str = str(val).replace("%", "").replace(",", ".").strip()
-                            try:
-                                f_val = float(val_str)
-                                if "%" in str(val) or f_val > 1.0:
-                                    return round(f_val / 100, 4)
-                                return round(f_val, 4)
-                            except:
-                                return 0.0
-                        df_consolidated[col] = df_consolidated[col].apply(clean_rate)
+                df_consolidated = prepare_posts_for_supabase(df_consolidated)
                 
                 db = SupabaseDatabase(config.supabase_uri)
-                db.save_posts(df_consolidated, table_name="posts_final")
+                # A base consolidada é completa: posts que saíram dela saem do banco
+                db.save_posts(df_consolidated, table_name="posts_final", delete_missing=True)
                 db.close()
                 logger.info(f"✅ SUCESSO: {len(df_consolidated)} posts sincronizados no Supabase (tabela: posts_final).")
             else:
@@ -601,20 +513,36 @@ def run_etl() -> bool:
                         ).fillna(0).astype(int)
                 
                 db = SupabaseDatabase(config.supabase_uri)
-                db.save_posts(df_growth_sheet, table_name="seguidores_history")
+                db.save_posts(df_growth_sheet, table_name="seguidores_history", delete_missing=True)
                 db.close()
                 logger.info(f"✅ SUCESSO: {len(df_growth_sheet)} linhas de histórico sincronizadas no Supabase (tabela: seguidores_history).")
             else:
                 logger.warning("⚠️ Não foi possível ler a aba 'crescimento_seguidores'.")
+
+            # 5.3 Histórico de métricas (uma linha por post por extração)
+            if config.metrics_history and not df_posts.empty:
+                db = SupabaseDatabase(config.supabase_uri)
+                db.append_metrics_history(df_posts, extracted_at=start_time.astimezone())
+                db.close()
         
         except Exception as e:
             logger.error(f"❌ Erro crítico na sincronização Supabase: {e}")
                 
+        success = True
         return True
         
     except Exception as e:
         logger.exception(f"❌ Erro fatal: {e}")
         return False
+    
+    finally:
+        # Relatório estruturado da execução (comparável entre execuções)
+        write_run_report(
+            config,
+            success=success,
+            posts=total_posts,
+            throttle=THROTTLE_STATS.to_dict(),
+        )
 
 
 if __name__ == "__main__":
@@ -0,0 +1,185 @@
+"""
+Registro de Contas Sociais (cache por execução).
+
+Centraliza as chamadas ao /backend/fetchSocialAccounts: cada workspace é
+consultado uma única vez por execução e o resultado é compartilhado por
+todas as etapas (seguidores, perfis, crescimento, top posts e sync).
+
+Opcionalmente persiste em disco (JSON) com TTL, para reaproveitar a
+lista de contas entre execuções próximas.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+logger = logging.getLogger("mycreator_etl")
+
+
+class SocialAccountRegistry:
+    """
+    Cache das contas sociais de cada workspace.
+
+    Thread-safe: threads pedindo o mesmo workspace ao mesmo tempo
+    aguardam uma única requisição.
+    """
+
+    ENDPOINT = "/backend/fetchSocialAccounts"
+
+    def __init__(self, extractor, cache_path: str = "", ttl_seconds: int = 21600):
+        """
+        Inicializa o registro.
+
+        Args:
+            extractor: MyCreatorExtractor usado para as requisições
+            cache_path: Arquivo JSON para persistir entre execuções ("" desativa)
+            ttl_seconds: Validade das entradas persistidas em disco
+        """
+        self.extractor = extractor
+        self.cache_path = Path(cache_path) if cache_path else None
+        self.ttl_seconds = ttl_seconds
+
+        self._accounts: Dict[str, dict] = {}
+        self._disk: Optional[Dict[str, dict]] = None
+        self._lock = threading.Lock()
+        self._workspace_locks: Dict[str, threading.Lock] = {}
+
+    def _workspace_lock(self, workspace_id: str) -> threading.Lock:
+        """Retorna o lock de um workspace (um fetch por workspace por vez)."""
+        with self._lock:
+            return self._workspace_locks.setdefault(workspace_id, threading.Lock())
+
+    # =========================================================================
+    # PERSISTÊNCIA EM DISCO
+    # =========================================================================
+    def _load_disk(self) -> Dict[str, dict]:
+        """Carrega (uma vez) o cache persistido em disco."""
+        if self._disk is not None:
+            return self._disk
+
+        self._disk = {}
+        if self.cache_path and self.cache_path.exists():
+            try:
+                with open(self.cache_path, "r", encoding="utf-8") as f:
+                    self._disk = json.load(f)
+            except (OSError, json.JSONDecodeError) as e:
+                logger.warning(f"⚠️ Cache de contas ilegível ({self.cache_path}): {e}")
+        return self._disk
+
+    def _save_disk(self, workspace_id: str, data: dict):
+        """Grava a entrada de um workspace no cache em disco (escrita atômica)."""
+        if not self.cache_path:
+            return
+
+        with self._lock:
+            disk = self._load_disk()
+            disk[workspace_id] = {"fetched_at": time.time(), "data": data}
+            try:
+                self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = self.cache_path.with_suffix(".tmp")
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(disk, f, ensure_ascii=False)
+                os.replace(tmp_path, self.cache_path)
+            except OSError as e:
+                logger.warning(f"⚠️ Não foi possível gravar cache de contas: {e}")
+
+    def _from_disk(self, workspace_id: str) -> Optional[dict]:
+        """Retorna a entrada persistida se ainda estiver dentro do TTL."""
+        if not self.cache_path:
+            return None
+
+        with self._lock:
+            entry = self._load_disk().get(workspace_id)
+        if not entry:
+            return None
+
+        age = time.time() - entry.get("fetched_at", 0)
+        if age > self.ttl_seconds:
+            return None
+
+        logger.debug(f"💾 Contas de {workspace_id} lidas do cache em disco ({age:.0f}s)")
+        return entry.get("data")
+
+    # =========================================================================
+    # CONSULTA
+    # =========================================================================
+    def get(self, workspace_id: str) -> Optional[dict]:
+        """
+        Retorna a resposta do fetchSocialAccounts de um workspace.
+
+        Args:
+            workspace_id: ID do workspace
+
+        Returns:
+            dict: JSON de contas por rede social, ou None se a API falhou
+        """
+        if workspace_id in self._accounts:
+            return self._accounts[workspace_id]
+
+        with self._workspace_lock(workspace_id):
+            # Outra thread pode ter buscado enquanto aguardávamos o lock
+            if workspace_id in self._accounts:
+                return self._accounts[workspace_id]
+
+            data = self._from_disk(workspace_id)
+            if data is None:
+                data = self._fetch(workspace_id)
+                if data is None:
+                    return None
+                self._save_disk(workspace_id, data)
+
+            self._accounts[workspace_id] = data
+            return data
+
+    def _fetch(self, workspace_id: str) -> Optional[dict]:
+        """Chama o /backend/fetchSocialAccounts."""
+        try:
+            resp = self.extractor._handle_401_and_retry(
+                "post",
+                f"{self.extractor.config.base_url}{self.ENDPOINT}",
+                json={"workspace_id": workspace_id},
+                timeout=15
+            )
+            if resp.status_code != 200:
+                logger.warning(f"⚠️ fetchSocialAccounts falhou para {workspace_id}: {resp.status_code}")
+                return None
+            return resp.json()
+        except Exception as e:
+            logger.warning(f"⚠️ Erro em fetchSocialAccounts ({workspace_id}): {e}")
+            return None
+
+    def accounts(self, workspace_id: str, platform: str = "instagram") -> List[dict]:
+        """
+        Retorna a lista de contas de uma rede social no workspace.
+
+        Args:
+            workspace_id: ID do workspace
+            platform: Chave da rede na resposta (instagram, facebook...)
+
+        Returns:
+            Lista de contas (dicts crus da API); vazia se não houver
+        """
+        data = self.get(workspace_id) or {}
+        platform_data = data.get(platform, {})
+        return platform_data.get("accounts", []) if isinstance(platform_data, dict) else []
+
+    def instagram_accounts(self, workspace_id: str) -> List[dict]:
+        """Atalho para accounts(workspace_id, "instagram")."""
+        return self.accounts(workspace_id, "instagram")
+
+    def invalidate(self, workspace_id: Optional[str] = None):
+        """
+        Descarta o cache em memória (de um workspace ou de todos).
+
+        Args:
+            workspace_id: Workspace a descartar (None = todos)
+        """
+        with self._lock:
+            if workspace_id is None:
+                self._accounts.clear()
+            else:
+                self._accounts.pop(workspace_id, None)
@@ -0,0 +1,416 @@
+"""
+Cliente assíncrono (asyncio) da API MyCreator.
+
+Alternativa ao fluxo sequencial de MyCreatorExtractor._extract_single_workspace,
+encadeando as três etapas em pipeline:
+
+    Listagem (fetchPlans) -> fila de Previews -> Analytics (disparados na hora)
+
+Todas as requisições passam por um único semáforo (teto de concorrência)
+e pelo rate limiter adaptativo e política de retentativa do extrator. A lógica de parsing e o estado
+de autenticação são reaproveitados do MyCreatorExtractor.
+
+Mesmo comportamento do modo síncrono: estado incremental (previews e
+métricas reaproveitados), analytics em lote com ANALYTICS_BATCH_SIZE > 1
+(agrupados por workspace/conta) e cache HTTP em disco (lido e gravado
+fora do event loop). Um erro na listagem de um workspace aborta a extração.
+"""
+
+import asyncio
+import json
+import logging
+import time
+from typing import Dict, List, Optional, Tuple
+
+from curl_cffi import requests as curl_requests
+
+from .extract import MyCreatorExtractor, PostData, TARGET_WORKSPACES
+from .metrics import RUN_METRICS
+from .throttle import REJECTED_STATUSES
+
+logger = logging.getLogger("mycreator_etl")
+
+# Chave de ordenação determinística: (workspace, plano, posting)
+ResultKey = Tuple[int, int, int]
+
+# Lote de analytics: (workspace_id, plataforma, conta)
+BatchKey = Tuple[str, str, str]
+
+
+class AsyncMyCreatorExtractor:
+    """
+    Extrator assíncrono com pipeline preview -> analytics.
+
+    Mantém o comportamento de re-autenticação em 401 do extrator síncrono:
+    a re-autenticação é delegada a MyCreatorExtractor._reauthenticate, que
+    garante um único login mesmo com várias requisições recebendo 401.
+    """
+
+    def __init__(self, extractor: MyCreatorExtractor, concurrency: Optional[int] = None):
+        """
+        Inicializa o cliente.
+
+        Args:
+            extractor: Extrator síncrono (config, headers e autenticação)
+            concurrency: Máximo de requisições simultâneas (padrão: MAX_CONCURRENT_REQUESTS)
+        """
+        self.extractor = extractor
+        self.config = extractor.config
+        self.concurrency = concurrency or self.config.max_concurrent_requests
+
+        # Criados dentro do event loop (ver _extract_all)
+        self._session = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+        # Postings aguardando completar um lote de analytics
+        self._pending_batches: Dict[BatchKey, List[tuple]] = {}
+
+    # =========================================================================
+    # HTTP
+    # =========================================================================
+    async def _send(self, method: str, url: str, retry: bool = True, **kwargs):
+        """
+        Envia uma requisição respeitando rate limit e semáforo.
+
+        Mesma política de retentativa do extrator síncrono (429/5xx e
+        falhas de conexão, com backoff exponencial + jitter; com
+        retry=False, só 429).
+        """
+        extractor = self.extractor
+        policy = extractor.retry_policy if retry else extractor.retry_policy.only(REJECTED_STATUSES)
+        attempt = 0
+        while True:
+            # Lock curto: o login (_reauthenticate) não segura _auth_lock
+            with extractor._auth_lock:
+                headers = dict(extractor.headers)
+                generation = extractor._auth_generation
+
+            await extractor.rate_limiter.acquire_async(url)
+            try:
+                async with self._semaphore:
+                    request_func = getattr(self._session, method)
+                    started = time.perf_counter()
+                    response = await request_func(url, headers=headers, **kwargs)
+                extractor._observe(url, started, kwargs, response)
+            except curl_requests.RequestsError as e:
+                extractor._observe(url, started, kwargs)
+                if not retry or attempt >= policy.max_retries:
+                    raise
+                delay = extractor._backoff(url, attempt, None, str(e))
+            else:
+                if not policy.should_retry(response.status_code, attempt):
+                    if response.status_code < 400:
+                        extractor.rate_limiter.reward(url)
+                    return response, generation
+                delay = extractor._backoff(url, attempt, response)
+
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def _handle_401_and_retry(self, method: str, url: str, retry: bool = True, **kwargs):
+        """
+        Executa requisição e tenta re-autenticar em caso de 401.
+
+        Args:
+            method: Método HTTP (get, post)
+            url: URL da requisição
+            retry: Retenta 5xx e falhas de conexão (ver MyCreatorExtractor._send)
+            **kwargs: Argumentos adicionais para a requisição
+
+        Returns:
+            Response
+        """
+        cache = self.extractor.cache
+        if cache:
+            # Leitura/gravação do cache são I/O de disco (gzip): fora do event loop
+            cached = await asyncio.to_thread(cache.get, method, url, kwargs.get("params"), kwargs.get("json"))
+            if cached is not None:
+                return cached
+
+        response, generation = await self._send(method, url, retry=retry, **kwargs)
+
+        if response.status_code == 401 and self.config.can_auto_login:
+            logger.warning("🔄 Sessão expirada (401), tentando re-autenticar...")
+
+            # Login é síncrono (MyCreatorAuth): roda fora do event loop
+            if await asyncio.to_thread(self.extractor._reauthenticate, generation):
+                response, _ = await self._send(method, url, retry=retry, **kwargs)
+            else:
+                logger.error("❌ Re-autenticação falhou")
+
+        if cache:
+            await asyncio.to_thread(cache.put, method, url, response, kwargs.get("params"), kwargs.get("json"))
+
+        return response
+
+    # =========================================================================
+    # ENDPOINTS
+    # =========================================================================
+    async def _fetch_posts_page(self, workspace_id: str, page: int, page_size: int) -> List[dict]:
+        """Versão assíncrona de MyCreatorExtractor._fetch_posts_page (erro = RuntimeError)."""
+        url = f"{self.config.base_url}{self.config.fetch_plans_endpoint}"
+        payload = self.extractor._posts_list_payload(workspace_id, page=page, limit=page_size)
+
+        try:
+            response = await self._handle_401_and_retry("post", url, json=payload, timeout=30)
+            if response.status_code != 200:
+                raise RuntimeError(f"HTTP {response.status_code}")
+            return response.json().get("plans", [])
+        except Exception as e:
+            logger.error(f"❌ Erro na listagem (página {page}): {e}")
+            raise RuntimeError(f"Erro na listagem do workspace {workspace_id} (página {page}): {e}") from e
+
+    async def fetch_posts_list(self, workspace_id: str) -> List[dict]:
+        """Versão assíncrona de MyCreatorExtractor.fetch_posts_list (mesma paginação)."""
+        page_size, cutoff, max_posts = self.extractor._listing_bounds()
+        plans: List[dict] = []
+
+        page = 1
+        previous_first_id = None
+        while True:
+            page_plans = await self._fetch_posts_page(workspace_id, page, page_size)
+            if not page_plans or self.extractor._repeats_page(page_plans, previous_first_id):
+                break
+            previous_first_id = page_plans[0].get("_id")
+
+            page_plans, reached_cutoff = self.extractor._trim_page(page_plans, cutoff)
+            if max_posts:
+                page_plans = page_plans[:max_posts - len(plans)]
+            plans.extend(page_plans)
+
+            if reached_cutoff or (max_posts and len(plans) >= max_posts):
+                break
+            page += 1
+
+        return plans
+
+    async def fetch_plan_details(self, plan_id: str, workspace_id: str) -> Optional[dict]:
+        """Versão assíncrona de MyCreatorExtractor.fetch_plan_details."""
+        url = f"{self.config.base_url}/backend/plan/preview"
+        params = {"id": plan_id, "workspace_id": workspace_id}
+
+        try:
+            resp = await self._handle_401_and_retry("get", url, params=params, timeout=60)
+            if resp.status_code == 200:
+                try:
+                    data = resp.json()
+                    return data.get("plan", data)
+                except json.JSONDecodeError:
+                    return None
+            return None
+        except Exception as e:
+            logger.error(f"❌ Erro ao buscar preview {plan_id}: {e}")
+            return None
+
+    async def fetch_post_analytics(self, posted_id: str, workspace_id: str,
+                                   platform: str, account_id: str) -> Optional[dict]:
+        """Versão assíncrona de MyCreatorExtractor.fetch_post_analytics."""
+        if not posted_id or not account_id:
+            return None
+
+        url = f"{self.config.base_url}{self.config.analytics_endpoint}"
+        payload = self.extractor._analytics_payload(posted_id, workspace_id, platform, account_id)
+
+        try:
+            response = await self._handle_401_and_retry("post", url, json=payload, timeout=10)
+            if response.status_code == 200:
+                data = response.json()
+                if self.extractor._is_valid_analytics(data):
+                    return data
+        except Exception:
+            pass
+        return None
+
+    async def fetch_post_analytics_batch(self, posted_ids: List[str], workspace_id: str,
+                                         platform: str, account_id: str) -> Dict[str, Optional[dict]]:
+        """Versão assíncrona de MyCreatorExtractor.fetch_post_analytics_batch (mesmo fallback)."""
+        posted_ids = [pid for pid in dict.fromkeys(posted_ids) if pid]
+        if not posted_ids or not account_id:
+            return {pid: None for pid in posted_ids}
+
+        if len(posted_ids) == 1:
+            return {posted_ids[0]: await self.fetch_post_analytics(posted_ids[0], workspace_id, platform, account_id)}
+
+        url = f"{self.config.base_url}{self.config.analytics_endpoint}"
+        payload = self.extractor._analytics_payload(
+            posted_ids[0], workspace_id, platform, account_id, all_post_ids=posted_ids
+        )
+
+        results: Dict[str, Optional[dict]] = {}
+        try:
+            response = await self._handle_401_and_retry("post", url, json=payload, timeout=30)
+            if response.status_code == 200:
+                results = self.extractor._split_batch_analytics(response.json(), posted_ids)
+        except Exception as e:
+            logger.debug(f"Analytics em lote falhou ({len(posted_ids)} posts): {e}")
+
+        # Fallback: posts ausentes na resposta em lote vão um a um
+        missing = [pid for pid in posted_ids if pid not in results]
+        fetched = await asyncio.gather(*(
+            self.fetch_post_analytics(pid, workspace_id, platform, account_id) for pid in missing
+        ))
+        results.update(zip(missing, fetched))
+        return results
+
+    # =========================================================================
+    # PIPELINE
+    # =========================================================================
+    async def _list_workspace(self, ws_index: int, ws: dict, queue: asyncio.Queue):
+        """Etapa 1: lista os planos de um workspace e alimenta a fila de previews."""
+        ws_id = ws["id"]
+        ws_name = ws["name"]
+
+        try:
+            # Mapa de contas ativas (filtro anti-ghosting + seguidores)
+            follower_map = await asyncio.to_thread(self.extractor.fetch_workspace_follower_counts, ws_id)
+
+            plans = await self.fetch_posts_list(ws_id)
+            if not plans:
+                logger.warning(f"⚠️ Nenhum post encontrado em {ws_name}")
+                return
+
+            logger.info(f"📦 {ws_name}: {len(plans)} posts na fila de preview")
+            for plan_index, plan in enumerate(plans):
+                await queue.put((ws_index, plan_index, ws, plan.get("_id"), follower_map))
+
+        except Exception as e:
+            # Como no modo síncrono: seguir sem a cidade apagaria os posts dela nos destinos
+            logger.error(f"❌ Erro ao listar workspace {ws_name}: {e}")
+            raise
+
+    async def _preview_worker(self, queue: asyncio.Queue, results: Dict[ResultKey, PostData],
+                              analytics_tasks: List[asyncio.Task]):
+        """Etapa 2: consome a fila de previews e dispara os analytics de cada posting."""
+        while True:
+            ws_index, plan_index, ws, internal_id, follower_map = await queue.get()
+            try:
+                state = self.extractor.state
+                details = state.cached_details(internal_id) if state else None
+                if details is not None:
+                    RUN_METRICS.increment("cache_hits", "state:preview")
+                else:
+                    details = await self.fetch_plan_details(internal_id, ws["id"])
+                    if details and state:
+                        state.save_details(internal_id, ws["id"], details)
+                if not details:
+                    continue
+
+                posts = self.extractor._build_posts_from_details(
+                    details, internal_id, ws["id"], ws["name"], follower_map
+                )
+                for posting_index, (post_item, post_data) in enumerate(posts):
+                    results[(ws_index, plan_index, posting_index)] = post_data
+                    self._schedule_analytics(post_data, post_item, f"[{ws['name']}]", analytics_tasks)
+            except Exception as e:
+                logger.error(f"❌ Erro no preview {internal_id}: {e}")
+            finally:
+                queue.task_done()
+
+    def _schedule_analytics(self, post_data: PostData, post_item: dict, progress: str,
+                            analytics_tasks: List[asyncio.Task]):
+        """
+        Etapa 3: dispara os analytics de um posting.
+
+        Com ANALYTICS_BATCH_SIZE > 1 o posting entra no lote da sua conta,
+        disparado quando enche (ou no fim, ver _flush_batches).
+        """
+        posted_id = post_item.get("posted_id")
+        account_id = post_item.get("platform_id")
+
+        if not (posted_id and account_id):
+            post_data.analytics_error = "ID ou Conta ausente"
+            return
+
+        state = self.extractor.state
+        cached = state.cached_analytics(posted_id, post_data.published_at) if state else None
+        if cached is not None:
+            RUN_METRICS.increment("cache_hits", "state:analytics")
+            self.extractor._apply_analytics(post_data, cached, f"{progress} 💾")
+            return
+
+        item = (posted_id, post_data, progress)
+        batch_size = self.config.analytics_batch_size
+        if batch_size <= 1:
+            analytics_tasks.append(asyncio.create_task(
+                self._fill_analytics(post_data.workspace_id, post_data.platform, account_id, [item])
+            ))
+            return
+
+        key = (post_data.workspace_id, str(post_data.platform).lower(), str(account_id))
+        batch = self._pending_batches.setdefault(key, [])
+        batch.append(item)
+        if len(batch) >= batch_size:
+            del self._pending_batches[key]
+            analytics_tasks.append(asyncio.create_task(self._fill_analytics(*key, batch)))
+
+    def _flush_batches(self, analytics_tasks: List[asyncio.Task]):
+        """Dispara os lotes de analytics incompletos (todos os previews terminaram)."""
+        for key, batch in self._pending_batches.items():
+            analytics_tasks.append(asyncio.create_task(self._fill_analytics(*key, batch)))
+        self._pending_batches = {}
+
+    async def _fill_analytics(self, workspace_id: str, platform: str, account_id: str, items: List[tuple]):
+        """Busca os analytics de postings da mesma conta e preenche os PostData."""
+        if len(items) == 1:
+            posted_id, post_data, _ = items[0]
+            analytics_by_id = {posted_id: await self.fetch_post_analytics(posted_id, workspace_id, platform, account_id)}
+        else:
+            analytics_by_id = await self.fetch_post_analytics_batch(
+                [posted_id for posted_id, _, _ in items], workspace_id, platform, account_id
+            )
+
+        for posted_id, post_data, progress in items:
+            analytics = analytics_by_id.get(posted_id)
+            self.extractor._remember_analytics(post_data, posted_id, analytics)
+            self.extractor._apply_analytics(post_data, analytics, progress)
+
+    async def _extract_all(self, workspaces: List[dict]) -> List[PostData]:
+        """Executa o pipeline completo e devolve os posts em ordem determinística."""
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.concurrency * 2)
+        results: Dict[ResultKey, PostData] = {}
+        analytics_tasks: List[asyncio.Task] = []
+
+        async with curl_requests.AsyncSession(impersonate="chrome110") as session:
+            self._session = session
+
+            workers = [
+                asyncio.create_task(self._preview_worker(queue, results, analytics_tasks))
+                for _ in range(self.concurrency)
+            ]
+
+            try:
+                await asyncio.gather(*(
+                    self._list_workspace(i, ws, queue) for i, ws in enumerate(workspaces)
+                ))
+                await queue.join()
+            finally:
+                for worker in workers:
+                    worker.cancel()
+                await asyncio.gather(*workers, return_exceptions=True)
+
+            # Todos os previews terminaram: nenhum analytics novo será criado
+            self._flush_batches(analytics_tasks)
+            await asyncio.gather(*analytics_tasks)
+
+        self._session = None
+        return [results[key] for key in sorted(results)]
+
+    def extract_from_workspaces(self, workspaces: List[dict] = None) -> List[PostData]:
+        """
+        Extrai dados de múltiplos workspaces via pipeline assíncrono.
+
+        Args:
+            workspaces: Lista de dicts com 'id' e 'name'. Se None, usa TARGET_WORKSPACES.
+
+        Returns:
+            Lista consolidada de PostData (mesma ordem do modo síncrono).
+        """
+        if workspaces is None:
+            workspaces = TARGET_WORKSPACES
+
+        logger.info(f"⚡ Extração assíncrona: até {self.concurrency} requisições simultâneas")
+        all_results = asyncio.run(self._extract_all(workspaces))
+
+        logger.info(f"\n🏁 TOTAL GLOBAL: {len(all_results)} posts de {len(workspaces)} workspaces")
+        return all_results
@@ -0,0 +1,219 @@
+"""
+Cache em disco das respostas HTTP do extrator.
+
+Chave: endpoint + hash SHA-256 do payload canônico (JSON ordenado).
+Cada endpoint tem seu próprio TTL (previews de posts publicados quase
+nunca mudam; analytics e getSummary mudam a cada execução). As respostas
+ficam comprimidas (gzip) e o diretório é limitado em tamanho, removendo
+as entradas usadas há mais tempo (LRU).
+
+Com o modo offline, o cache ignora TTLs e nunca vai à rede, permitindo
+reproduzir uma execução inteira localmente (ex: para profiling).
+"""
+
+import gzip
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+from .metrics import RUN_METRICS
+
+logger = logging.getLogger("mycreator_etl")
+
+# TTL (segundos) por endpoint. Endpoints fora da lista não são cacheados.
+DEFAULT_TTLS: Dict[str, int] = {
+    "/backend/plan/preview": 7 * 24 * 3600,
+    "/backend/fetchSocialAccounts": 6 * 3600,
+    "/backend/fetchPlans": 10 * 60,
+    "/backend/analytics/campaignLabelAnalytics/getPlannerAnalytics": 30 * 60,
+    "/backend/analytics/overview/getSummary": 30 * 60,
+    "/backend/analytics/overview/instagram/audience_growth": 30 * 60,
+    "/backend/analytics/overview/instagram/top_posts": 30 * 60,
+}
+
+
+class CachedResponse:
+    """Resposta lida do cache, com a mesma interface usada do curl_cffi."""
+
+    from_cache = True
+
+    def __init__(self, status_code: int, content: bytes, headers: dict = None, url: str = ""):
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers or {}
+        self.url = url
+
+    @property
+    def text(self) -> str:
+        return self.content.decode("utf-8", errors="replace")
+
+    def json(self):
+        return json.loads(self.content)
+
+
+class ResponseCache:
+    """
+    Cache de respostas HTTP em disco, thread-safe.
+
+    Layout: <diretório>/<2 primeiros chars da chave>/<chave>.json.gz
+    """
+
+    def __init__(self, directory: str, max_bytes: int = 512 * 1024 * 1024,
+                 ttls: Dict[str, int] = None, offline: bool = False):
+        """
+        Inicializa o cache.
+
+        Args:
+            directory: Diretório das entradas
+            max_bytes: Tamanho máximo em disco (bytes comprimidos)
+            ttls: TTL por endpoint (padrão: DEFAULT_TTLS)
+            offline: Ignora TTLs e nunca acessa a rede (replay)
+        """
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.ttls = ttls if ttls is not None else DEFAULT_TTLS
+        self.offline = offline
+
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._size = sum(p.stat().st_size for p in self.directory.glob("*/*.json.gz"))
+
+    # =========================================================================
+    # CHAVES
+    # =========================================================================
+    def ttl_for(self, url: str) -> Optional[int]:
+        """TTL do endpoint da URL (None = endpoint não cacheável)."""
+        return self.ttls.get(urlparse(url).path)
+
+    @staticmethod
+    def make_key(method: str, url: str, params: dict = None, payload=None) -> str:
+        """Chave do cache: método + endpoint + hash do payload canônico."""
+        canonical = json.dumps(
+            {"params": params or {}, "json": payload},
+            sort_keys=True, ensure_ascii=False, separators=(",", ":"),
+        )
+        path = urlparse(url).path
+        digest = hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+        return hashlib.sha256(f"{method.upper()} {path} {digest}".encode("utf-8")).hexdigest()
+
+    def _path_for(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.json.gz"
+
+    # =========================================================================
+    # LEITURA / ESCRITA
+    # =========================================================================
+    def get(self, method: str, url: str, params: dict = None, json_payload=None) -> Optional[CachedResponse]:
+        """
+        Busca uma resposta no cache.
+
+        Returns:
+            CachedResponse, ou None em caso de miss/expiração. No modo offline,
+            um miss devolve uma resposta 504 (nada sai para a rede).
+        """
+        ttl = self.ttl_for(url)
+        if ttl is None and not self.offline:
+            return None
+
+        path = self._path_for(self.make_key(method, url, params, json_payload))
+        entry = None
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            entry = None
+
+        if entry is not None and (self.offline or time.time() - entry["stored_at"] <= ttl):
+            with self._lock:
+                self.hits += 1
+            RUN_METRICS.increment("cache_hits", urlparse(url).path)
+            os.utime(path)  # Marca uso recente (LRU)
+            logger.debug(f"💾 Cache hit: {urlparse(url).path}")
+            return CachedResponse(entry["status"], entry["body"].encode("utf-8"), entry.get("headers"), url)
+
+        with self._lock:
+            self.misses += 1
+        RUN_METRICS.increment("cache_misses", urlparse(url).path)
+
+        if self.offline:
+            logger.warning(f"⚠️ Cache offline sem entrada para {urlparse(url).path}")
+            return CachedResponse(504, b"{}", {}, url)
+        return None
+
+    def put(self, method: str, url: str, response, params: dict = None, json_payload=None):
+        """Grava uma resposta 200 de um endpoint cacheável."""
+        if self.offline or response.status_code != 200 or self.ttl_for(url) is None:
+            return
+
+        try:
+            body = response.content.decode("utf-8")
+        except (AttributeError, UnicodeDecodeError):
+            return
+
+        entry = {
+            "url": url,
+            "status": response.status_code,
+            "headers": {"Content-Type": (response.headers or {}).get("Content-Type", "")},
+            "stored_at": time.time(),
+            "body": body,
+        }
+
+        path = self._path_for(self.make_key(method, url, params, json_payload))
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            previous = path.stat().st_size if path.exists() else 0
+            tmp_path = path.with_name(f"{path.name}.{threading.get_ident()}.tmp")
+            with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+                json.dump(entry, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+
+            with self._lock:
+                self.stores += 1
+                self._size += path.stat().st_size - previous
+                over_limit = self._size > self.max_bytes
+            if over_limit:
+                self._evict()
+        except OSError as e:
+            logger.debug(f"Não foi possível gravar no cache: {e}")
+
+    def _evict(self):
+        """Remove as entradas usadas há mais tempo até caber no limite."""
+        with self._lock:
+            entries = []
+            for path in self.directory.glob("*/*.json.gz"):
+                try:
+                    stat = path.stat()
+                    entries.append((stat.st_mtime, stat.st_size, path))
+                except OSError:
+                    continue
+
+            self._size = sum(size for _, size, _ in entries)
+            target = self.max_bytes * 0.9
+            for _, size, path in sorted(entries):
+                if self._size <= target:
+                    break
+                try:
+                    path.unlink()
+                    self._size -= size
+                    self.evictions += 1
+                except OSError:
+                    continue
+
+    def log_stats(self):
+        """Loga o resumo de uso do cache."""
+        total = self.hits + self.misses
+        ratio = (self.hits / total * 100) if total else 0.0
+        logger.info(
+            f"💾 Cache HTTP: {self.hits} hits / {self.misses} misses ({ratio:.0f}%) | "
+            f"{self.stores} gravações | {self.evictions} remoções | {self._size / 1024 / 1024:.1f} MB"
+        )
@@ -48,17 +48,68 @@ class Config:
     
     # Configurações de execução
     posts_limit: int
-    write_mode: str  # "overwrite" ou "append"
+    write_mode: str  # "overwrite", "append" ou "diff"
     debug_mode: bool
     
+    # Paginação da listagem (fetchPlans)
+    page_size: int = 50  # Planos por página
+    backfill_since: str = ""  # Data de corte (YYYY-MM-DD) para parar a paginação
+    
+    # Concorrência da extração
+    max_workers: int = 4  # Workspaces processados em paralelo (1 = sequencial)
+    max_concurrent_requests: int = 8  # Teto global de requisições simultâneas
+    rate_limit_rps: float = 5.0  # Requisições por segundo por host
+    endpoint_rate_limits: str = ""  # Orçamentos por endpoint: "path=rps,path=rps"
+    max_retries: int = 4  # Retentativas em 429/5xx (backoff exponencial com jitter)
+    retry_base_delay: float = 1.0  # Atraso base do backoff (segundos)
+    retry_max_delay: float = 60.0  # Teto do backoff e do Retry-After (segundos)
+    sheets_rate_limit_rps: float = 1.0  # Chamadas por segundo à API do Google Sheets
+    sheets_chunk_rows: int = 5000  # Linhas por requisição de escrita no Google Sheets
+    async_extraction: bool = False  # Usa o cliente asyncio (pipeline preview -> analytics)
+    analytics_batch_size: int = 1  # Posts por chamada de getPlannerAnalytics (1 = uma por post)
+    
+    summary_batch_size: int = 1  # Contas por chamada de getSummary (1 = uma por conta)
+    
+    # Extração incremental (estado local em SQLite)
+    incremental_mode: bool = False
+    state_db_path: str = "mycreator_state.db"
+    refresh_policy: str = "48h:1h,30d:1d,*:7d"  # idade:intervalo de refresh dos analytics
+    preview_max_age: str = "7d"  # revalida o preview de planos conhecidos após esse tempo
+    
+    # Cache HTTP em disco ("" = desativado)
+    http_cache_dir: str = ""
+    http_cache_max_mb: int = 512
+    http_cache_offline: bool = False  # Replay: só lê do cache, nunca acessa a API
+    
+    # Cache de contas sociais entre execuções ("" = apenas em memória)
+    accounts_cache_path: str = ""
+    accounts_cache_ttl: int = 21600  # segundos
+    
     # URLs da API MyCreator
     base_url: str = "https://mycreator.myside.com.br"
     fetch_plans_endpoint: str = "/backend/fetchPlans"
     analytics_endpoint: str = "/backend/analytics/campaignLabelAnalytics/getPlannerAnalytics"
     
+    # Consolidação da base do Looker Studio em Python (False = Apps Script)
+    native_consolidation: bool = True
+    
     # Automations
     apps_script_url: Optional[str] = None
     
+    # Histórico de métricas no Supabase (post_metrics_history)
+    metrics_history: bool = True
+    
+    # Índice persistente de hashtags (SQLite; vazio = agrega só a execução)
+    hashtag_index_path: str = ""
+    
+    # Snapshots Parquet locais de cada execução (vazio = desativado)
+    snapshot_dir: str = ""
+    snapshot_compression: str = "zstd"
+    
+    # Relatório da execução (JSON por execução; Prometheus textfile opcional)
+    metrics_report_dir: str = ""
+    metrics_prometheus_path: str = ""
+    
     def __post_init__(self):
         """Validações após inicialização."""
         # Valida que tem pelo menos uma forma de autenticação
@@ -72,9 +123,18 @@ class Config:
                 "   - MYCREATOR_EMAIL + MYCREATOR_PASSWORD"
             )
         
-        if self.write_mode not in ("overwrite", "append"):
+        if self.write_mode not in ("overwrite", "append", "diff"):
             raise ValueError(f"❌ WRITE_MODE inválido: {self.write_mode}")
         
+        if self.max_workers < 1 or self.max_concurrent_requests < 1:
+            raise ValueError("❌ MAX_WORKERS e MAX_CONCURRENT_REQUESTS devem ser >= 1")
+        
+        if self.max_retries < 0:
+            raise ValueError("❌ MAX_RETRIES deve ser >= 0")
+        
+        if self.sheets_chunk_rows < 1:
+            raise ValueError("❌ SHEETS_CHUNK_ROWS deve ser >= 1")
+        
         # Garante formato correto do token
         if self.authorization_token and not self.authorization_token.startswith("Bearer "):
             object.__setattr__(self, 'authorization_token', f"Bearer {self.authorization_token}")
@@ -154,11 +214,52 @@ def get_config() -> Config:
         write_mode=os.environ.get("WRITE_MODE", "overwrite"),
         debug_mode=os.environ.get("DEBUG_MODE", "false").lower() == "true",
         
-        # Automations
+        # Paginação da listagem
+        page_size=int(os.environ.get("PAGE_SIZE", "50")),
+        backfill_since=os.environ.get("BACKFILL_SINCE", ""),
+        
+        # Concorrência da extração
+        max_workers=int(os.environ.get("MAX_WORKERS", "4")),
+        max_concurrent_requests=int(os.environ.get("MAX_CONCURRENT_REQUESTS", "8")),
+        rate_limit_rps=float(os.environ.get("RATE_LIMIT_RPS", "5")),
+        endpoint_rate_limits=os.environ.get("ENDPOINT_RATE_LIMITS", ""),
+        max_retries=int(os.environ.get("MAX_RETRIES", "4")),
+        retry_base_delay=float(os.environ.get("RETRY_BASE_DELAY", "1")),
+        retry_max_delay=float(os.environ.get("RETRY_MAX_DELAY", "60")),
+        sheets_rate_limit_rps=float(os.environ.get("SHEETS_RATE_LIMIT_RPS", "1")),
+        sheets_chunk_rows=int(os.environ.get("SHEETS_CHUNK_ROWS", "5000")),
+        async_extraction=os.environ.get("ASYNC_EXTRACTION", "false").lower() == "true",
+        analytics_batch_size=int(os.environ.get("ANALYTICS_BATCH_SIZE", "1")),
+        summary_batch_size=int(os.environ.get("SUMMARY_BATCH_SIZE", "1")),
+        incremental_mode=os.environ.get("INCREMENTAL_MODE", "false").lower() == "true",
+        state_db_path=os.environ.get("STATE_DB_PATH", "mycreator_state.db"),
+        refresh_policy=os.environ.get("REFRESH_POLICY", "48h:1h,30d:1d,*:7d"),
+        preview_max_age=os.environ.get("PREVIEW_MAX_AGE", "7d"),
+        http_cache_dir=os.environ.get("HTTP_CACHE_DIR", ""),
+        http_cache_max_mb=int(os.environ.get("HTTP_CACHE_MAX_MB", "512")),
+        http_cache_offline=os.environ.get("HTTP_CACHE_OFFLINE", "false").lower() == "true",
+        accounts_cache_path=os.environ.get("ACCOUNTS_CACHE_PATH", ""),
+        accounts_cache_ttl=int(os.environ.get("ACCOUNTS_CACHE_TTL", "21600")),
+        
+        # URL da API MyCreator (servidor sintético em testes de carga)
+        base_url=os.environ.get("MYCREATOR_BASE_URL", "https://mycreator.myside.com.br").rstrip("/"),
+        
+        # Consolidação e Automations
+        native_consolidation=os.environ.get("NATIVE_CONSOLIDATION", "true").lower() == "true",
         apps_script_url=os.environ.get("APPS_SCRIPT_URL", None),
         
         # Supabase
         supabase_uri=_sanitize_uri(os.environ.get("URI", "")),
+        metrics_history=os.environ.get("METRICS_HISTORY", "true").lower() == "true",
+        
+        # Hashtags e snapshots
+        hashtag_index_path=os.environ.get("HASHTAG_INDEX_PATH", ""),
+        snapshot_dir=os.environ.get("SNAPSHOT_DIR", ""),
+        snapshot_compression=os.environ.get("SNAPSHOT_COMPRESSION", "zstd"),
+        
+        # Relatório da execução
+        metrics_report_dir=os.environ.get("METRICS_REPORT_DIR", ""),
+        metrics_prometheus_path=os.environ.get("METRICS_PROMETHEUS_PATH", ""),
     )
 
 def _sanitize_uri(uri: str) -> str:
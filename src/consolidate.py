@@ -0,0 +1,149 @@
+"""
+Consolidação da base do Looker Studio (antes feita pelo Google Apps Script).
+
+Porta para pandas a função atualizarBaseLookerStudio() de
+atualizarBaseLookerStudio.js: junta dados_brutos com os metadados
+editoriais da aba dados_posts (por id_interno) e gera a aba
+base_looker_studio_posts, com o mesmo contrato de colunas.
+
+Também concentra a limpeza dos posts consolidados antes do Supabase,
+que aceita tanto valores em memória (números) quanto lidos do Sheets
+(texto formatado em pt-BR).
+"""
+
+import logging
+from typing import Optional
+
+import pandas as pd
+
+logger = logging.getLogger("mycreator_etl")
+
+# Colunas de base_looker_studio_posts (mesma ordem do Apps Script)
+BRUTOS_COLUMNS = [
+    "id_interno", "data_publicacao", "cidade", "perfil", "rede_social",
+    "curtidas", "comentarios", "salvos", "compartilhamentos", "taxa_engajamento", "alcance", "taxa_alcance",
+]
+METADATA_COLUMNS = ["titulo_referencia", "formato", "tipo_midia", "categoria_conteudo", "linha_editorial"]
+LOOKER_COLUMNS = BRUTOS_COLUMNS + METADATA_COLUMNS
+
+# Posição das colunas na aba dados_posts (preenchida manualmente; o Apps
+# Script lê por posição: A = id do post, D..H = metadados editoriais)
+DADOS_POSTS_ID_POSITION = 0
+DADOS_POSTS_METADATA_POSITIONS = [3, 4, 5, 6, 7]
+
+# Métricas inteiras e taxas enviadas ao Supabase
+COUNT_COLUMNS = ["curtidas", "comentarios", "salvos", "compartilhamentos", "alcance"]
+RATE_COLUMNS = ["taxa_engajamento", "taxa_alcance"]
+
+
+def posts_metadata(df_dados_posts: Optional[pd.DataFrame]) -> pd.DataFrame:
+    """
+    Extrai os metadados editoriais da aba dados_posts.
+
+    Args:
+        df_dados_posts: Aba dados_posts (primeira linha = header)
+
+    Returns:
+        DataFrame com id_interno + METADATA_COLUMNS, um registro por post
+        (em ids repetidos vale a última linha, como no Apps Script)
+    """
+    columns = ["id_interno"] + METADATA_COLUMNS
+    if df_dados_posts is None or df_dados_posts.empty:
+        return pd.DataFrame(columns=columns)
+
+    if df_dados_posts.shape[1] <= max(DADOS_POSTS_METADATA_POSITIONS):
+        logger.warning(f"⚠️ dados_posts com {df_dados_posts.shape[1]} colunas (esperado >= 8). Metadados ignorados.")
+        return pd.DataFrame(columns=columns)
+
+    meta = df_dados_posts.iloc[:, [DADOS_POSTS_ID_POSITION] + DADOS_POSTS_METADATA_POSITIONS].copy()
+    meta.columns = columns
+    meta["id_interno"] = meta["id_interno"].fillna("").astype(str)
+    meta = meta[meta["id_interno"] != ""]
+
+    return meta.drop_duplicates("id_interno", keep="last")
+
+
+def consolidate_posts(df_brutos: pd.DataFrame, df_dados_posts: Optional[pd.DataFrame]) -> pd.DataFrame:
+    """
+    Gera a base do Looker Studio (join dados_brutos x dados_posts).
+
+    Mesmas regras do Apps Script:
+    - cabeçalhos de dados_brutos comparados sem espaços/maiúsculas
+    - colunas ausentes em dados_brutos ficam em branco
+    - posts sem metadados ficam com os campos editoriais em branco
+    - posts com titulo_referencia "teste" são descartados
+
+    Args:
+        df_brutos: Posts (aba dados_brutos ou o DataFrame em memória)
+        df_dados_posts: Aba dados_posts
+
+    Returns:
+        DataFrame com LOOKER_COLUMNS, na ordem de dados_brutos
+    """
+    if df_brutos is None or df_brutos.empty:
+        return pd.DataFrame(columns=LOOKER_COLUMNS)
+
+    brutos = df_brutos.copy()
+    brutos.columns = [str(col).strip().lower() for col in brutos.columns]
+    brutos = brutos.loc[:, ~brutos.columns.duplicated()]  # indexOf: vale a primeira
+    brutos = brutos.reindex(columns=BRUTOS_COLUMNS, fill_value="")
+    brutos["_chave"] = brutos["id_interno"].fillna("").astype(str)
+
+    meta = posts_metadata(df_dados_posts).rename(columns={"id_interno": "_chave"})
+    merged = brutos.merge(meta, on="_chave", how="left", validate="many_to_one")
+    merged[METADATA_COLUMNS] = merged[METADATA_COLUMNS].fillna("")
+
+    is_test = merged["titulo_referencia"].astype(str).str.strip().str.lower() == "teste"
+    result = merged.loc[~is_test, LOOKER_COLUMNS].reset_index(drop=True)
+
+    matched = merged.loc[~is_test, "_chave"].isin(meta["_chave"]).sum()
+    logger.info(
+        f"🔗 Base Looker: {len(result)} posts ({matched} com metadados editoriais, "
+        f"{int(is_test.sum())} de teste descartados)"
+    )
+    return result
+
+
+def _clean_rate(val) -> float:
+    """Normaliza uma taxa ("3,45%", "3.45", 0.0345) para fração com 4 casas."""
+    if not val:
+        return 0.0
+    val_str = str(val).replace("%", "").replace(",", ".").strip()
+    try:
+        f_val = float(val_str)
+        if "%" in str(val) or f_val > 1.0:
+            return round(f_val / 100, 4)
+        return round(f_val, 4)
+    except ValueError:
+        return 0.0
+
+
+def prepare_posts_for_supabase(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Limpa os posts consolidados para a tabela posts_final.
+
+    Números (DataFrame em memória) são convertidos direto; textos (lidos
+    do Sheets, ex: "1.234") têm o separador de milhar "." removido.
+
+    Args:
+        df: Base consolidada (LOOKER_COLUMNS)
+
+    Returns:
+        DataFrame com contagens inteiras e taxas em fração
+    """
+    df = df.copy()
+
+    for col in COUNT_COLUMNS:
+        if col not in df.columns:
+            continue
+        values = df[col]
+        if not pd.api.types.is_numeric_dtype(values):
+            is_text = values.map(lambda val: isinstance(val, str))
+            values = values.where(~is_text, values.astype(str).str.replace(".", "", regex=False))
+        df[col] = pd.to_numeric(values, errors="coerce").fillna(0).astype(int)
+
+    for col in RATE_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].apply(_clean_rate)
+
+    return df
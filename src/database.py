@@ -3,14 +3,30 @@ Módulo de Banco de Dados (PostgreSQL/Supabase e SQLite) do ETL.
 
 Responsável por gerenciar a persistência dos dados enriquecidos
 em nuvem (Supabase) para acesso compartilhado.
+
+As tabelas do Supabase têm esquema explícito (TABLE_SCHEMAS, com chave
+primária) e são carregadas via COPY FROM STDIN em uma tabela de staging,
+seguida de INSERT ... ON CONFLICT DO UPDATE, tudo em uma única transação:
+leitores (MCP, Looker) nunca veem a tabela ausente ou pela metade.
+
+post_metrics_history guarda a trajetória das métricas (uma linha por post
+por extração), particionada por mês em extracted_at.
 """
 
 import logging
 import socket
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Tuple
+
 import pandas as pd
+from psycopg2 import sql
 from sqlalchemy import create_engine
 import sqlite3
 
+from .metrics import RUN_METRICS
+
 # Força IPv4 para compatibilidade com WSL
 original_getaddrinfo = socket.getaddrinfo
 def getaddrinfo_ipv4(host, port, family=0, type=0, proto=0, flags=0):
@@ -19,6 +35,172 @@ socket.getaddrinfo = getaddrinfo_ipv4
 
 logger = logging.getLogger("mycreator_etl")
 
+
+@dataclass(frozen=True)
+class TableSchema:
+    """Esquema gerenciado de uma tabela do Supabase."""
+    columns: List[Tuple[str, str]]  # (nome, tipo PostgreSQL)
+    primary_key: List[str]
+    partition_column: Optional[str] = None  # Particionamento mensal (RANGE)
+    append_only: bool = False  # Chave já gravada é mantida (ON CONFLICT DO NOTHING)
+
+    @property
+    def column_names(self) -> List[str]:
+        return [name for name, _ in self.columns]
+
+
+# Esquemas gerenciados (ver Docs/database-guide.md)
+TABLE_SCHEMAS: Dict[str, TableSchema] = {
+    "posts_final": TableSchema(
+        columns=[
+            ("id_interno", "TEXT"),
+            ("data_publicacao", "TEXT"),
+            ("cidade", "TEXT"),
+            ("perfil", "TEXT"),
+            ("rede_social", "TEXT"),
+            ("curtidas", "INTEGER"),
+            ("comentarios", "INTEGER"),
+            ("salvos", "INTEGER"),
+            ("compartilhamentos", "INTEGER"),
+            ("taxa_engajamento", "NUMERIC"),
+            ("alcance", "INTEGER"),
+            ("taxa_alcance", "NUMERIC"),
+            ("titulo_referencia", "TEXT"),
+            ("formato", "TEXT"),
+            ("tipo_midia", "TEXT"),
+            ("categoria_conteudo", "TEXT"),
+            ("linha_editorial", "TEXT"),
+        ],
+        # Um plano pode ser publicado em vários perfis/redes
+        primary_key=["id_interno", "perfil", "rede_social"],
+    ),
+    "seguidores_history": TableSchema(
+        columns=[
+            ("data", "TEXT"),
+            ("cidade", "TEXT"),
+            ("perfil", "TEXT"),
+            ("seguidores", "INTEGER"),
+            ("variacao_diaria", "INTEGER"),
+        ],
+        # O mesmo nome de perfil existe em mais de uma cidade
+        primary_key=["data", "cidade", "perfil"],
+    ),
+    # Fato: uma linha por post por extração. A chave começa por
+    # (id_interno, extracted_at): "últimos 7 dias do post X" é um range scan
+    # no índice, restrito às partições do período.
+    "post_metrics_history": TableSchema(
+        columns=[
+            ("id_interno", "TEXT"),
+            ("extracted_at", "TIMESTAMPTZ"),
+            ("id_externo", "TEXT"),
+            ("plataforma", "SMALLINT"),
+            ("curtidas", "INTEGER"),
+            ("comentarios", "INTEGER"),
+            ("salvos", "INTEGER"),
+            ("compartilhamentos", "INTEGER"),
+            ("alcance", "INTEGER"),
+            ("impressoes", "INTEGER"),
+            ("reproducoes", "INTEGER"),
+            ("seguidores", "INTEGER"),
+        ],
+        primary_key=["id_interno", "extracted_at", "id_externo"],
+        partition_column="extracted_at",
+        append_only=True,
+    ),
+}
+
+# Código (SMALLINT) da rede social em post_metrics_history; 0 = outra
+PLATFORM_CODES = {
+    "instagram": 1,
+    "facebook": 2,
+    "tiktok": 3,
+    "linkedin": 4,
+    "youtube": 5,
+    "twitter": 6,
+    "pinterest": 7,
+    "threads": 8,
+    "gmb": 9,
+}
+
+# Colunas de PostData -> post_metrics_history
+HISTORY_METRICS = {
+    "likes": "curtidas",
+    "comments": "comentarios",
+    "saves": "salvos",
+    "shares": "compartilhamentos",
+    "reach": "alcance",
+    "impressions": "impressoes",
+    "plays": "reproducoes",
+    "follower_count": "seguidores",
+}
+
+INTEGER_TYPES = {"SMALLINT", "INTEGER", "BIGINT"}
+NUMERIC_TYPES = INTEGER_TYPES | {"NUMERIC", "REAL", "DOUBLE PRECISION"}
+
+
+class _CSVStream:
+    """
+    Arquivo somente leitura que gera o CSV do DataFrame sob demanda.
+
+    Usado pelo COPY FROM STDIN: o CSV é produzido em blocos de
+    `chunk_rows` linhas, sem materializar o arquivo inteiro em memória.
+    """
+
+    def __init__(self, df: pd.DataFrame, chunk_rows: int = 50_000):
+        self._chunks = self._generate(df, chunk_rows)
+        self._buffer = ""
+        self.chars_read = 0  # Tamanho do CSV já entregue ao COPY
+
+    @staticmethod
+    def _generate(df: pd.DataFrame, chunk_rows: int) -> Iterator[str]:
+        for start in range(0, len(df), chunk_rows):
+            yield df.iloc[start:start + chunk_rows].to_csv(header=False, index=False, lineterminator="\n")
+
+    def read(self, size: int = -1) -> str:
+        while size < 0 or len(self._buffer) < size:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                break
+            self._buffer += chunk
+
+        if size < 0:
+            data, self._buffer = self._buffer, ""
+        else:
+            data, self._buffer = self._buffer[:size], self._buffer[size:]
+        self.chars_read += len(data)
+        return data
+
+
+def metrics_history_frame(df_posts: pd.DataFrame, extracted_at: datetime) -> pd.DataFrame:
+    """
+    Monta as linhas de post_metrics_history a partir dos posts extraídos.
+
+    Args:
+        df_posts: DataFrame de PostData (colunas originais, em inglês)
+        extracted_at: Momento da extração (o mesmo para todas as linhas)
+
+    Returns:
+        DataFrame no esquema de post_metrics_history
+    """
+    if df_posts.empty:
+        return pd.DataFrame(columns=TABLE_SCHEMAS["post_metrics_history"].column_names)
+
+    history = pd.DataFrame({
+        "id_interno": df_posts["internal_id"],
+        "extracted_at": extracted_at,
+        "id_externo": df_posts.get("external_id", ""),
+        "plataforma": (
+            df_posts.get("platform", pd.Series("", index=df_posts.index))
+            .fillna("").astype(str).str.strip().str.lower()
+            .map(PLATFORM_CODES).fillna(0)
+        ),
+    })
+    for source, target in HISTORY_METRICS.items():
+        history[target] = df_posts[source] if source in df_posts.columns else 0
+
+    return history
+
+
 class SupabaseDatabase:
     """Gerenciador do banco de dados PostgreSQL no Supabase."""
     
@@ -35,10 +217,19 @@ class SupabaseDatabase:
             logger.error(f"❌ Erro ao conectar ao Supabase: {e}")
             raise
 
-    def save_posts(self, df: pd.DataFrame, table_name: str = "posts_final"):
+    def save_posts(self, df: pd.DataFrame, table_name: str = "posts_final", delete_missing: bool = False):
         """
         Salva o DataFrame no Supabase.
-        Usa 'replace' para garantir a versão mais atualizada.
+
+        Tabelas com esquema em TABLE_SCHEMAS são atualizadas por upsert
+        (COPY + ON CONFLICT, ver upsert). As demais mantêm o comportamento
+        antigo (to_sql com 'replace').
+
+        Args:
+            df: Dados a salvar
+            table_name: Tabela de destino
+            delete_missing: Remove as linhas cuja chave não está no DataFrame
+                (espelho completo da origem)
         """
         if df.empty:
             logger.warning("⚠️ DataFrame vazio. Nada para salvar no Supabase.")
@@ -47,15 +238,233 @@ class SupabaseDatabase:
         try:
             if not self.engine:
                 self.connect()
-            
+
+            if table_name in TABLE_SCHEMAS:
+                self.upsert(df, table_name, delete_missing=delete_missing)
+                return
+
             # Salva no banco via SQLAlchemy
-            df.to_sql(table_name, self.engine, if_exists="replace", index=False)
+            with RUN_METRICS.timed("db", table_name) as call:
+                df.to_sql(table_name, self.engine, if_exists="replace", index=False)
+                call["rows"] = len(df)
             logger.info(f"✅ {len(df)} registros salvos na tabela '{table_name}' do Supabase.")
             
         except Exception as e:
             logger.error(f"❌ Erro ao salvar dados no Supabase: {e}")
             raise
 
+    # =========================================================================
+    # UPSERT (COPY + ON CONFLICT)
+    # =========================================================================
+    @staticmethod
+    def _prepare_frame(df: pd.DataFrame, schema: TableSchema, table_name: str) -> pd.DataFrame:
+        """Alinha o DataFrame ao esquema: colunas, tipos e chave única."""
+        extra = [col for col in df.columns if col not in schema.column_names]
+        if extra:
+            logger.warning(f"⚠️ Colunas fora do esquema de '{table_name}' ignoradas: {extra}")
+
+        frame = df.reindex(columns=schema.column_names)
+        for name, pg_type in schema.columns:
+            if pg_type == "TIMESTAMPTZ":
+                frame[name] = pd.to_datetime(frame[name], utc=True)
+            elif pg_type in INTEGER_TYPES:
+                frame[name] = pd.to_numeric(frame[name], errors="coerce").round().astype("Int64")
+            elif pg_type in NUMERIC_TYPES:
+                frame[name] = pd.to_numeric(frame[name], errors="coerce")
+            else:
+                frame[name] = frame[name].fillna("").astype(str)
+
+        # ON CONFLICT não aceita a mesma chave duas vezes no mesmo comando
+        before = len(frame)
+        frame = frame.drop_duplicates(schema.primary_key, keep="last")
+        if len(frame) < before:
+            logger.warning(f"⚠️ {before - len(frame)} linhas com chave repetida em '{table_name}' (vale a última)")
+        return frame
+
+    @staticmethod
+    def _ensure_table(cursor, table_name: str, schema: TableSchema):
+        """
+        Cria a tabela gerenciada, ou migra a tabela legada criada pelo to_sql
+        (sem chave primária): adiciona colunas ausentes, remove linhas com
+        chave nula/repetida e cria a chave primária. Uma chave primária com
+        outras colunas (esquema anterior) é substituída pela do esquema.
+        """
+        table = sql.Identifier(table_name)
+        partitioning = sql.SQL("")
+        if schema.partition_column:
+            partitioning = sql.SQL(" PARTITION BY RANGE ({})").format(sql.Identifier(schema.partition_column))
+
+        cursor.execute(
+            sql.SQL("CREATE TABLE IF NOT EXISTS {} ({}, PRIMARY KEY ({})){}").format(
+                table,
+                sql.SQL(", ").join(
+                    sql.SQL("{} {}").format(sql.Identifier(name), sql.SQL(pg_type))
+                    for name, pg_type in schema.columns
+                ),
+                sql.SQL(", ").join(map(sql.Identifier, schema.primary_key)),
+                partitioning,
+            )
+        )
+
+        cursor.execute(
+            "SELECT c.conname, a.attname FROM pg_constraint c "
+            "JOIN pg_attribute a ON a.attrelid = c.conrelid AND a.attnum = ANY(c.conkey) "
+            "WHERE c.conrelid = to_regclass(%s) AND c.contype = 'p'",
+            (f'"{table_name}"',),
+        )
+        current = cursor.fetchall()
+        if {name for _, name in current} == set(schema.primary_key):
+            return
+
+        logger.info(f"🔧 Migrando '{table_name}' para o esquema gerenciado (chave primária)...")
+        if current:
+            cursor.execute(sql.SQL("ALTER TABLE {} DROP CONSTRAINT {}").format(
+                table, sql.Identifier(current[0][0])
+            ))
+        for name, pg_type in schema.columns:
+            cursor.execute(sql.SQL("ALTER TABLE {} ADD COLUMN IF NOT EXISTS {} {}").format(
+                table, sql.Identifier(name), sql.SQL(pg_type)
+            ))
+
+        keys = [sql.Identifier(name) for name in schema.primary_key]
+        cursor.execute(sql.SQL("DELETE FROM {} WHERE {}").format(
+            table, sql.SQL(" OR ").join(sql.SQL("{} IS NULL").format(key) for key in keys)
+        ))
+        cursor.execute(sql.SQL(
+            "DELETE FROM {table} a USING {table} b WHERE a.ctid < b.ctid AND {cond}"
+        ).format(
+            table=table,
+            cond=sql.SQL(" AND ").join(sql.SQL("a.{k} = b.{k}").format(k=key) for key in keys),
+        ))
+        cursor.execute(sql.SQL("ALTER TABLE {} ADD PRIMARY KEY ({})").format(table, sql.SQL(", ").join(keys)))
+
+    @staticmethod
+    def _ensure_partitions(cursor, table_name: str, values: pd.Series):
+        """Cria as partições mensais (UTC) que cobrem os valores da carga."""
+        months = values.dropna().dt.tz_convert("UTC").dt.tz_localize(None).dt.to_period("M").unique()
+        for month in sorted(months):
+            start = month.start_time
+            end = (month + 1).start_time
+            cursor.execute(sql.SQL(
+                "CREATE TABLE IF NOT EXISTS {} PARTITION OF {} FOR VALUES FROM (%s) TO (%s)"
+            ).format(
+                sql.Identifier(f"{table_name}_{month.strftime('%Y%m')}"), sql.Identifier(table_name)
+            ), (f"{start:%Y-%m-%d} 00:00:00+00", f"{end:%Y-%m-%d} 00:00:00+00"))
+
+    def upsert(self, df: pd.DataFrame, table_name: str, delete_missing: bool = False,
+               chunk_rows: int = 50_000) -> dict:
+        """
+        Carrega o DataFrame via COPY em staging e faz upsert na tabela.
+
+        Tudo roda em uma transação: em caso de erro nada é alterado, e
+        leitores continuam vendo a versão anterior até o COMMIT. Em tabelas
+        append_only, chaves já gravadas são mantidas (reexecuções não duplicam).
+
+        Args:
+            df: Dados a salvar
+            table_name: Tabela gerenciada (chave de TABLE_SCHEMAS)
+            delete_missing: Remove as linhas cuja chave não está no DataFrame
+            chunk_rows: Linhas por bloco do CSV enviado ao COPY
+
+        Returns:
+            Dict com 'upserted' e 'deleted'
+        """
+        schema = TABLE_SCHEMAS[table_name]
+        if delete_missing and schema.append_only:
+            raise ValueError(f"'{table_name}' é append-only: delete_missing não se aplica")
+        frame = self._prepare_frame(df, schema, table_name)
+
+        if not self.engine:
+            self.connect()
+
+        table = sql.Identifier(table_name)
+        staging = sql.Identifier(f"_staging_{table_name}")
+        columns = sql.SQL(", ").join(map(sql.Identifier, schema.column_names))
+        keys = sql.SQL(", ").join(map(sql.Identifier, schema.primary_key))
+        text_columns = [name for name, pg_type in schema.columns if pg_type == "TEXT"]
+        updates = [name for name in schema.column_names if name not in schema.primary_key]
+        if schema.append_only:
+            on_conflict = sql.SQL("DO NOTHING")
+        else:
+            on_conflict = sql.SQL("DO UPDATE SET {}").format(sql.SQL(", ").join(
+                sql.SQL("{col} = EXCLUDED.{col}").format(col=sql.Identifier(name)) for name in updates
+            ))
+
+        started = time.perf_counter()
+        stream = _CSVStream(frame, chunk_rows)
+        conn = self.engine.raw_connection()
+        try:
+            cursor = conn.cursor()
+            self._ensure_table(cursor, table_name, schema)
+            if schema.partition_column:
+                self._ensure_partitions(cursor, table_name, frame[schema.partition_column])
+
+            cursor.execute(sql.SQL(
+                "CREATE TEMP TABLE {} (LIKE {} INCLUDING DEFAULTS) ON COMMIT DROP"
+            ).format(staging, table))
+
+            # FORCE_NOT_NULL: texto vazio entra como '' (e não NULL)
+            cursor.copy_expert(
+                sql.SQL("COPY {} ({}) FROM STDIN WITH (FORMAT csv, FORCE_NOT_NULL ({}))").format(
+                    staging, columns, sql.SQL(", ").join(map(sql.Identifier, text_columns))
+                ),
+                stream,
+            )
+
+            cursor.execute(sql.SQL(
+                "INSERT INTO {table} ({columns}) SELECT {columns} FROM {staging} "
+                "ON CONFLICT ({keys}) {on_conflict}"
+            ).format(table=table, columns=columns, staging=staging, keys=keys, on_conflict=on_conflict))
+            upserted = cursor.rowcount
+
+            deleted = 0
+            if delete_missing:
+                cursor.execute(sql.SQL(
+                    "DELETE FROM {table} t WHERE NOT EXISTS "
+                    "(SELECT 1 FROM {staging} s WHERE {cond})"
+                ).format(
+                    table=table, staging=staging,
+                    cond=sql.SQL(" AND ").join(
+                        sql.SQL("s.{k} = t.{k}").format(k=sql.Identifier(name)) for name in schema.primary_key
+                    ),
+                ))
+                deleted = cursor.rowcount
+
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            RUN_METRICS.observe("db", table_name, time.perf_counter() - started,
+                                bytes_sent=stream.chars_read, error=True)
+            raise
+        finally:
+            conn.close()
+
+        RUN_METRICS.observe("db", table_name, time.perf_counter() - started,
+                            bytes_sent=stream.chars_read, rows=len(frame))
+
+        logger.info(
+            f"✅ {upserted} registros gravados na tabela '{table_name}' do Supabase "
+            f"(COPY + {'append' if schema.append_only else 'upsert'}{f', {deleted} removidos' if delete_missing else ''})."
+        )
+        return {"upserted": upserted, "deleted": deleted}
+
+    def append_metrics_history(self, df_posts: pd.DataFrame, extracted_at: datetime) -> dict:
+        """
+        Grava as métricas atuais dos posts em post_metrics_history.
+
+        Args:
+            df_posts: DataFrame de PostData (colunas originais)
+            extracted_at: Momento da extração (com fuso horário)
+
+        Returns:
+            Dict com 'upserted' (linhas novas) e 'deleted'
+        """
+        history = metrics_history_frame(df_posts, extracted_at)
+        if history.empty:
+            logger.warning("⚠️ Nenhum post para o histórico de métricas.")
+            return {"upserted": 0, "deleted": 0}
+        return self.upsert(history, "post_metrics_history")
+
     def close(self):
         """Fecha a conexão (SQLAlchemy gerencia o pool, mas deixamos p/ compatibilidade)."""
         if self.engine:
@@ -11,14 +11,24 @@ Workspaces Alvo (Fixos):
 
 import json
 import logging
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone, timedelta
-from typing import Optional, List
-from dataclasses import dataclass, field
+from typing import Optional, List, Dict, Iterator
+from dataclasses import dataclass, field, fields
+from operator import attrgetter
+from urllib.parse import urlparse
 
 from curl_cffi import requests as curl_requests
 
+from .accounts import SocialAccountRegistry
+from .cache import ResponseCache
 from .config import Config
+from .metrics import RUN_METRICS
+from .state import PostStateStore, RefreshPolicy, parse_datetime, parse_duration
+from .summary import SummaryIndex
+from .throttle import REJECTED_STATUSES, RateLimiter, RetryPolicy, THROTTLE_STATS, parse_endpoint_budgets
 
 logger = logging.getLogger("mycreator_etl")
 
@@ -39,8 +49,38 @@ TARGET_WORKSPACES = [
 ]
 
 
-@dataclass
-class PostData:
+class Record:
+    """
+    Base dos registros extraídos (dataclasses com __slots__).
+    
+    Sem __dict__ por instância, cada registro ocupa bem menos memória, e
+    to_columns monta as colunas direto dos atributos, sem o deepcopy
+    recursivo de dataclasses.asdict.
+    """
+    __slots__ = ()
+    
+    @classmethod
+    def field_names(cls) -> List[str]:
+        """Nomes dos campos, na ordem de declaração."""
+        return [f.name for f in fields(cls)]
+    
+    @classmethod
+    def to_columns(cls, records) -> Dict[str, list]:
+        """
+        Converte registros em colunas (pronto para pd.DataFrame).
+        
+        Args:
+            records: Sequência de instâncias da classe
+            
+        Returns:
+            Dict campo -> lista de valores (todos os campos, mesmo sem registros)
+        """
+        records = records if isinstance(records, (list, tuple)) else list(records)
+        return {name: list(map(attrgetter(name), records)) for name in cls.field_names()}
+
+
+@dataclass(slots=True)
+class PostData(Record):
     """
     Estrutura de dados para um post extraído.
     
@@ -95,8 +135,8 @@ class PostData:
     extraction_timestamp: Optional[str] = None  # Formato: DD/MM/YYYY HH:MM:SS
 
 
-@dataclass
-class ProfileData:
+@dataclass(slots=True)
+class ProfileData(Record):
     """Dados consolidados de um perfil (Instagram, etc)."""
     workspace_name: str
     workspace_id: str
@@ -112,8 +152,8 @@ class ProfileData:
     extraction_timestamp: str
 
 
-@dataclass
-class GeneralProfileData:
+@dataclass(slots=True)
+class GeneralProfileData(Record):
     """Dados gerais do perfil (Visão 365 dias/Geral)."""
     workspace_name: str
     workspace_id: str
@@ -128,8 +168,8 @@ class GeneralProfileData:
     extraction_timestamp: str
 
 
-@dataclass
-class StoryData:
+@dataclass(slots=True)
+class StoryData(Record):
     """Dados de um Story (Instagram)."""
     internal_id: str
     external_id: str
@@ -161,6 +201,9 @@ class MyCreatorExtractor:
     2. Email + Password (auto-login via API)
     
     Em caso de erro 401, tenta re-autenticar automaticamente.
+    
+    Thread-safe: cada thread usa sua própria sessão curl_cffi, enquanto
+    o estado de autenticação (headers) é compartilhado entre elas.
     """
     
     def __init__(self, config: Config):
@@ -168,6 +211,53 @@ class MyCreatorExtractor:
         self.session = curl_requests.Session(impersonate="chrome110")
         self._auth_instance = None
         
+        # Estado compartilhado entre threads (modo concorrente)
+        self._local = threading.local()
+        self._local.session = self.session
+        self._auth_lock = threading.RLock()  # Só a troca dos headers (nunca durante o login)
+        self._login_lock = threading.Lock()  # Um login por vez (ver _reauthenticate)
+        self._auth_generation = 0
+        self._request_slots = threading.BoundedSemaphore(config.max_concurrent_requests)
+        self.rate_limiter = RateLimiter(
+            config.rate_limit_rps,
+            burst=config.max_concurrent_requests,
+            endpoint_budgets=parse_endpoint_budgets(config.endpoint_rate_limits),
+        )
+        self.retry_policy = RetryPolicy(
+            max_retries=config.max_retries,
+            base_delay=config.retry_base_delay,
+            max_delay=config.retry_max_delay,
+        )
+        
+        # Contas sociais por workspace (uma chamada por workspace por execução)
+        self.accounts = SocialAccountRegistry(
+            self,
+            cache_path=config.accounts_cache_path,
+            ttl_seconds=config.accounts_cache_ttl,
+        )
+        
+        # Cache de respostas HTTP em disco (None = desativado)
+        self.cache: Optional[ResponseCache] = None
+        if config.http_cache_dir:
+            self.cache = ResponseCache(
+                config.http_cache_dir,
+                max_bytes=config.http_cache_max_mb * 1024 * 1024,
+                offline=config.http_cache_offline,
+            )
+            logger.info(f"💾 Cache HTTP habilitado: {config.http_cache_dir}" + (" (offline)" if config.http_cache_offline else ""))
+        
+        # Resumos getSummary por (workspace, conta), compartilhados entre etapas
+        self.summaries = SummaryIndex(self, batch_size=config.summary_batch_size)
+        
+        # Estado local da extração incremental (None = modo completo)
+        self.state: Optional[PostStateStore] = None
+        if config.incremental_mode:
+            self.state = PostStateStore(
+                config.state_db_path,
+                policy=RefreshPolicy.parse(config.refresh_policy),
+                preview_max_age=parse_duration(config.preview_max_age),
+            )
+        
         # Inicializa headers base
         self.headers = {
             "Accept": "application/json, text/plain, */*",
@@ -216,7 +306,9 @@ class MyCreatorExtractor:
         ):
             # Atualiza headers com novas credenciais
             auth_headers = self._auth_instance.get_auth_headers()
-            self.headers.update(auth_headers)
+            with self._auth_lock:
+                self.headers.update(auth_headers)
+                self._auth_generation += 1
             
             timestamp = datetime.now().strftime("%d/%m/%Y %H:%M:%S")
             logger.info(f"✅ Login automático realizado com sucesso!")
@@ -242,45 +334,181 @@ class MyCreatorExtractor:
         
         return False
     
-    def _handle_401_and_retry(self, method: str, url: str, **kwargs):
+    def _get_session(self):
+        """Retorna a sessão curl_cffi da thread atual (cria se necessário)."""
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = curl_requests.Session(impersonate="chrome110")
+            self._local.session = session
+        return session
+    
+    def _send(self, method: str, url: str, retry: bool = True, **kwargs):
+        """
+        Envia uma requisição respeitando o rate limit (host/endpoint) e o
+        teto global de requisições simultâneas.
+        
+        Respostas 429/5xx e falhas de conexão são retentadas com backoff
+        exponencial + jitter (respeitando Retry-After); um 429 também
+        reduz a taxa do rate limiter para a URL.
+        
+        Args:
+            method: Método HTTP (get, post)
+            url: URL da requisição
+            retry: False para requisições que não são só leitura (ex:
+                triggerJob): só o 429 é retentado, pois após 5xx ou falha de
+                conexão a requisição pode já ter sido aplicada
+            **kwargs: Argumentos adicionais para a requisição
+        
+        Returns:
+            tuple: (Response, geração de autenticação usada)
+        """
+        policy = self.retry_policy if retry else self.retry_policy.only(REJECTED_STATUSES)
+        attempt = 0
+        while True:
+            with self._auth_lock:
+                headers = dict(self.headers)
+                generation = self._auth_generation
+            
+            self.rate_limiter.acquire(url)
+            try:
+                with self._request_slots:
+                    request_func = getattr(self._get_session(), method)
+                    started = time.perf_counter()
+                    response = request_func(url, headers=headers, **kwargs)
+                self._observe(url, started, kwargs, response)
+            except curl_requests.RequestsError as e:
+                self._observe(url, started, kwargs)
+                if not retry or attempt >= policy.max_retries:
+                    raise
+                delay = self._backoff(url, attempt, None, str(e))
+            else:
+                if not policy.should_retry(response.status_code, attempt):
+                    if response.status_code < 400:
+                        self.rate_limiter.reward(url)
+                    return response, generation
+                delay = self._backoff(url, attempt, response)
+            
+            time.sleep(delay)
+            attempt += 1
+    
+    @staticmethod
+    def _observe(url: str, started: float, kwargs: dict, response=None):
+        """
+        Registra uma tentativa de requisição em RUN_METRICS.
+        
+        Args:
+            url: URL da requisição
+            started: time.perf_counter() do envio
+            kwargs: Argumentos da requisição (bytes enviados = corpo bruto em
+                `data`; payloads `json` não são serializados de novo só para
+                a medição e contam 0)
+            response: Resposta recebida (None = falha de conexão)
+        """
+        body = kwargs.get("data")
+        RUN_METRICS.observe(
+            "http", urlparse(url).path, time.perf_counter() - started,
+            bytes_sent=len(body) if isinstance(body, (bytes, str)) else 0,
+            bytes_received=len(response.content or b"") if response is not None else 0,
+            status=response.status_code if response is not None else None,
+            error=response is None or response.status_code >= 400,
+        )
+    
+    def _backoff(self, url: str, attempt: int, response=None, error: str = "") -> float:
+        """
+        Calcula (e contabiliza) o atraso antes de retentar uma requisição.
+        
+        Args:
+            url: URL da requisição
+            attempt: Tentativa que falhou (0 = primeira)
+            response: Resposta 429/5xx (None se a falha foi de conexão)
+            error: Mensagem da falha de conexão
+            
+        Returns:
+            float: Segundos a aguardar
+        """
+        status = response.status_code if response is not None else None
+        retry_after = (response.headers or {}).get("Retry-After") if response is not None else None
+        delay = self.retry_policy.delay_for(attempt, retry_after)
+        
+        if status == 429:
+            self.rate_limiter.penalize(url)
+        
+        endpoint = urlparse(url).path
+        THROTTLE_STATS.record_backoff(endpoint, delay, status)
+        logger.warning(
+            f"⏳ {endpoint}: {status or error}, nova tentativa em {delay:.1f}s "
+            f"({attempt + 1}/{self.retry_policy.max_retries})"
+        )
+        return delay
+    
+    def _reauthenticate(self, seen_generation: int) -> bool:
+        """
+        Re-autentica uma única vez, mesmo com várias threads recebendo 401.
+        
+        O login é serializado por _login_lock; _auth_lock só é tomado para
+        trocar os headers, então quem só lê as credenciais (inclusive o
+        event loop do cliente assíncrono) não espera o login terminar.
+        
+        Args:
+            seen_generation: Geração de autenticação usada na requisição que falhou
+            
+        Returns:
+            bool: True se há credenciais novas para tentar de novo
+        """
+        with self._login_lock:
+            if self._auth_generation != seen_generation:
+                # Outra thread já renovou as credenciais
+                return True
+            RUN_METRICS.increment("reauth")
+            return self._authenticate()
+    
+    def _handle_401_and_retry(self, method: str, url: str, retry: bool = True, **kwargs):
         """
         Executa requisição e tenta re-autenticar em caso de 401.
         
         Args:
             method: Método HTTP (get, post)
             url: URL da requisição
+            retry: Retenta 5xx e falhas de conexão (False para requisições
+                que não são só leitura, ver _send)
             **kwargs: Argumentos adicionais para a requisição
             
         Returns:
             Response ou None
         """
+        # Cache em disco (endpoints com TTL configurado)
+        if self.cache:
+            cached = self.cache.get(method, url, kwargs.get("params"), kwargs.get("json"))
+            if cached is not None:
+                return cached
+        
         # Primeira tentativa
-        request_func = getattr(self.session, method)
-        response = request_func(url, headers=self.headers, **kwargs)
+        response, generation = self._send(method, url, retry=retry, **kwargs)
         
         # Se 401 e pode fazer auto-login, tenta re-autenticar
         if response.status_code == 401 and self.config.can_auto_login:
             logger.warning("🔄 Sessão expirada (401), tentando re-autenticar...")
             
-            if self._authenticate():
-                # Retry com novas credenciais
-                response = request_func(url, headers=self.headers, **kwargs)
+            if self._reauthenticate(generation):
+                # Retry com novas credenciais (o 401 não aplicou a requisição)
+                response, _ = self._send(method, url, retry=retry, **kwargs)
             else:
                 logger.error("❌ Re-autenticação falhou")
         
+        if self.cache:
+            self.cache.put(method, url, response, kwargs.get("params"), kwargs.get("json"))
+        
         return response
     
     # =========================================================================
     # 1. LISTAGEM DE POSTS
     # =========================================================================
-    def fetch_posts_list(self, workspace_id: str) -> List[dict]:
-        """Busca lista de posts publicados de um workspace específico."""
-        url = f"{self.config.base_url}{self.config.fetch_plans_endpoint}"
-        
-        payload = {
+    def _posts_list_payload(self, workspace_id: str, page: int = 1, limit: int = None) -> dict:
+        """Monta o payload do /backend/fetchPlans para posts publicados."""
+        return {
             "workspace_id": workspace_id,
-            "limit": self.config.posts_limit,
-            "page": 1,
+            "limit": limit or self.config.posts_limit,
+            "page": page,
             "statuses": ["published"],
             "sort_column": "post_created_at",
             "order": "descending",
@@ -300,17 +528,147 @@ class MyCreatorExtractor:
             "csv_id": "",
             "date_range": ""
         }
+    
+    def fetch_posts_list(self, workspace_id: str) -> List[dict]:
+        """
+        Busca lista de posts publicados de um workspace específico.
+        
+        Pagina com PAGE_SIZE até POSTS_LIMIT posts (POSTS_LIMIT <= 0 = sem
+        limite) ou até a data de corte BACKFILL_SINCE, o que vier primeiro.
+        """
+        plans: List[dict] = []
+        for page in self.iter_posts_pages(workspace_id):
+            plans.extend(page)
+        return plans
+    
+    def _fetch_posts_page(self, workspace_id: str, page: int, page_size: int) -> Optional[List[dict]]:
+        """
+        Busca uma página do /backend/fetchPlans.
+        
+        Falhas transitórias já são retentadas em _send; um erro que sobra
+        é levantado, e não tratado como última página (truncaria o histórico).
+        
+        Returns:
+            Lista de planos da página (vazia = fim da listagem)
+            
+        Raises:
+            RuntimeError: Se a página não pôde ser obtida
+        """
+        url = f"{self.config.base_url}{self.config.fetch_plans_endpoint}"
+        payload = self._posts_list_payload(workspace_id, page=page, limit=page_size)
         
         try:
             response = self._handle_401_and_retry("post", url, json=payload, timeout=30)
             if response.status_code != 200:
-                logger.error(f"❌ Erro Listagem: {response.status_code}")
-                return []
+                raise RuntimeError(f"HTTP {response.status_code}")
             data = response.json()
             return data.get("plans", [])
         except Exception as e:
-            logger.error(f"❌ Erro na listagem: {e}")
-            return []
+            logger.error(f"❌ Erro na listagem (página {page}): {e}")
+            raise RuntimeError(f"Erro na listagem do workspace {workspace_id} (página {page}): {e}") from e
+    
+    @staticmethod
+    def _repeats_page(plans: List[dict], previous_first_id) -> bool:
+        """
+        Indica se a página repete a anterior (servidor ignorando `page`).
+        
+        Sem essa proteção, com POSTS_LIMIT <= 0 a paginação buscaria a mesma
+        página para sempre.
+        """
+        if previous_first_id is None or plans[0].get("_id") != previous_first_id:
+            return False
+        logger.warning("⚠️ fetchPlans devolveu a mesma página de novo (parâmetro 'page' ignorado?). Parando a listagem.")
+        return True
+    
+    def _listing_bounds(self, page_size: int = None, cutoff=None, max_posts: int = None) -> tuple:
+        """Resolve (page_size, cutoff, max_posts) com os padrões da config."""
+        if max_posts is None:
+            max_posts = self.config.posts_limit if self.config.posts_limit > 0 else None
+        page_size = page_size or self.config.page_size
+        if max_posts:
+            page_size = min(page_size, max_posts)
+        if cutoff is None and self.config.backfill_since:
+            cutoff = self.config.backfill_since
+        if cutoff is not None and not isinstance(cutoff, datetime):
+            cutoff = parse_datetime(cutoff)
+        return page_size, cutoff, max_posts
+    
+    @staticmethod
+    def _trim_page(plans: List[dict], cutoff: Optional[datetime]) -> tuple:
+        """
+        Corta a página na data de corte (planos vêm em ordem decrescente).
+        
+        Returns:
+            tuple: (planos dentro do período, True se a data de corte foi atingida)
+        """
+        if cutoff is None:
+            return plans, False
+        for i, plan in enumerate(plans):
+            created_at = parse_datetime(plan.get("post_created_at"))
+            if created_at is not None and created_at < cutoff:
+                return plans[:i], True
+        return plans, False
+    
+    def iter_posts_pages(self, workspace_id: str, page_size: int = None, cutoff=None,
+                         max_posts: int = None, prefetch: bool = True) -> Iterator[List[dict]]:
+        """
+        Itera os planos publicados de um workspace página a página.
+        
+        Enquanto a página atual é processada, a próxima já é buscada em
+        segundo plano (prefetch), sem carregar o histórico inteiro em memória.
+        
+        A listagem só termina com uma página vazia (ou no cutoff/max_posts):
+        uma página menor que page_size não indica o fim, pois o servidor
+        pode limitar o tamanho da página abaixo do pedido.
+        
+        Args:
+            workspace_id: ID do workspace
+            page_size: Planos por página (padrão: PAGE_SIZE)
+            cutoff: Para ao encontrar post_created_at anterior a esta data
+                    (datetime ou string; padrão: BACKFILL_SINCE)
+            max_posts: Total máximo de planos (padrão: POSTS_LIMIT; <= 0 = sem limite)
+            prefetch: Busca a próxima página em paralelo
+            
+        Yields:
+            Lista de planos (dicts crus do fetchPlans) de cada página
+        """
+        page_size, cutoff, max_posts = self._listing_bounds(page_size, cutoff, max_posts)
+        
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="prefetch") if prefetch else None
+        fetch = lambda page: self._fetch_posts_page(workspace_id, page, page_size)
+        
+        try:
+            page = 1
+            pending = executor.submit(fetch, page) if executor else None
+            yielded = 0
+            previous_first_id = None
+            
+            while True:
+                plans = pending.result() if executor else fetch(page)
+                if not plans or self._repeats_page(plans, previous_first_id):
+                    return
+                previous_first_id = plans[0].get("_id")
+                
+                plans, reached_cutoff = self._trim_page(plans, cutoff)
+                if max_posts:
+                    plans = plans[:max_posts - yielded]
+                
+                is_last = reached_cutoff or (max_posts and yielded + len(plans) >= max_posts)
+                
+                # Prefetch da próxima página antes de entregar a atual
+                page += 1
+                if executor and not is_last:
+                    pending = executor.submit(fetch, page)
+                
+                if plans:
+                    yielded += len(plans)
+                    yield plans
+                
+                if is_last:
+                    return
+        finally:
+            if executor:
+                executor.shutdown(wait=False, cancel_futures=True)
 
     # =========================================================================
     # 2. DETALHES DO POST (VIA PREVIEW)
@@ -350,16 +708,7 @@ class MyCreatorExtractor:
         if not posted_id or not account_id:
             return None
         
-        payload = {
-            "id": posted_id,
-            "workspace_id": workspace_id,
-            "all_post_ids": [posted_id],
-            "platforms": platform.lower(),
-            "account_id": account_id,
-            "date_range": "",
-            "labels": [],
-            "content_categories": []
-        }
+        payload = self._analytics_payload(posted_id, workspace_id, platform, account_id)
         
         try:
             response = self._handle_401_and_retry("post", url, json=payload, timeout=10)
@@ -371,6 +720,103 @@ class MyCreatorExtractor:
             pass
         return None
 
+    def fetch_post_analytics_batch(self, posted_ids: List[str], workspace_id: str,
+                                   platform: str, account_id: str) -> Dict[str, Optional[dict]]:
+        """
+        Busca analytics de vários posts da mesma conta em uma única chamada.
+        
+        Usa o campo 'all_post_ids' do getPlannerAnalytics. A resposta é
+        separada por posted_id; os posts que não vierem identificados na
+        resposta (dados parciais) são buscados individualmente.
+        
+        Args:
+            posted_ids: IDs externos dos posts (mesma conta/plataforma)
+            workspace_id: ID do workspace
+            platform: Rede social (Instagram, Facebook...)
+            account_id: platform_id da conta dona dos posts
+            
+        Returns:
+            Dict mapeando posted_id -> analytics (None se não houver dados)
+        """
+        posted_ids = [pid for pid in dict.fromkeys(posted_ids) if pid]
+        if not posted_ids or not account_id:
+            return {pid: None for pid in posted_ids}
+        
+        if len(posted_ids) == 1:
+            return {posted_ids[0]: self.fetch_post_analytics(posted_ids[0], workspace_id, platform, account_id)}
+        
+        url = f"{self.config.base_url}{self.config.analytics_endpoint}"
+        payload = self._analytics_payload(posted_ids[0], workspace_id, platform, account_id, all_post_ids=posted_ids)
+        
+        results: Dict[str, Optional[dict]] = {}
+        try:
+            response = self._handle_401_and_retry("post", url, json=payload, timeout=30)
+            if response.status_code == 200:
+                results = self._split_batch_analytics(response.json(), posted_ids)
+        except Exception as e:
+            logger.debug(f"Analytics em lote falhou ({len(posted_ids)} posts): {e}")
+        
+        # Fallback: posts ausentes na resposta em lote vão um a um
+        missing = [pid for pid in posted_ids if pid not in results]
+        if missing:
+            logger.debug(f"   ↩️ Analytics em lote parcial: {len(missing)}/{len(posted_ids)} via chamada individual")
+        for pid in missing:
+            results[pid] = self.fetch_post_analytics(pid, workspace_id, platform, account_id)
+        
+        return results
+    
+    def _split_batch_analytics(self, data, posted_ids: List[str]) -> Dict[str, dict]:
+        """
+        Separa a resposta em lote do getPlannerAnalytics por posted_id.
+        
+        Aceita uma lista de itens com o ID do post ou um dict indexado pelo
+        ID. Itens sem ID reconhecível são descartados (viram fallback), pois
+        não há como saber a qual post pertencem.
+        """
+        wanted = {str(pid): pid for pid in posted_ids}
+        found: Dict[str, dict] = {}
+        
+        items = []
+        if isinstance(data, list):
+            items = data
+        elif isinstance(data, dict):
+            keyed = [k for k in data if k in wanted]
+            if keyed:
+                for key in keyed:
+                    if self._is_valid_analytics(data[key]):
+                        found[wanted[key]] = data[key]
+                return found
+            for container in ("posts", "data", "analytics"):
+                if isinstance(data.get(container), list):
+                    items = data[container]
+                    break
+        
+        for item in items:
+            if not isinstance(item, dict):
+                continue
+            for id_key in ("posted_id", "post_id", "id", "media_id", "_id"):
+                item_id = str(item.get(id_key) or "")
+                if item_id in wanted:
+                    if self._is_valid_analytics(item):
+                        found[wanted[item_id]] = item
+                    break
+        
+        return found
+    
+    def _analytics_payload(self, posted_id: str, workspace_id: str, platform: str, account_id: str,
+                           all_post_ids: Optional[List[str]] = None) -> dict:
+        """Monta o payload do getPlannerAnalytics (um post ou um lote)."""
+        return {
+            "id": posted_id,
+            "workspace_id": workspace_id,
+            "all_post_ids": all_post_ids or [posted_id],
+            "platforms": platform.lower(),
+            "account_id": account_id,
+            "date_range": "",
+            "labels": [],
+            "content_categories": []
+        }
+
     def _is_valid_analytics(self, data) -> bool:
         """Valida se a resposta contém métricas válidas."""
         if not data:
@@ -438,88 +884,17 @@ class MyCreatorExtractor:
         """
         Busca contagem de seguidores por conta Instagram de um workspace.
         
-        Chama getSummary com cada conta individual para obter o follower_count.
+        Lê do índice de getSummary da execução (self.summaries), que chama
+        o endpoint uma única vez por conta e também alimenta extract_profiles.
         
         Returns:
             Dict mapeando platform_identifier (str) -> {'followers': int, 'name': str}
         """
-        follower_map = {}
-        
         try:
-            # 1. Busca contas Instagram do workspace
-            resp = self._handle_401_and_retry(
-                "post",
-                f"{self.config.base_url}/backend/fetchSocialAccounts",
-                json={"workspace_id": workspace_id},
-                timeout=15
-            )
-            if resp.status_code != 200:
-                logger.warning(f"⚠️ fetchSocialAccounts falhou: {resp.status_code}")
-                return follower_map
-            
-            social_data = resp.json()
-            ig_data = social_data.get("instagram", {})
-            ig_accounts = ig_data.get("accounts", []) if isinstance(ig_data, dict) else []
-            
-            if not ig_accounts:
-                return follower_map
-            
-            # 2. Para cada conta, busca followers via getSummary
-            from datetime import datetime, timedelta, timezone as tz
-            now = datetime.now(tz(timedelta(hours=-3)))
-            end_date = now.strftime("%Y-%m-%d")
-            start_date = (now - timedelta(days=30)).strftime("%Y-%m-%d")
-            date_range = f"{start_date} - {end_date}"
-            
-            for acc in ig_accounts:
-                ig_id = str(acc.get("platform_identifier") or acc.get("instagram_id") or "")
-                name = acc.get("name", "Unknown")
-                
-                if not ig_id:
-                    continue
-                
-                payload = {
-                    "workspace_id": workspace_id,
-                    "date": date_range,
-                    "timezone": "America/Sao_Paulo",
-                    "facebook_accounts": [],
-                    "instagram_accounts": [ig_id],
-                    "linkedin_accounts": [],
-                    "tiktok_accounts": [],
-                    "youtube_accounts": [],
-                    "pinterest_accounts": [],
-                    "twitter_accounts": [],
-                    "gmb_accounts": [],
-                    "tumblr_accounts": []
-                }
-                
-                try:
-                    resp = self._handle_401_and_retry(
-                        "post",
-                        f"{self.config.base_url}/backend/analytics/overview/getSummary",
-                        json=payload,
-                        timeout=10
-                    )
-                    if resp.status_code == 200:
-                        data = resp.json()
-                        summary = data.get("summary", {})
-                        followers = summary.get("followers", 0)
-                        follower_map[ig_id] = {
-                            "followers": followers,
-                            "name": name
-                        }
-                        logger.info(f"   👤 {name}: {followers:,} seguidores")
-                    else:
-                        logger.warning(f"   ⚠️ getSummary para {name}: {resp.status_code}")
-                except Exception as e:
-                    logger.warning(f"   ⚠️ Erro getSummary {name}: {e}")
-                
-                time.sleep(0.2)
-            
+            return self.summaries.follower_map(workspace_id)
         except Exception as e:
             logger.warning(f"⚠️ Erro ao buscar follower counts: {e}")
-        
-        return follower_map
+            return {}
     
     # =========================================================================
     # ORQUESTRADOR: EXTRAÇÃO DE TODOS OS WORKSPACES
@@ -528,6 +903,14 @@ class MyCreatorExtractor:
         """
         Extrai dados de múltiplos workspaces.
         
+        Com MAX_WORKERS > 1, os workspaces são processados em paralelo por
+        um pool de threads. A ordem do resultado é sempre a ordem de
+        `workspaces`, independente de qual termina primeiro.
+        
+        Um workspace com erro aborta a extração (os que ainda não começaram
+        são cancelados): um resultado sem uma das cidades apagaria os posts
+        dela de dados_brutos e do Supabase.
+        
         Args:
             workspaces: Lista de dicts com 'id' e 'name'. Se None, usa TARGET_WORKSPACES.
             
@@ -536,26 +919,51 @@ class MyCreatorExtractor:
         """
         if workspaces is None:
             workspaces = TARGET_WORKSPACES
+        
+        if self.config.async_extraction:
+            from .async_extract import AsyncMyCreatorExtractor
+            return AsyncMyCreatorExtractor(self).extract_from_workspaces(workspaces)
             
         all_results: List[PostData] = []
+        max_workers = min(self.config.max_workers, len(workspaces)) or 1
         
-        for ws in workspaces:
-            ws_id = ws["id"]
-            ws_name = ws["name"]
-            
-            logger.info(f"\n{'='*60}")
-            logger.info(f"🏙️ WORKSPACE: {ws_name} ({ws_id})")
-            logger.info(f"{'='*60}")
-            
-            results = self._extract_single_workspace(ws_id, ws_name)
+        if max_workers > 1:
+            logger.info(f"⚡ Extração concorrente: {max_workers} workers")
+            with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="workspace") as pool:
+                futures = [pool.submit(self._extract_workspace_logged, ws) for ws in workspaces]
+                try:
+                    per_workspace = [future.result() for future in futures]
+                except Exception:
+                    for future in futures:
+                        future.cancel()
+                    raise
+        else:
+            per_workspace = [self._extract_workspace_logged(ws) for ws in workspaces]
+        
+        for results in per_workspace:
             all_results.extend(results)
-            
-            logger.info(f"✅ {ws_name}: {len(results)} posts extraídos")
-            time.sleep(0.5)  # Pausa entre workspaces
         
         logger.info(f"\n🏁 TOTAL GLOBAL: {len(all_results)} posts de {len(workspaces)} workspaces")
         return all_results
     
+    def _extract_workspace_logged(self, ws: dict) -> List[PostData]:
+        """Extrai um workspace com os logs de início/fim (unidade de trabalho do pool)."""
+        ws_id = ws["id"]
+        ws_name = ws["name"]
+        
+        logger.info(f"\n{'='*60}")
+        logger.info(f"🏙️ WORKSPACE: {ws_name} ({ws_id})")
+        logger.info(f"{'='*60}")
+        
+        try:
+            results = self._extract_single_workspace(ws_id, ws_name)
+        except Exception as e:
+            logger.error(f"❌ Erro ao extrair workspace {ws_name}: {e}")
+            raise
+        
+        logger.info(f"✅ {ws_name}: {len(results)} posts extraídos")
+        return results
+    
     def _extract_single_workspace(self, workspace_id: str, workspace_name: str) -> List[PostData]:
         """Extrai todos os posts de um único workspace."""
         results: List[PostData] = []
@@ -574,139 +982,303 @@ class MyCreatorExtractor:
         total = len(plans)
         logger.info(f"📦 Processando {total} posts...")
         
-        for i, plan_summary in enumerate(plans, 1):
+        results, previews_skipped = self._process_plans(
+            plans, workspace_id, workspace_name, follower_map, total=total
+        )
+        
+        if self.state:
+            logger.info(f"💾 {workspace_name}: {previews_skipped}/{total} previews reaproveitados do estado local")
+            
+        return results
+    
+    def iter_workspace_batches(self, workspace_id: str, workspace_name: str,
+                               cutoff=None, max_posts: int = None) -> Iterator[List[PostData]]:
+        """
+        Extrai um workspace em lotes: um lote de PostData por página da listagem.
+        
+        Cada página é completada (preview + analytics) e entregue antes da
+        próxima ser processada, então a memória fica limitada a uma página
+        (modo streaming, usado em backfills).
+        
+        Args:
+            workspace_id: ID do workspace
+            workspace_name: Nome do workspace (cidade)
+            cutoff: Data de corte (padrão: BACKFILL_SINCE)
+            max_posts: Total máximo de planos (padrão: POSTS_LIMIT; <= 0 = sem limite)
+            
+        Yields:
+            Lista de PostData de cada página
+        """
+        follower_map = self.fetch_workspace_follower_counts(workspace_id)
+        
+        offset = 0
+        for plans in self.iter_posts_pages(workspace_id, cutoff=cutoff, max_posts=max_posts):
+            posts, _ = self._process_plans(plans, workspace_id, workspace_name, follower_map, offset=offset)
+            offset += len(plans)
+            if posts:
+                yield posts
+    
+    def iter_post_batches(self, workspaces: List[dict] = None, cutoff=None,
+                          max_posts: int = None) -> Iterator[List[PostData]]:
+        """
+        Versão streaming de extract_from_workspaces (workspaces em sequência).
+        
+        Um workspace com erro interrompe o backfill, como no modo em lote:
+        seguir sem ele deixaria o histórico da cidade faltando nos sinks.
+        
+        Yields:
+            Lotes de PostData (uma página da listagem por lote)
+        """
+        if workspaces is None:
+            workspaces = TARGET_WORKSPACES
+        
+        for ws in workspaces:
+            logger.info(f"\n🏙️ WORKSPACE (streaming): {ws['name']} ({ws['id']})")
+            try:
+                yield from self.iter_workspace_batches(ws["id"], ws["name"], cutoff=cutoff, max_posts=max_posts)
+            except Exception as e:
+                logger.error(f"❌ Erro ao extrair workspace {ws['name']}: {e}")
+                raise
+    
+    def _process_plans(self, plans: List[dict], workspace_id: str, workspace_name: str,
+                       follower_map: dict, offset: int = 0, total: Optional[int] = None) -> tuple:
+        """
+        Busca preview e analytics de uma lista de planos.
+        
+        Args:
+            plans: Planos (dicts do fetchPlans)
+            workspace_id: ID do workspace
+            workspace_name: Nome do workspace (cidade)
+            follower_map: Seguidores por conta (fetch_workspace_follower_counts)
+            offset: Planos já processados antes desta lista (rótulo de progresso)
+            total: Total de planos do workspace, se conhecido (rótulo de progresso)
+            
+        Returns:
+            tuple: (lista de PostData, previews reaproveitados do estado local)
+        """
+        results: List[PostData] = []
+        pending = []  # (posting bruto, PostData, rótulo de progresso)
+        previews_skipped = 0
+        for i, plan_summary in enumerate(plans, offset + 1):
             internal_id = plan_summary.get("_id")
             
-            # 2. Busca detalhes via Preview
-            details = self.fetch_plan_details(internal_id, workspace_id)
+            # 2. Busca detalhes via Preview (ou estado local, no modo incremental)
+            details = self.state.cached_details(internal_id) if self.state else None
+            if details is not None:
+                previews_skipped += 1
+                RUN_METRICS.increment("cache_hits", "state:preview")
+            else:
+                details = self.fetch_plan_details(internal_id, workspace_id)
+                if details and self.state:
+                    self.state.save_details(internal_id, workspace_id, details)
             if not details:
                 continue
             
-            # Extrai metadados comuns
-            common = details.get("common_sharing_details", {})
-            caption = common.get("message", "")
+            for post_item, post_data in self._build_posts_from_details(
+                details, internal_id, workspace_id, workspace_name, follower_map
+            ):
+                pending.append((post_item, post_data, f"[{i}/{total}]" if total else f"[{i}]"))
+                results.append(post_data)
+        
+        # 3. Busca Analytics
+        self._fetch_analytics_for_postings(pending, workspace_id)
+        
+        return results, previews_skipped
+    
+    def _fetch_analytics_for_postings(self, pending: List[tuple], workspace_id: str) -> None:
+        """
+        Preenche as métricas de uma lista de postings de um workspace.
+        
+        Com ANALYTICS_BATCH_SIZE > 1, agrupa os posts por (plataforma, conta)
+        e busca até ANALYTICS_BATCH_SIZE IDs por chamada.
+        
+        Args:
+            pending: Lista de tuplas (posting bruto, PostData, rótulo de progresso)
+            workspace_id: ID do workspace
+        """
+        batch_size = self.config.analytics_batch_size
+        groups: Dict[tuple, List[tuple]] = {}
+        
+        for post_item, post_data, progress in pending:
+            posted_id = post_item.get("posted_id")
+            account_id = post_item.get("platform_id")
             
-            # Título: Prioridade -> title > video.name > multimedia[0].name
-            title = common.get("title", "")
-            if not title:
-                video = common.get("video", {})
-                if isinstance(video, dict):
-                    title = video.get("name", "")
-            if not title:
-                multimedia = common.get("multimedia", [])
-                if multimedia and isinstance(multimedia, list) and len(multimedia) > 0:
-                    first_item = multimedia[0]
-                    if isinstance(first_item, dict):
-                        title = first_item.get("name", "")
-            # Remove extensão de arquivo se presente
-            if title and isinstance(title, str) and title.endswith(('.mp4', '.MP4', '.mov', '.MOV')):
-                title = title.rsplit('.', 1)[0]
+            if not (posted_id and account_id):
+                post_data.analytics_error = "ID ou Conta ausente"
+                continue
             
-            exec_time = details.get("execution_time", {})
-            published_at = exec_time.get("date", details.get("updated_at", ""))
-            images = common.get("image", [])
-            media_url = images[0] if isinstance(images, list) and images else ""
+            # Modo incremental: reaproveita métricas cujo refresh ainda não venceu
+            cached = self.state.cached_analytics(posted_id, post_data.published_at) if self.state else None
+            if cached is not None:
+                RUN_METRICS.increment("cache_hits", "state:analytics")
+                self._apply_analytics(post_data, cached, f"{progress} 💾")
+                continue
             
-            # Itera sobre 'posting' (cada postagem em cada rede)
-            postings = details.get("posting", [])
-            if not postings:
+            if batch_size <= 1:
+                analytics = self.fetch_post_analytics(posted_id, workspace_id, post_data.platform, account_id)
+                self._remember_analytics(post_data, posted_id, analytics)
+                self._apply_analytics(post_data, analytics, progress)
                 continue
-                
-            for post_item in postings:
-                posted_id = post_item.get("posted_id")
-                
-                # platform_type = Rede Social (Instagram, Facebook, etc)
-                platform_type = post_item.get("platform_type", "Instagram")
-                
-                # published_post_type = Tipo de post (REELS, FEED, STORY)
-                published_post_type = post_item.get("published_post_type", "POST")
-                
-                profile_name = post_item.get("platform", "Unknown")
-                permalink = post_item.get("link", "")
-                account_id = post_item.get("platform_id")  # Chave para Analytics
-                
-                # =========================================================================
-                # NOVO FILTRO ANTI-GHOSTING BASEADO NO NOME DO PERFIL
-                # Como a aba Publisher mantém posts de contas excluídas, a gente
-                # varre os nomes ativos do Workspace obtidos pelo fetchSocialAccounts.
-                # Se o nome do perfil do post não bater com nenhum ativo, é ignorado.
-                # =========================================================================
-                active_profile_names = [info["name"].lower() for info in follower_map.values()]
-                if profile_name.lower() not in active_profile_names:
-                    logger.debug(f"   ⏩ Ignorando post de {profile_name} (Conta não consta mais no Workspace MyCreator)")
-                    continue
-                
-                # Cria objeto PostData com timestamp de extração (horário de Brasília)
-                tz_brasilia = timezone(timedelta(hours=-3))
-                extraction_ts = datetime.now(tz_brasilia).strftime("%d/%m/%Y %H:%M:%S")
-                
-                # Busca follower count do perfil deste post
-                post_follower_count = 0
-                if account_id and str(account_id) in follower_map:
-                    post_follower_count = follower_map[str(account_id)]["followers"]
-                
-                post_data = PostData(
-                    internal_id=internal_id,
-                    external_id=posted_id,
-                    workspace_id=workspace_id,
-                    workspace_name=workspace_name,
-                    title=title,
-                    caption=caption,
-                    platform=platform_type,  # Rede Social (Instagram, Facebook)
-                    profile_name=profile_name,
-                    post_type=published_post_type,  # Tipo de post (REELS, FEED)
-                    published_at=published_at,
-                    media_url=media_url,
-                    permalink=permalink,
-                    follower_count=post_follower_count,
-                    extraction_timestamp=extraction_ts,
-                    media_type=published_post_type
+            
+            key = (str(post_data.platform).lower(), str(account_id))
+            groups.setdefault(key, []).append((posted_id, post_data, progress))
+        
+        for (platform, account_id), items in groups.items():
+            for start in range(0, len(items), batch_size):
+                chunk = items[start:start + batch_size]
+                analytics_by_id = self.fetch_post_analytics_batch(
+                    [posted_id for posted_id, _, _ in chunk], workspace_id, platform, account_id
                 )
-                
-                # 3. Busca Analytics
-                if posted_id and account_id:
-                    analytics = self.fetch_post_analytics(posted_id, workspace_id, platform_type, account_id)
-                    
-                    if analytics:
-                        metrics = self.extract_analytics_metrics(analytics)
-                        post_data.likes = metrics["likes"]
-                        post_data.comments = metrics["comments"]
-                        post_data.shares = metrics["shares"]
-                        post_data.saves = metrics["saves"]
-                        post_data.reach = metrics["reach"]
-                        post_data.impressions = metrics["impressions"]
-                        post_data.plays = metrics["plays"]
-                        post_data.media_type = metrics.get("media_type") or post_data.media_type
-                        
-                        # Atribui métricas avançadas
-                        post_data.video_duration = float(metrics.get("video_duration", 0.0))
-                        post_data.total_watch_time = metrics.get("total_watch_time", 0)
-                        post_data.avg_watch_time = float(metrics.get("avg_watch_time", 0.0))
-                        
-                        post_data.taps_forward = metrics.get("taps_forward", 0)
-                        post_data.taps_back = metrics.get("taps_back", 0)
-                        post_data.exits = metrics.get("exits", 0)
-                        post_data.replies = metrics.get("replies", 0)
-                        
-                        # Calcula taxas
-                        if post_data.reach > 0:
-                            engagement = post_data.likes + post_data.saves + post_data.comments + post_data.shares
-                            post_data.engagement_rate = round((engagement / post_data.reach), 4)
-                            
-                            if post_data.follower_count > 0:
-                                post_data.reach_rate = round((post_data.reach / post_data.follower_count), 4)
-                        
-                        logger.info(f"   ✅ [{i}/{total}] {profile_name}: {metrics['likes']} Likes | {metrics['reach']} Reach")
-                    else:
-                        post_data.analytics_error = "Sem dados"
-                else:
-                    post_data.analytics_error = "ID ou Conta ausente"
-                
-                results.append(post_data)
-                
-            time.sleep(0.3)  # Respeito à API
+                for posted_id, post_data, progress in chunk:
+                    self._remember_analytics(post_data, posted_id, analytics_by_id.get(posted_id))
+                    self._apply_analytics(post_data, analytics_by_id.get(posted_id), progress)
+    
+    def _remember_analytics(self, post_data: PostData, posted_id: str, analytics) -> None:
+        """Grava as métricas buscadas no estado local (modo incremental)."""
+        if self.state and analytics:
+            self.state.save_analytics(
+                posted_id, post_data.internal_id, post_data.workspace_id, post_data.published_at, analytics
+            )
+    
+    def _build_posts_from_details(self, details: dict, internal_id: str, workspace_id: str,
+                                  workspace_name: str, follower_map: dict) -> List[tuple]:
+        """
+        Converte a resposta do /backend/plan/preview em PostData (sem métricas).
+        
+        Args:
+            details: JSON do plano retornado pelo preview
+            internal_id: ID interno do plano
+            workspace_id: ID do workspace
+            workspace_name: Nome do workspace
+            follower_map: Mapa de contas ativas (ver fetch_workspace_follower_counts)
             
-        return results
+        Returns:
+            Lista de tuplas (posting bruto, PostData) - uma por rede publicada.
+        """
+        # Extrai metadados comuns
+        common = details.get("common_sharing_details", {})
+        caption = common.get("message", "")
+        
+        # Título: Prioridade -> title > video.name > multimedia[0].name
+        title = common.get("title", "")
+        if not title:
+            video = common.get("video", {})
+            if isinstance(video, dict):
+                title = video.get("name", "")
+        if not title:
+            multimedia = common.get("multimedia", [])
+            if multimedia and isinstance(multimedia, list) and len(multimedia) > 0:
+                first_item = multimedia[0]
+                if isinstance(first_item, dict):
+                    title = first_item.get("name", "")
+        # Remove extensão de arquivo se presente
+        if title and isinstance(title, str) and title.endswith(('.mp4', '.MP4', '.mov', '.MOV')):
+            title = title.rsplit('.', 1)[0]
+        
+        exec_time = details.get("execution_time", {})
+        published_at = exec_time.get("date", details.get("updated_at", ""))
+        images = common.get("image", [])
+        media_url = images[0] if isinstance(images, list) and images else ""
+        
+        # =========================================================================
+        # NOVO FILTRO ANTI-GHOSTING BASEADO NO NOME DO PERFIL
+        # Como a aba Publisher mantém posts de contas excluídas, a gente
+        # varre os nomes ativos do Workspace obtidos pelo fetchSocialAccounts.
+        # Se o nome do perfil do post não bater com nenhum ativo, é ignorado.
+        # =========================================================================
+        active_profile_names = [info["name"].lower() for info in follower_map.values()]
+        
+        # Itera sobre 'posting' (cada postagem em cada rede)
+        posts = []
+        for post_item in details.get("posting", []) or []:
+            posted_id = post_item.get("posted_id")
+            
+            # platform_type = Rede Social (Instagram, Facebook, etc)
+            platform_type = post_item.get("platform_type", "Instagram")
+            
+            # published_post_type = Tipo de post (REELS, FEED, STORY)
+            published_post_type = post_item.get("published_post_type", "POST")
+            
+            profile_name = post_item.get("platform", "Unknown")
+            permalink = post_item.get("link", "")
+            account_id = post_item.get("platform_id")  # Chave para Analytics
+            
+            if profile_name.lower() not in active_profile_names:
+                logger.debug(f"   ⏩ Ignorando post de {profile_name} (Conta não consta mais no Workspace MyCreator)")
+                continue
+            
+            # Cria objeto PostData com timestamp de extração (horário de Brasília)
+            tz_brasilia = timezone(timedelta(hours=-3))
+            extraction_ts = datetime.now(tz_brasilia).strftime("%d/%m/%Y %H:%M:%S")
+            
+            # Busca follower count do perfil deste post
+            post_follower_count = 0
+            if account_id and str(account_id) in follower_map:
+                post_follower_count = follower_map[str(account_id)]["followers"]
+            
+            post_data = PostData(
+                internal_id=internal_id,
+                external_id=posted_id,
+                workspace_id=workspace_id,
+                workspace_name=workspace_name,
+                title=title,
+                caption=caption,
+                platform=platform_type,  # Rede Social (Instagram, Facebook)
+                profile_name=profile_name,
+                post_type=published_post_type,  # Tipo de post (REELS, FEED)
+                published_at=published_at,
+                media_url=media_url,
+                permalink=permalink,
+                follower_count=post_follower_count,
+                extraction_timestamp=extraction_ts,
+                media_type=published_post_type
+            )
+            posts.append((post_item, post_data))
+        
+        return posts
+    
+    def _apply_analytics(self, post_data: PostData, analytics, progress: str = "") -> None:
+        """
+        Preenche as métricas de um PostData a partir da resposta de analytics.
+        
+        Args:
+            post_data: Post a ser enriquecido (alterado in-place)
+            analytics: Resposta de getPlannerAnalytics (ou None)
+            progress: Rótulo de progresso para o log (ex: "[3/50]")
+        """
+        if not analytics:
+            post_data.analytics_error = "Sem dados"
+            return
+        
+        metrics = self.extract_analytics_metrics(analytics)
+        post_data.likes = metrics["likes"]
+        post_data.comments = metrics["comments"]
+        post_data.shares = metrics["shares"]
+        post_data.saves = metrics["saves"]
+        post_data.reach = metrics["reach"]
+        post_data.impressions = metrics["impressions"]
+        post_data.plays = metrics["plays"]
+        post_data.media_type = metrics.get("media_type") or post_data.media_type
+        
+        # Atribui métricas avançadas
+        post_data.video_duration = float(metrics.get("video_duration", 0.0))
+        post_data.total_watch_time = metrics.get("total_watch_time", 0)
+        post_data.avg_watch_time = float(metrics.get("avg_watch_time", 0.0))
+        
+        post_data.taps_forward = metrics.get("taps_forward", 0)
+        post_data.taps_back = metrics.get("taps_back", 0)
+        post_data.exits = metrics.get("exits", 0)
+        post_data.replies = metrics.get("replies", 0)
+        
+        # Calcula taxas
+        if post_data.reach > 0:
+            engagement = post_data.likes + post_data.saves + post_data.comments + post_data.shares
+            post_data.engagement_rate = round((engagement / post_data.reach), 4)
+            
+            if post_data.follower_count > 0:
+                post_data.reach_rate = round((post_data.reach / post_data.follower_count), 4)
+        
+        logger.info(f"   ✅ {progress} {post_data.profile_name}: {metrics['likes']} Likes | {metrics['reach']} Reach")
     
     # =========================================================================
     # EXTRAÇÃO DE STORIES (NOVA ABA)
@@ -824,147 +1396,6 @@ class MyCreatorExtractor:
                 
         return all_stories
 
-    # =========================================================================
-    # EXTRAÇÃO DE PERFIS (NOVA ABA)
-    # =========================================================================
-    def extract_profiles(self, workspaces: List[dict] = None) -> List[ProfileData]:
-        """
-        Extrai dados consolidados de todos os perfis dos workspaces.
-        
-        Returns:
-            Lista de objetos ProfileData para a aba 'Perfis'.
-        """
-        if workspaces is None:
-            workspaces = TARGET_WORKSPACES
-            
-        all_profiles = []
-        
-        # ... (implementation would represent code not shown, but we are just defining the interface here effectively by assuming the method continues)
-        # Since I can't see the body of extract_profiles in the view_file output (it was truncated), 
-        # I will append the NEW methods at the end of the file or after a known block.
-        # However, replace_file_content needs context.
-        # I will rely on appending to the end of the file if possible or finding a safe spot.
-        # The view showed up to line 800 and extract_profiles started at 792.
-        # I'll use a known previous method to append AFTER it, or use the class end.
-        # Actually I can't see the end of the file.
-        # I'll request to see the end of the file first to be safe.
-        pass
-            
-        all_profiles: List[ProfileData] = []
-        
-        # Timestamp de Brasília
-        from datetime import datetime, timedelta, timezone as tz
-        tz_brasilia = tz(timedelta(hours=-3))
-        extraction_ts = datetime.now(tz_brasilia).strftime("%d/%m/%Y %H:%M:%S")
-        
-        logger.info(f"\n{'='*60}")
-        logger.info(f"👥 INICIANDO EXTRAÇÃO DE PERFIS")
-        logger.info(f"{'='*60}")
-        
-        for ws in workspaces:
-            ws_id = ws["id"]
-            ws_name = ws["name"]
-            
-            try:
-                # 1. Busca contas Instagram do workspace
-                resp = self._handle_401_and_retry(
-                    "post",
-                    f"{self.config.base_url}/backend/fetchSocialAccounts",
-                    json={"workspace_id": ws_id},
-                    timeout=15
-                )
-                
-                if resp.status_code != 200:
-                    continue
-                
-                social_data = resp.json()
-                ig_data = social_data.get("instagram", {})
-                ig_accounts = ig_data.get("accounts", []) if isinstance(ig_data, dict) else []
-                
-                if not ig_accounts:
-                    continue
-                
-                # 2. Para cada conta, busca detalhes via getSummary
-                # Define intervalo de 30 dias para métricas de engajamento
-                now = datetime.now(tz_brasilia)
-                end_date = now.strftime("%Y-%m-%d")
-                start_date = (now - timedelta(days=30)).strftime("%Y-%m-%d")
-                date_range = f"{start_date} - {end_date}"
-                
-                for acc in ig_accounts:
-                    ig_id = str(acc.get("platform_identifier") or acc.get("instagram_id") or "")
-                    name = acc.get("name", "Unknown")
-                    
-                    if not ig_id:
-                        continue
-                        
-                    payload = {
-                        "workspace_id": ws_id,
-                        "date": date_range,
-                        "timezone": "America/Sao_Paulo",
-                        "facebook_accounts": [],
-                        "instagram_accounts": [ig_id],
-                        "linkedin_accounts": [],
-                        "tiktok_accounts": [],
-                        "youtube_accounts": [],
-                        "pinterest_accounts": [],
-                        "twitter_accounts": [],
-                        "gmb_accounts": [],
-                        "tumblr_accounts": []
-                    }
-                    
-                    try:
-                        resp_summary = self._handle_401_and_retry(
-                            "post",
-                            f"{self.config.base_url}/backend/analytics/overview/getSummary",
-                            json=payload,
-                            timeout=10
-                        )
-                        
-                        followers = 0
-                        posts = 0
-                        engagement = 0
-                        engagement_rate = 0.0
-                        reach = 0.0
-                        impressions = 0.0
-                        
-                        if resp_summary.status_code == 200:
-                            data = resp_summary.json()
-                            summary = data.get("summary", {})
-                            followers = summary.get("followers", 0)
-                            posts = summary.get("posts", 0)
-                            engagement = summary.get("engagement", 0)
-                            engagement_rate = summary.get("engagement_rate", 0.0)
-                            reach = summary.get("reach", 0.0)
-                            impressions = summary.get("impressions", 0.0)
-                        
-                        profile = ProfileData(
-                            workspace_name=ws_name,
-                            workspace_id=ws_id,
-                            profile_name=name,
-                            platform_id=ig_id,
-                            platform="Instagram",
-                            followers=followers,
-                            posts_count=posts,
-                            engagement_total=engagement,
-                            engagement_rate=engagement_rate,
-                            reach_total=reach,
-                            impressions_total=impressions,
-                            extraction_timestamp=extraction_ts
-                        )
-                        all_profiles.append(profile)
-                        logger.info(f"   👤 {ws_name} -> {name}: {followers} seg.")
-                        
-                    except Exception as e:
-                        logger.error(f"Erro ao extrair perfil {name}: {e}")
-                    
-                    time.sleep(0.2)
-                    
-            except Exception as e:
-                logger.error(f"Erro ao processar workspace {ws_name} para perfis: {e}")
-                
-        return all_profiles
-
     # =========================================================================
     # EXTRAÇÃO DE PERFIS (NOVA ABA)
     # =========================================================================
@@ -994,99 +1425,10 @@ class MyCreatorExtractor:
             ws_name = ws["name"]
             
             try:
-                # 1. Busca contas Instagram do workspace
-                resp = self._handle_401_and_retry(
-                    "post",
-                    f"{self.config.base_url}/backend/fetchSocialAccounts",
-                    json={"workspace_id": ws_id},
-                    timeout=15
-                )
-                
-                if resp.status_code != 200:
-                    continue
-                
-                social_data = resp.json()
-                ig_data = social_data.get("instagram", {})
-                ig_accounts = ig_data.get("accounts", []) if isinstance(ig_data, dict) else []
-                
-                if not ig_accounts:
-                    continue
-                
-                # 2. Para cada conta, busca detalhes via getSummary
-                # Define intervalo de 30 dias para métricas de engajamento
-                now = datetime.now(tz_brasilia)
-                end_date = now.strftime("%Y-%m-%d")
-                start_date = (now - timedelta(days=30)).strftime("%Y-%m-%d")
-                date_range = f"{start_date} - {end_date}"
-                
-                for acc in ig_accounts:
-                    ig_id = str(acc.get("platform_identifier") or acc.get("instagram_id") or "")
-                    name = acc.get("name", "Unknown")
-                    
-                    if not ig_id:
-                        continue
-                        
-                    payload = {
-                        "workspace_id": ws_id,
-                        "date": date_range,
-                        "timezone": "America/Sao_Paulo",
-                        "facebook_accounts": [],
-                        "instagram_accounts": [ig_id],
-                        "linkedin_accounts": [],
-                        "tiktok_accounts": [],
-                        "youtube_accounts": [],
-                        "pinterest_accounts": [],
-                        "twitter_accounts": [],
-                        "gmb_accounts": [],
-                        "tumblr_accounts": []
-                    }
-                    
-                    try:
-                        resp_summary = self._handle_401_and_retry(
-                            "post",
-                            f"{self.config.base_url}/backend/analytics/overview/getSummary",
-                            json=payload,
-                            timeout=10
-                        )
-                        
-                        followers = 0
-                        posts = 0
-                        engagement = 0
-                        engagement_rate = 0.0
-                        reach = 0.0
-                        impressions = 0.0
-                        
-                        if resp_summary.status_code == 200:
-                            data = resp_summary.json()
-                            summary = data.get("summary", {})
-                            followers = summary.get("followers", 0)
-                            posts = summary.get("posts", 0)
-                            engagement = summary.get("engagement", 0)
-                            engagement_rate = summary.get("engagement_rate", 0.0)
-                            reach = summary.get("reach", 0.0)
-                            impressions = summary.get("impressions", 0.0)
-                        
-                        profile = ProfileData(
-                            workspace_name=ws_name,
-                            workspace_id=ws_id,
-                            profile_name=name,
-                            platform_id=ig_id,
-                            platform="Instagram",
-                            followers=followers,
-                            posts_count=posts,
-                            engagement_total=engagement,
-                            engagement_rate=engagement_rate,
-                            reach_total=reach,
-                            impressions_total=impressions,
-                            extraction_timestamp=extraction_ts
-                        )
-                        all_profiles.append(profile)
-                        logger.info(f"   👤 {ws_name} -> {name}: {followers} seg. ({engagement_rate}% engaj.)")
-                        
-                    except Exception as e:
-                        logger.error(f"Erro ao extrair perfil {name}: {e}")
-                    
-                    time.sleep(0.2)
+                # Resumos de 30 dias (getSummary compartilhado com os seguidores)
+                for profile in self.summaries.profiles(ws_id, ws_name, extraction_ts):
+                    all_profiles.append(profile)
+                    logger.info(f"   👤 {ws_name} -> {profile.profile_name}: {profile.followers} seg. ({profile.engagement_rate}% engaj.)")
                     
             except Exception as e:
                 logger.error(f"Erro ao processar workspace {ws_name} para perfis: {e}")
@@ -1129,21 +1471,8 @@ class MyCreatorExtractor:
             ws_name = ws["name"]
             
             try:
-                # 1. Busca contas Instagram do workspace
-                resp = self._handle_401_and_retry(
-                    "post",
-                    f"{self.config.base_url}/backend/fetchSocialAccounts",
-                    json={"workspace_id": ws_id},
-                    timeout=15
-                )
-                
-                if resp.status_code != 200:
-                    logger.warning(f"⚠️ fetchSocialAccounts falhou para {ws_name}: {resp.status_code}")
-                    continue
-                
-                social_data = resp.json()
-                ig_data = social_data.get("instagram", {})
-                ig_accounts = ig_data.get("accounts", []) if isinstance(ig_data, dict) else []
+                # 1. Busca contas Instagram do workspace (cache por execução)
+                ig_accounts = self.accounts.instagram_accounts(ws_id)
                 
                 if not ig_accounts:
                     logger.warning(f"⚠️ Nenhuma conta IG em {ws_name}")
@@ -1211,8 +1540,6 @@ class MyCreatorExtractor:
                     except Exception as e:
                         logger.error(f"   ❌ Erro audience_growth {name}: {e}")
                     
-                    time.sleep(0.5)
-                    
             except Exception as e:
                 logger.error(f"❌ Erro ao processar workspace {ws_name} para audience_growth: {e}")
         
@@ -1242,20 +1569,8 @@ class MyCreatorExtractor:
         url = f"{self.config.base_url}/backend/analytics/overview/instagram/top_posts"
 
         try:
-            # 1. Busca contas Instagram do workspace
-            resp = self._handle_401_and_retry(
-                "post",
-                f"{self.config.base_url}/backend/fetchSocialAccounts",
-                json={"workspace_id": workspace_id},
-                timeout=15
-            )
-            if resp.status_code != 200:
-                logger.warning(f"⚠️ fetchSocialAccounts falhou para {workspace_name}: {resp.status_code}")
-                return []
-
-            social_data = resp.json()
-            ig_data = social_data.get("instagram", {})
-            ig_accounts_raw = ig_data.get("accounts", []) if isinstance(ig_data, dict) else []
+            # 1. Busca contas Instagram do workspace (cache por execução)
+            ig_accounts_raw = self.accounts.instagram_accounts(workspace_id)
 
             if not ig_accounts_raw:
                 logger.warning(f"⚠️ Nenhuma conta IG em {workspace_name}")
@@ -1326,8 +1641,6 @@ class MyCreatorExtractor:
                         "total_engagement": total_eng,
                     })
 
-                time.sleep(0.2)
-
             logger.debug(f"   📊 {workspace_name}: {len(all_posts)} posts analytics coletados")
             return all_posts
 
@@ -0,0 +1,117 @@
+"""
+Transformações do crescimento de seguidores (audience_growth).
+
+- clean_audience_growth: limpeza da aba crescimento_seguidores (remove
+  dias sem dados e zera o spike inicial de cada perfil).
+- growth_metrics: série diária sem buracos por (cidade, perfil) com o
+  crescimento acumulado em 7 e 28 dias e as taxas de crescimento
+  (aba crescimento_metricas), antes calculados no Looker a cada carga
+  do dashboard.
+
+Os perfis são identificados por (cidade, perfil): o mesmo nome pode
+existir em mais de um workspace. Tudo é feito com operações por grupo
+(cumcount, shift), sem loops por perfil.
+"""
+
+import numpy as np
+import pandas as pd
+
+GROUP_KEYS = ["cidade", "perfil"]
+WINDOWS = (7, 28)
+DATE_FORMAT = "%Y-%m-%d"
+SERIES_COLUMNS = ["data"] + GROUP_KEYS + ["seguidores", "variacao_diaria", "preenchido"]
+
+
+def clean_audience_growth(df_growth: pd.DataFrame) -> pd.DataFrame:
+    """
+    Limpa as linhas extraídas de extract_audience_growth.
+
+    1. Remove dias sem dados (seguidores = 0)
+    2. Neutraliza o spike inicial: a primeira linha de cada perfil tem
+       variacao_diaria = total de seguidores (não é variação real)
+
+    Args:
+        df_growth: DataFrame com data, cidade, perfil, seguidores, variacao_diaria
+
+    Returns:
+        DataFrame limpo (mesma ordem de linhas)
+    """
+    if df_growth.empty:
+        return df_growth
+
+    df_growth = df_growth[df_growth["seguidores"] > 0].copy()
+    first_rows = df_growth.groupby(GROUP_KEYS, sort=False, dropna=False).cumcount() == 0
+    df_growth.loc[first_rows, "variacao_diaria"] = 0
+    return df_growth
+
+
+def fill_daily_gaps(df_growth: pd.DataFrame) -> pd.DataFrame:
+    """
+    Série diária contínua por perfil, do primeiro ao último dia com dados.
+
+    Dias ausentes repetem os seguidores do dia anterior, com
+    variacao_diaria = 0 e preenchido = True.
+
+    Args:
+        df_growth: DataFrame limpo (clean_audience_growth)
+
+    Returns:
+        DataFrame com SERIES_COLUMNS (data como datetime), ordenado por
+        perfil e data
+    """
+    df = df_growth.assign(data=pd.to_datetime(df_growth["data"], format=DATE_FORMAT, errors="coerce"))
+    df = df.dropna(subset=GROUP_KEYS + ["data"])
+    df = df.drop_duplicates(subset=GROUP_KEYS + ["data"], keep="last")
+    if df.empty:
+        return pd.DataFrame(columns=SERIES_COLUMNS)
+
+    # Um bloco de (max - min + 1) dias por perfil
+    bounds = df.groupby(GROUP_KEYS, sort=False)["data"].agg(["min", "max"]).reset_index()
+    days = ((bounds["max"] - bounds["min"]).dt.days + 1).to_numpy()
+    calendar = bounds.loc[bounds.index.repeat(days), GROUP_KEYS + ["min"]].reset_index(drop=True)
+    offsets = calendar.groupby(GROUP_KEYS, sort=False).cumcount()
+    calendar["data"] = calendar.pop("min") + pd.to_timedelta(offsets, unit="D")
+
+    series = calendar.merge(
+        df[GROUP_KEYS + ["data", "seguidores", "variacao_diaria"]],
+        on=GROUP_KEYS + ["data"], how="left",
+    )
+    series["preenchido"] = series["seguidores"].isna()
+    series["seguidores"] = series.groupby(GROUP_KEYS, sort=False)["seguidores"].ffill().astype(np.int64)
+    series["variacao_diaria"] = series["variacao_diaria"].fillna(0).astype(np.int64)
+    return series[SERIES_COLUMNS]
+
+
+def growth_metrics(df_growth: pd.DataFrame, windows=WINDOWS) -> pd.DataFrame:
+    """
+    Métricas derivadas de crescimento (aba crescimento_metricas).
+
+    Para cada janela N (7 e 28 dias):
+    - crescimento_Nd: seguidores do dia - seguidores de N dias antes
+    - taxa_crescimento_Nd: crescimento_Nd / seguidores de N dias antes
+
+    Vazias enquanto o perfil não tem N dias de histórico.
+
+    Args:
+        df_growth: DataFrame limpo (clean_audience_growth)
+        windows: Janelas em dias
+
+    Returns:
+        Série diária (fill_daily_gaps) com as métricas; data em YYYY-MM-DD
+    """
+    if df_growth.empty:
+        return pd.DataFrame()
+
+    series = fill_daily_gaps(df_growth)
+    if series.empty:
+        return series
+    followers = series.groupby(GROUP_KEYS, sort=False)["seguidores"]
+
+    for window in windows:
+        previous = followers.shift(window)
+        growth = series["seguidores"] - previous
+        series[f"crescimento_{window}d"] = growth
+        series[f"taxa_crescimento_{window}d"] = (growth / previous).round(4)
+
+    series["data"] = series["data"].dt.strftime(DATE_FORMAT)
+    return series
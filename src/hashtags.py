@@ -0,0 +1,347 @@
+"""
+Índice de hashtags (aba analise_hashtag).
+
+Tokeniza as legendas de forma vetorizada (str.extractall), normalizando
+caixa e acentos (#Imóveis, #imoveis e #IMOVEIS viram "imoveis"), e mantém
+em SQLite um índice invertido persistente:
+
+    hashtag -> posts que a usam + somas das métricas desses posts
+
+O índice é atualizado de forma incremental: a cada execução só os posts
+novos ou com legenda/métricas alteradas geram deltas (sai a contribuição
+antiga, entra a nova). A aba analise_hashtag sai direto da tabela de
+somas, e consultas por cidade/período agregam só os posts do filtro.
+"""
+
+import hashlib
+import logging
+import sqlite3
+from typing import Iterable, Optional
+
+import pandas as pd
+
+from .database import SQLiteDatabase
+
+logger = logging.getLogger("mycreator_etl")
+
+HASHTAG_PATTERN = r"#(\w+)"
+
+# Métricas somadas por hashtag (colunas de PostData)
+METRIC_COLUMNS = ["likes", "comments", "saves", "shares", "reach", "impressions"]
+
+# Somas -> colunas da aba analise_hashtag (mesma ordem de antes)
+HASHTAG_TAB_MAPPING = {
+    "hashtag": "hashtag",
+    "posts": "qtd_usos",
+    "engagement_total": "engajamento_total",
+    "reach": "alcance_acumulado",
+    "impressions": "impressoes_acumuladas",
+    "likes": "total_likes",
+    "comments": "total_comentarios",
+}
+
+
+def normalize_hashtags(tags: pd.Series) -> pd.Series:
+    """Minúsculas e sem acentos (mantém letras não latinas)."""
+    return (
+        tags.str.lower()
+        .str.normalize("NFKD")
+        .str.replace("[\u0300-\u036f]", "", regex=True)  # Marcas de acento (após NFKD)
+    )
+
+
+def post_keys(df_posts: pd.DataFrame) -> pd.Series:
+    """Chave de um post no índice: um plano publicado em vários perfis gera um post por perfil."""
+    return df_posts["internal_id"].astype(str) + "|" + df_posts["external_id"].fillna("").astype(str)
+
+
+def extract_hashtags(captions: pd.Series) -> pd.DataFrame:
+    """
+    Extrai as hashtags das legendas (vetorizado).
+
+    Args:
+        captions: Legendas, indexadas pelo post
+
+    Returns:
+        DataFrame (post, hashtag) sem repetição: a mesma hashtag duas vezes
+        na legenda conta uma vez para o post
+    """
+    matches = captions.where(captions.map(lambda val: isinstance(val, str)), "").str.extractall(HASHTAG_PATTERN)
+    if matches.empty:
+        return pd.DataFrame(columns=["post", "hashtag"])
+
+    tags = pd.DataFrame({
+        "post": matches.index.get_level_values(0),
+        "hashtag": normalize_hashtags(matches[0]).to_numpy(),
+    })
+    return tags[tags["hashtag"] != ""].drop_duplicates(ignore_index=True)
+
+
+def hashtag_totals(df_posts: pd.DataFrame) -> pd.DataFrame:
+    """
+    Agrega as hashtags dos posts em memória (sem índice persistente).
+
+    Returns:
+        DataFrame com hashtag, posts e METRIC_COLUMNS somadas
+    """
+    if df_posts.empty:
+        return pd.DataFrame(columns=["hashtag", "posts"] + METRIC_COLUMNS)
+
+    tags = extract_hashtags(df_posts["caption"].reset_index(drop=True))
+    metrics = df_posts.reindex(columns=METRIC_COLUMNS).reset_index(drop=True).fillna(0)
+    merged = tags.join(metrics, on="post")
+
+    totals = merged.groupby("hashtag").agg(posts=("post", "size"), **{col: (col, "sum") for col in METRIC_COLUMNS})
+    return totals.reset_index()
+
+
+def to_hashtag_tab(totals: pd.DataFrame) -> pd.DataFrame:
+    """
+    Formata as somas por hashtag no layout da aba analise_hashtag.
+
+    Args:
+        totals: DataFrame com hashtag, posts e METRIC_COLUMNS
+
+    Returns:
+        DataFrame ordenado por qtd_usos (desempate pela hashtag)
+    """
+    if totals.empty:
+        return pd.DataFrame()
+
+    tab = totals.copy()
+    tab["engagement_total"] = tab["likes"] + tab["comments"] + tab["saves"] + tab["shares"]
+    tab = tab[list(HASHTAG_TAB_MAPPING)].rename(columns=HASHTAG_TAB_MAPPING)
+    tab = tab.sort_values(["qtd_usos", "hashtag"], ascending=[False, True], kind="stable")
+    return tab.reset_index(drop=True)
+
+
+class HashtagIndex(SQLiteDatabase):
+    """
+    Índice invertido de hashtags (SQLite local), atualizado incrementalmente.
+
+    Tabelas:
+    - hashtag_post: post indexado (cidade, data, hash da legenda e métricas atuais)
+    - hashtag_entry: pares (hashtag, post) -- o índice invertido
+    - hashtag_total: somas por hashtag (mantidas por deltas)
+    """
+
+    def connect(self):
+        """Conecta e cria as tabelas."""
+        try:
+            self.conn = sqlite3.connect(self.db_path)
+            self.conn.executescript(f"""
+                CREATE TABLE IF NOT EXISTS hashtag_post (
+                    post_key     TEXT PRIMARY KEY,
+                    internal_id  TEXT,
+                    cidade       TEXT,
+                    data         TEXT,
+                    caption_hash TEXT,
+                    {", ".join(f"{col} INTEGER NOT NULL DEFAULT 0" for col in METRIC_COLUMNS)}
+                );
+                CREATE INDEX IF NOT EXISTS idx_hashtag_post_data ON hashtag_post (data);
+                CREATE TABLE IF NOT EXISTS hashtag_entry (
+                    hashtag  TEXT,
+                    post_key TEXT,
+                    PRIMARY KEY (hashtag, post_key)
+                ) WITHOUT ROWID;
+                CREATE INDEX IF NOT EXISTS idx_hashtag_entry_post ON hashtag_entry (post_key);
+                CREATE TABLE IF NOT EXISTS hashtag_total (
+                    hashtag TEXT PRIMARY KEY,
+                    posts   INTEGER NOT NULL DEFAULT 0,
+                    {", ".join(f"{col} INTEGER NOT NULL DEFAULT 0" for col in METRIC_COLUMNS)}
+                );
+            """)
+            logger.info(f"🗄️ Índice de hashtags: {self.db_path}")
+        except Exception as e:
+            logger.error(f"❌ Erro ao abrir índice de hashtags: {e}")
+            raise
+
+    # =========================================================================
+    # ATUALIZAÇÃO INCREMENTAL
+    # =========================================================================
+    def _indexed(self, keys: Iterable[str]) -> tuple:
+        """(posts já indexados, hashtags deles) para as chaves informadas."""
+        self.conn.execute("CREATE TEMP TABLE IF NOT EXISTS _keys (post_key TEXT PRIMARY KEY)")
+        self.conn.execute("DELETE FROM _keys")
+        self.conn.executemany("INSERT OR IGNORE INTO _keys VALUES (?)", ((key,) for key in keys))
+
+        posts = pd.read_sql_query(
+            "SELECT p.* FROM hashtag_post p JOIN _keys USING (post_key)", self.conn
+        ).set_index("post_key")
+        entries = pd.read_sql_query(
+            "SELECT e.hashtag, e.post_key FROM hashtag_entry e JOIN _keys USING (post_key)", self.conn
+        )
+        return posts, entries
+
+    @staticmethod
+    def _contribution(entries: pd.DataFrame, metrics: pd.DataFrame, sign: int) -> pd.DataFrame:
+        """Contribuição (posts e métricas) de pares (hashtag, post_key) para as somas."""
+        merged = entries.join(metrics[METRIC_COLUMNS], on="post_key")
+        merged["posts"] = 1
+        return merged[["hashtag", "posts"] + METRIC_COLUMNS].assign(
+            **{col: merged[col] * sign for col in ["posts"] + METRIC_COLUMNS}
+        )
+
+    def _apply_deltas(self, deltas: pd.DataFrame):
+        """Soma os deltas em hashtag_total e remove hashtags sem posts."""
+        if deltas.empty:
+            return
+
+        deltas = deltas.groupby("hashtag")[["posts"] + METRIC_COLUMNS].sum().reset_index()
+        columns = ["posts"] + METRIC_COLUMNS
+        self.conn.executemany(
+            f"INSERT INTO hashtag_total (hashtag, {', '.join(columns)}) "
+            f"VALUES ({', '.join('?' * (len(columns) + 1))}) "
+            f"ON CONFLICT (hashtag) DO UPDATE SET "
+            + ", ".join(f"{col} = {col} + excluded.{col}" for col in columns),
+            deltas[["hashtag"] + columns].astype({col: "int64" for col in columns}).itertuples(index=False, name=None),
+        )
+        self.conn.execute("DELETE FROM hashtag_total WHERE posts <= 0")
+
+    def update(self, df_posts: pd.DataFrame, delete_missing: bool = False) -> dict:
+        """
+        Atualiza o índice com os posts de uma execução.
+
+        Posts inalterados (mesma legenda e métricas) são ignorados; os
+        demais trocam sua contribuição antiga pela nova.
+
+        Args:
+            df_posts: DataFrame de PostData (colunas originais)
+            delete_missing: Remove os posts indexados que não estão no
+                DataFrame (espelho da listagem: apagados na rede saem das somas)
+
+        Returns:
+            Dict com 'new', 'changed', 'unchanged' e 'removed'
+        """
+        if not self.conn:
+            self.connect()
+        if df_posts.empty:
+            return {"new": 0, "changed": 0, "unchanged": 0, "removed": 0}
+
+        captions = df_posts["caption"].where(df_posts["caption"].map(lambda val: isinstance(val, str)), "")
+        current = pd.DataFrame({
+            "post_key": post_keys(df_posts).to_numpy(),
+            "internal_id": df_posts["internal_id"].astype(str).to_numpy(),
+            "cidade": df_posts.get("workspace_name", pd.Series("", index=df_posts.index)).fillna("").to_numpy(),
+            "data": pd.to_datetime(df_posts["published_at"], errors="coerce").dt.strftime("%Y-%m-%d").to_numpy(),
+            "caption": captions.to_numpy(),
+            "caption_hash": captions.map(lambda text: hashlib.sha1(text.encode("utf-8")).hexdigest()).to_numpy(),
+        })
+        for col in METRIC_COLUMNS:
+            values = df_posts[col] if col in df_posts.columns else 0
+            current[col] = pd.to_numeric(pd.Series(values, index=df_posts.index), errors="coerce").fillna(0).astype("int64").to_numpy()
+        current = current.drop_duplicates("post_key", keep="last").set_index("post_key")
+
+        old_posts, old_entries = self._indexed(current.index)
+
+        # Só o que mudou (post novo, legenda ou métricas diferentes)
+        compare = ["caption_hash"] + METRIC_COLUMNS
+        known = current.index.isin(old_posts.index)
+        same = pd.Series(False, index=current.index)
+        if known.any():
+            previous = old_posts.reindex(current.index[known])[compare]
+            same[known] = (previous.to_numpy() == current.loc[known, compare].to_numpy()).all(axis=1)
+        changed = current[~same]
+        stats = {"new": int((~known).sum()), "changed": int((known & ~same.to_numpy()).sum()), "unchanged": int(same.sum())}
+
+        stats["removed"] = 0
+        if delete_missing:
+            indexed = pd.read_sql_query("SELECT post_key FROM hashtag_post", self.conn)["post_key"]
+            stats["removed"] = self.remove(indexed[~indexed.isin(current.index)])
+            if stats["removed"]:
+                logger.info(f"🏷️ Índice de hashtags: {stats['removed']} posts fora da listagem removidos")
+        if changed.empty:
+            return stats
+
+        removed = old_entries[old_entries["post_key"].isin(changed.index)]
+        tags = extract_hashtags(changed["caption"]).rename(columns={"post": "post_key"})
+
+        deltas = pd.concat([
+            self._contribution(removed, old_posts, -1),
+            self._contribution(tags, changed, +1),
+        ], ignore_index=True)
+
+        with self.conn:
+            self._apply_deltas(deltas)
+            self.conn.executemany("DELETE FROM hashtag_entry WHERE post_key = ?", ((key,) for key in changed.index))
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO hashtag_entry VALUES (?, ?)",
+                tags[["hashtag", "post_key"]].itertuples(index=False, name=None),
+            )
+            columns = ["internal_id", "cidade", "data", "caption_hash"] + METRIC_COLUMNS
+            self.conn.executemany(
+                f"INSERT OR REPLACE INTO hashtag_post (post_key, {', '.join(columns)}) "
+                f"VALUES ({', '.join('?' * (len(columns) + 1))})",
+                changed[columns].astype(object).where(changed[columns].notna(), None)
+                .itertuples(index=True, name=None),
+            )
+
+        logger.info(
+            f"🏷️ Índice de hashtags: {stats['new']} posts novos, {stats['changed']} alterados, "
+            f"{stats['unchanged']} sem mudança"
+        )
+        return stats
+
+    def remove(self, keys: Iterable[str]) -> int:
+        """Remove posts do índice (ex: apagados na rede). Retorna quantos existiam."""
+        if not self.conn:
+            self.connect()
+
+        old_posts, old_entries = self._indexed(keys)
+        if old_posts.empty:
+            return 0
+
+        with self.conn:
+            self._apply_deltas(self._contribution(old_entries, old_posts, -1))
+            self.conn.executemany("DELETE FROM hashtag_entry WHERE post_key = ?", ((key,) for key in old_posts.index))
+            self.conn.executemany("DELETE FROM hashtag_post WHERE post_key = ?", ((key,) for key in old_posts.index))
+        return len(old_posts)
+
+    # =========================================================================
+    # CONSULTAS
+    # =========================================================================
+    def totals(self, cidade: Optional[str] = None, start: Optional[str] = None,
+               end: Optional[str] = None) -> pd.DataFrame:
+        """
+        Somas por hashtag.
+
+        Sem filtros, lê direto as somas mantidas (hashtag_total). Com
+        cidade e/ou período (YYYY-MM-DD, inclusivo), agrega só os posts
+        do filtro a partir do índice invertido.
+
+        Returns:
+            DataFrame com hashtag, posts e METRIC_COLUMNS
+        """
+        if not self.conn:
+            self.connect()
+
+        if cidade is None and start is None and end is None:
+            return pd.read_sql_query(f"SELECT hashtag, posts, {', '.join(METRIC_COLUMNS)} FROM hashtag_total", self.conn)
+
+        conditions, params = [], []
+        if cidade is not None:
+            conditions.append("p.cidade = ?")
+            params.append(cidade)
+        if start is not None:
+            conditions.append("p.data >= ?")
+            params.append(start)
+        if end is not None:
+            conditions.append("p.data <= ?")
+            params.append(end)
+
+        return pd.read_sql_query(
+            f"SELECT e.hashtag, COUNT(*) AS posts, {', '.join(f'SUM(p.{col}) AS {col}' for col in METRIC_COLUMNS)} "
+            f"FROM hashtag_entry e JOIN hashtag_post p USING (post_key) "
+            f"WHERE {' AND '.join(conditions)} GROUP BY e.hashtag",
+            self.conn, params=params,
+        )
+
+    def posts_for(self, hashtag: str) -> pd.DataFrame:
+        """Posts que usam a hashtag (normalizada), com métricas atuais."""
+        if not self.conn:
+            self.connect()
+        tag = normalize_hashtags(pd.Series([hashtag.lstrip("#")])).iloc[0]
+        return pd.read_sql_query(
+            "SELECT p.* FROM hashtag_entry e JOIN hashtag_post p USING (post_key) WHERE e.hashtag = ?",
+            self.conn, params=(tag,),
+        )
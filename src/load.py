@@ -6,13 +6,20 @@ transformados usando autenticação via Service Account.
 """
 
 import logging
-from typing import Optional
+import re
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
 
+import numpy as np
 import pandas as pd
 import gspread
+from gspread.utils import absolute_range_name, rowcol_to_a1
 from google.oauth2.service_account import Credentials
 
 from .config import Config
+from .metrics import RUN_METRICS
+from .throttle import REJECTED_STATUSES, RateLimiter, RetryPolicy, THROTTLE_STATS, call_with_retry
 
 logger = logging.getLogger("mycreator_etl")
 
@@ -22,6 +29,34 @@ SCOPES = [
     "https://www.googleapis.com/auth/drive.file",
 ]
 
+# Chave do balde de rate limit da API do Google Sheets
+SHEETS_API_URL = "https://sheets.googleapis.com/v4/spreadsheets"
+
+# Formatação do header (linha 1) de todas as abas
+HEADER_FORMAT = {
+    "textFormat": {
+        "bold": True,
+        "foregroundColor": {"red": 1.0, "green": 1.0, "blue": 1.0}
+    },
+    "backgroundColor": {"red": 0.263, "green": 0.263, "blue": 0.263},  # #434343
+    "horizontalAlignment": "CENTER",
+}
+
+# Datas como o Sheets pode exibi-las (ISO ou DD/MM/YYYY), para o modo diff
+_ISO_DATE = re.compile(r"^(\d{4})-(\d{2})-(\d{2})$")
+_BR_DATE = re.compile(r"^(\d{2})/(\d{2})/(\d{4})$")
+
+# Limitador compartilhado por todos os loaders da execução (cota por projeto)
+_sheets_limiter: Optional[RateLimiter] = None
+
+
+def _get_sheets_limiter(config: Config) -> RateLimiter:
+    """Retorna o rate limiter do Google Sheets (criado na primeira carga)."""
+    global _sheets_limiter
+    if _sheets_limiter is None:
+        _sheets_limiter = RateLimiter(config.sheets_rate_limit_rps, burst=1)
+    return _sheets_limiter
+
 
 class GoogleSheetsLoader:
     """
@@ -42,6 +77,45 @@ class GoogleSheetsLoader:
         self.client: Optional[gspread.Client] = None
         self.spreadsheet: Optional[gspread.Spreadsheet] = None
         self.worksheet: Optional[gspread.Worksheet] = None
+        
+        # Rate limit + backoff em 429/5xx (substitui as pausas fixas entre cargas)
+        self.rate_limiter = _get_sheets_limiter(config)
+        self.retry_policy = RetryPolicy(
+            max_retries=config.max_retries,
+            base_delay=config.retry_base_delay,
+            max_delay=config.retry_max_delay,
+        )
+    
+    def _call(self, operation: str, func, *args, retry_policy: RetryPolicy = None, **kwargs):
+        """
+        Executa uma chamada gspread com rate limit e retentativa.
+        
+        Cada tentativa é medida em RUN_METRICS (sheets, por operação).
+        
+        Args:
+            operation: Nome da operação (logs e contadores)
+            func: Método gspread a chamar
+            *args, **kwargs: Argumentos do método
+            retry_policy: Política de retentativa (padrão: self.retry_policy)
+            
+        Returns:
+            Retorno do método
+        """
+        def timed_call():
+            with RUN_METRICS.timed("sheets", operation) as call:
+                try:
+                    return func(*args, **kwargs)
+                except Exception as e:
+                    call["status"] = getattr(getattr(e, "response", None), "status_code", None)
+                    raise
+        
+        return call_with_retry(
+            timed_call,
+            retry_policy or self.retry_policy,
+            f"sheets:{operation}",
+            limiter=self.rate_limiter,
+            url=SHEETS_API_URL,
+        )
     
     def connect(self) -> bool:
         """
@@ -93,16 +167,18 @@ class GoogleSheetsLoader:
             logger.info(f"📂 Abrindo planilha: {self.config.google_sheet_id}")
             
             # Abre pelo ID da planilha
-            self.spreadsheet = self.client.open_by_key(self.config.google_sheet_id)
+            self.spreadsheet = self._call("open", self.client.open_by_key, self.config.google_sheet_id)
             
             logger.info(f"📑 Abrindo aba: {target_tab}")
             
             # Tenta abrir aba existente ou cria nova
             try:
-                self.worksheet = self.spreadsheet.worksheet(target_tab)
+                self.worksheet = self._call("worksheet", self.spreadsheet.worksheet, target_tab)
             except gspread.WorksheetNotFound:
                 logger.info(f"📝 Aba não existe. Criando: {target_tab}")
-                self.worksheet = self.spreadsheet.add_worksheet(
+                self.worksheet = self._call(
+                    "add_worksheet",
+                    self.spreadsheet.add_worksheet,
                     title=target_tab,
                     rows=1000,
                     cols=26,
@@ -119,12 +195,15 @@ class GoogleSheetsLoader:
             logger.error(f"❌ Erro ao abrir planilha: {e}")
             return False
     
-    def load(self, df: pd.DataFrame) -> bool:
+    def load(self, df: pd.DataFrame, key_columns: Sequence[str] = None, write_mode: str = None) -> bool:
         """
         Carrega DataFrame na planilha.
         
         Args:
             df: DataFrame com dados a carregar
+            key_columns: Colunas que identificam uma linha (modo diff).
+                Sem chave, o modo diff cai para overwrite.
+            write_mode: Sobrescreve o WRITE_MODE da config para esta carga
             
         Returns:
             bool: True se carregou com sucesso
@@ -141,10 +220,13 @@ class GoogleSheetsLoader:
             # Converte DataFrame para lista de listas
             data = self._dataframe_to_sheets_format(df)
             
-            if self.config.write_mode == "overwrite":
-                return self._write_overwrite(data)
-            else:
+            mode = write_mode or self.config.write_mode
+            if mode == "diff" and key_columns:
+                return self._write_diff(data, key_columns)
+            elif mode == "append":
                 return self._write_append(data)
+            else:
+                return self._write_overwrite(data)
                 
         except Exception as e:
             logger.error(f"❌ Erro ao carregar dados: {e}")
@@ -158,41 +240,138 @@ class GoogleSheetsLoader:
         os interprete corretamente. Apenas converte NaN e tipos não
         serializáveis para string.
         
+        A conversão é feita por coluna (cada dtype é convertido uma única
+        vez) e as linhas são montadas com zip, sem iterrows.
+        
         Args:
             df: DataFrame pandas
             
         Returns:
             list[list]: Dados em formato de lista de listas
         """
-        import numpy as np
-        
-        # Substitui NaN por string vazia
-        df = df.fillna("")
-        
         # Header
         header = df.columns.tolist()
         
-        # Converte cada valor preservando tipos numéricos
-        rows = []
-        for _, row in df.iterrows():
-            clean_row = []
-            for val in row:
-                if isinstance(val, (np.integer,)):
-                    clean_row.append(int(val))
-                elif isinstance(val, (np.floating,)):
-                    clean_row.append(float(val))
-                elif isinstance(val, (int, float)):
-                    clean_row.append(val)
-                else:
-                    clean_row.append(str(val) if val != "" else "")
-            rows.append(clean_row)
+        # Só numéricos e sem NaN: mesmo dtype comum (ex: int + float -> float)
+        # que o iterrows produzia, convertido para escalares Python pelo numpy
+        kinds = {dtype.kind for dtype in df.dtypes}
+        if kinds and kinds <= set("iufb") and not df.isna().to_numpy().any():
+            return [header] + df.to_numpy().tolist()
+        
+        columns = [self._column_to_sheets_values(df.iloc[:, i]) for i in range(df.shape[1])]
+        rows = [list(row) for row in zip(*columns)]
         
         return [header] + rows
     
+    @staticmethod
+    def _column_to_sheets_values(series: pd.Series) -> list:
+        """
+        Converte uma coluna para valores aceitos pelo Google Sheets.
+        
+        int/float/bool viram escalares Python e NaN vira string vazia;
+        textos ficam como estão; demais tipos (datas, objetos mistos)
+        passam por _to_sheets_value.
+        """
+        kind = series.dtype.kind if isinstance(series.dtype, np.dtype) else "O"
+        if kind == "f":
+            values = series.to_numpy().tolist()
+            for i in np.flatnonzero(series.isna().to_numpy()):
+                values[i] = ""
+            return values
+        if kind in "iub":
+            return series.to_numpy().tolist()
+        
+        # Substitui NaN por string vazia
+        values = series.fillna("").to_numpy(dtype=object)
+        if isinstance(series.dtype, pd.StringDtype) or pd.api.types.infer_dtype(values, skipna=False) == "string":
+            return values.tolist()
+        
+        to_value = GoogleSheetsLoader._to_sheets_value
+        return [to_value(val) for val in values]
+    
+    @staticmethod
+    def _to_sheets_value(val):
+        """Converte um valor avulso (coluna object) preservando números."""
+        if isinstance(val, str):
+            return val
+        if isinstance(val, np.integer):
+            return int(val)
+        if isinstance(val, np.floating):
+            return float(val)
+        if isinstance(val, (int, float)):
+            return val
+        return str(val)
+    
+    def _write_in_chunks(self, rows: list[list], write_chunk: Callable[[int, list[list]], None], label: str,
+                         chunk_landed: Callable[[int, list[list]], bool] = None):
+        """
+        Envia as linhas em blocos de SHEETS_CHUNK_ROWS, retomando do último
+        bloco gravado após uma falha transitória.
+        
+        Cada chamada já tem rate limit e backoff em 429/5xx (_call); aqui são
+        tratadas as falhas que sobram (conexão caída, retentativas esgotadas):
+        a aba é reaberta e a escrita continua do bloco que falhou.
+        
+        Escritas por posição (overwrite/diff) podem ser reenviadas sem
+        efeito colateral. Para as que não são idempotentes (append), a
+        falha pode ter ocorrido depois de o bloco ser aplicado:
+        `chunk_landed` confere a aba antes de retomar e o bloco só é
+        reenviado se não foi gravado.
+        
+        Args:
+            rows: Linhas a enviar
+            write_chunk: Função (índice da primeira linha, bloco) que envia um bloco
+            label: Rótulo para logs e contadores
+            chunk_landed: Função (índice da primeira linha, bloco) que indica se
+                o bloco que falhou já está na aba (levanta erro se não há como saber)
+        """
+        chunk_rows = self.config.sheets_chunk_rows
+        n_chunks = (len(rows) + chunk_rows - 1) // chunk_rows
+        chunk = 0
+        resumes = 0
+        
+        while chunk < n_chunks:
+            start = chunk * chunk_rows
+            try:
+                write_chunk(start, rows[start:start + chunk_rows])
+            except Exception as e:
+                status = getattr(getattr(e, "response", None), "status_code", None)
+                transient = status is None or status in self.retry_policy.statuses
+                if not transient or resumes >= self.retry_policy.max_retries:
+                    raise
+                
+                delay = self.retry_policy.delay_for(resumes)
+                THROTTLE_STATS.record_backoff(f"sheets:{label}", delay, status)
+                logger.warning(
+                    f"⚠️ Falha no bloco {chunk + 1}/{n_chunks} ({e}). "
+                    f"Retomando deste bloco em {delay:.1f}s..."
+                )
+                time.sleep(delay)
+                resumes += 1
+                if self.worksheet is not None:
+                    self.worksheet = self._call("worksheet", self.spreadsheet.worksheet, self.worksheet.title)
+                landed = (
+                    chunk_landed is not None and status not in REJECTED_STATUSES
+                    and chunk_landed(start, rows[start:start + chunk_rows])
+                )
+                if landed:
+                    logger.info(f"   ↪️ Bloco {chunk + 1}/{n_chunks} já estava gravado. Seguindo para o próximo.")
+                    chunk += 1
+                continue
+            
+            chunk += 1
+            if n_chunks > 1:
+                logger.info(f"   📦 Bloco {chunk}/{n_chunks} gravado ({min(start + chunk_rows, len(rows))}/{len(rows)} linhas)")
+    
     def _write_overwrite(self, data: list[list]) -> bool:
         """
         Escreve dados sobrescrevendo conteúdo existente.
         
+        A aba não é limpa antes da escrita (continua legível para o Looker
+        Studio): a grade é redimensionada uma única vez, os dados são
+        gravados por cima em blocos (values.batchUpdate) e, no fim, só as
+        linhas/colunas excedentes do conteúdo anterior são limpas.
+        
         Args:
             data: Dados a escrever (com header)
             
@@ -202,15 +381,35 @@ class GoogleSheetsLoader:
         logger.info(f"📝 Escrevendo {len(data) - 1} linhas (modo: overwrite)...")
         
         try:
-            # Limpa toda a planilha
-            self.worksheet.clear()
+            n_rows = len(data)
+            n_cols = max(len(row) for row in data)
+            old_rows = self.worksheet.row_count
+            old_cols = self.worksheet.col_count
             
-            # Escreve dados
-            self.worksheet.update(
-                range_name="A1",
-                values=data,
-                value_input_option="USER_ENTERED",
-            )
+            # Redimensiona a grade uma única vez (só cresce)
+            if old_rows < n_rows or old_cols < n_cols:
+                self._call("resize", self.worksheet.resize, rows=max(old_rows, n_rows), cols=max(old_cols, n_cols))
+            
+            def write_chunk(start: int, block: list[list]):
+                first_row = start + 1
+                last_cell = rowcol_to_a1(first_row + len(block) - 1, n_cols)
+                self._call(
+                    "batch_update",
+                    self.worksheet.batch_update,
+                    [{"range": f"A{first_row}:{last_cell}", "values": block}],
+                    value_input_option="USER_ENTERED",
+                )
+            
+            self._write_in_chunks(data, write_chunk, "overwrite")
+            
+            # Limpa apenas o que sobrou do conteúdo anterior
+            stale_ranges = []
+            if old_rows > n_rows:
+                stale_ranges.append(f"A{n_rows + 1}:{rowcol_to_a1(old_rows, max(old_cols, n_cols))}")
+            if old_cols > n_cols:
+                stale_ranges.append(f"{rowcol_to_a1(1, n_cols + 1)}:{rowcol_to_a1(n_rows, old_cols)}")
+            if stale_ranges:
+                self._call("batch_clear", self.worksheet.batch_clear, stale_ranges)
             
             # Formata header
             self._format_header()
@@ -236,7 +435,7 @@ class GoogleSheetsLoader:
         
         try:
             # Verifica se a planilha está vazia (precisa do header)
-            existing_data = self.worksheet.get_all_values()
+            existing_data = self._call("get_all_values", self.worksheet.get_all_values)
             
             if not existing_data:
                 # Planilha vazia - escreve com header
@@ -245,12 +444,7 @@ class GoogleSheetsLoader:
                 # Planilha tem dados - escreve só os dados (sem header)
                 rows_to_write = data[1:]
             
-            # Adiciona ao final
-            self.worksheet.append_rows(
-                values=rows_to_write,
-                value_input_option="USER_ENTERED",
-                insert_data_option="INSERT_ROWS",
-            )
+            self._append_rows(rows_to_write, existing_rows=len(existing_data))
             
             logger.info("✅ Dados adicionados com sucesso!")
             return True
@@ -259,22 +453,299 @@ class GoogleSheetsLoader:
             logger.error(f"❌ Erro ao escrever (append): {e}")
             return False
     
+    def _append_rows(self, rows: list[list], existing_rows: Optional[int] = None):
+        """
+        Adiciona linhas ao final da aba (em blocos).
+        
+        append_rows não é idempotente: só o 429 (pedido recusado) é
+        retentado direto. Após timeout/5xx a aba é relida e o bloco só é
+        reenviado se o número de linhas mostra que ele não foi gravado.
+        
+        Args:
+            rows: Linhas a adicionar
+            existing_rows: Linhas na aba antes da escrita (get_all_values).
+                Sem ele, uma falha ambígua interrompe a escrita em vez de
+                arriscar linhas duplicadas.
+        """
+        append_policy = self.retry_policy.only(REJECTED_STATUSES)
+        
+        def write_chunk(start: int, block: list[list]):
+            self._call(
+                "append_rows",
+                self.worksheet.append_rows,
+                values=block,
+                value_input_option="USER_ENTERED",
+                insert_data_option="INSERT_ROWS",
+                retry_policy=append_policy,
+            )
+        
+        def chunk_landed(start: int, block: list[list]) -> bool:
+            if existing_rows is None:
+                raise RuntimeError("append interrompido: sem a contagem de linhas da aba, reenviar pode duplicar o bloco")
+            expected = existing_rows + start
+            current = len(self._call("get_all_values", self.worksheet.get_all_values))
+            if current == expected:
+                return False
+            if current == expected + len(block):
+                return True
+            raise RuntimeError(
+                f"append interrompido: a aba tem {current} linhas, esperado {expected} "
+                f"(bloco não gravado) ou {expected + len(block)} (bloco gravado)"
+            )
+        
+        self._write_in_chunks(rows, write_chunk, "append", chunk_landed=chunk_landed)
+    
+    def append_rows(self, df: pd.DataFrame, existing_rows: Optional[int] = None) -> bool:
+        """
+        Adiciona as linhas do DataFrame sem header e sem ler a aba.
+        
+        Para cargas em sequência (streaming), quando a aba já recebeu o
+        header no primeiro bloco: evita o get_all_values do modo append.
+        
+        Args:
+            df: Linhas a adicionar
+            existing_rows: Linhas já gravadas na aba (com header), para
+                retomar com segurança após uma falha (ver _append_rows)
+        
+        Returns:
+            bool: True se escreveu com sucesso
+        """
+        if df.empty:
+            return True
+        
+        try:
+            self._append_rows(self._dataframe_to_sheets_format(df)[1:], existing_rows=existing_rows)
+            return True
+        except Exception as e:
+            logger.error(f"❌ Erro ao escrever (append): {e}")
+            return False
+    
+    @staticmethod
+    def _normalize_cell(val, numeric: bool = False):
+        """
+        Forma comparável de uma célula (valor novo ou lido do Sheets).
+        
+        O Sheets interpreta os valores (USER_ENTERED): "123" vira número e
+        "2026-01-31" vira data. Números e datas são normalizados para que o
+        mesmo valor seja igual dos dois lados; na dúvida, a linha é
+        considerada alterada e regravada.
+        
+        Só colunas numéricas (métricas) são comparadas como float; nas
+        demais o número vira texto, pois ids de 17-19 dígitos (id_instagram)
+        não cabem em um float e colidiriam.
+        """
+        if isinstance(val, bool):
+            return val
+        if isinstance(val, (int, float)):
+            if numeric:
+                return float(val)
+            if isinstance(val, float) and val.is_integer():
+                return str(int(val))
+            return str(val)
+        
+        text = str(val).strip()
+        if not text:
+            return ""
+        
+        match = _ISO_DATE.match(text)
+        if match:
+            return ("date", match.group(1), match.group(2), match.group(3))
+        match = _BR_DATE.match(text)
+        if match:
+            return ("date", match.group(3), match.group(2), match.group(1))
+        
+        if not numeric:
+            return text
+        try:
+            return float(text)
+        except ValueError:
+            return text
+    
+    def _write_diff(self, data: list[list], key_columns: Sequence[str]) -> bool:
+        """
+        Grava apenas as diferenças entre os dados novos e a aba atual.
+        
+        Lê a aba uma única vez, indexa as linhas pela chave e aplica:
+        - atualizações: linhas existentes com conteúdo diferente
+        - inserções: vão para o fim da aba, na ordem dos dados novos
+        - remoções: linhas restantes apagadas em uma única requisição
+        
+        As linhas existentes ficam onde estão: a aba mantém a ordem em que
+        as linhas entraram, não a ordem dos dados (ex: cidade/data).
+        
+        Cai para overwrite se a aba estiver vazia, o header mudou ou a
+        chave não for única.
+        
+        Args:
+            data: Dados a escrever (com header)
+            key_columns: Colunas que identificam uma linha
+            
+        Returns:
+            bool: True se escreveu com sucesso
+        """
+        header = data[0]
+        if any(col not in header for col in key_columns):
+            logger.warning(f"⚠️ Chave {list(key_columns)} ausente nos dados. Usando overwrite.")
+            return self._write_overwrite(data)
+        
+        try:
+            existing = self._call(
+                "get_all_values",
+                self.worksheet.get_all_values,
+                value_render_option="UNFORMATTED_VALUE",
+                date_time_render_option="FORMATTED_STRING",
+            )
+        except Exception as e:
+            logger.error(f"❌ Erro ao ler aba para diff: {e}")
+            return False
+        
+        if not existing or [str(col) for col in existing[0]] != [str(col) for col in header]:
+            logger.info("🔀 Aba vazia ou header diferente. Usando overwrite.")
+            return self._write_overwrite(data)
+        
+        key_idx = [header.index(col) for col in key_columns]
+        normalize = self._normalize_cell
+        # Métricas: colunas só com números (ou vazias) nos dados novos; a chave é sempre texto
+        numeric = [
+            i not in key_idx and all(
+                row[i] == "" or (isinstance(row[i], (int, float)) and not isinstance(row[i], bool))
+                for row in data[1:]
+            )
+            for i in range(len(header))
+        ]
+        
+        def row_key(row: list) -> Tuple:
+            return tuple(normalize(row[i]) if i < len(row) else "" for i in key_idx)
+        
+        def row_values(row: list) -> List:
+            return [normalize(row[i], numeric[i]) if i < len(row) else "" for i in range(len(header))]
+        
+        # Índice da aba atual: chave -> número da linha (1 = header)
+        current: Dict[Tuple, int] = {}
+        for row_number, row in enumerate(existing[1:], start=2):
+            current[row_key(row)] = row_number
+        new_keys = [row_key(row) for row in data[1:]]
+        if len(current) != len(existing) - 1 or len(set(new_keys)) != len(new_keys):
+            logger.warning(f"⚠️ Chave {list(key_columns)} não é única. Usando overwrite.")
+            return self._write_overwrite(data)
+        
+        updates: List[Tuple[int, list]] = []
+        inserts: List[list] = []
+        for key, row in zip(new_keys, data[1:]):
+            row_number = current.pop(key, None)
+            if row_number is None:
+                inserts.append(row)
+            elif row_values(existing[row_number - 1]) != row_values(row):
+                updates.append((row_number, row))
+        
+        # O que sobrou em `current` saiu dos dados: apagado depois da escrita
+        free_rows = sorted(current.values())
+        n_updates, n_deletes = len(updates), len(free_rows)
+        next_row = len(existing) + 1
+        for row in inserts:
+            updates.append((next_row, row))
+            next_row += 1
+        
+        logger.info(
+            f"🔀 Diff: {len(inserts)} inserções | {n_updates} atualizações | "
+            f"{n_deletes} remoções | {len(data) - 1 - len(inserts) - n_updates} inalteradas"
+        )
+        
+        try:
+            if updates:
+                self._write_row_updates(sorted(updates), len(header), next_row - 1)
+            if free_rows:
+                self._delete_rows(free_rows)
+            return True
+        except Exception as e:
+            logger.error(f"❌ Erro ao escrever (diff): {e}")
+            return False
+    
+    def _write_row_updates(self, updates: List[Tuple[int, list]], n_cols: int, last_row: int):
+        """
+        Grava linhas em posições específicas (values.batchUpdate em blocos).
+        
+        Linhas consecutivas são agrupadas em um único intervalo.
+        
+        Args:
+            updates: Lista ordenada de (número da linha, valores)
+            n_cols: Número de colunas
+            last_row: Última linha usada após a escrita (para crescer a grade)
+        """
+        if last_row > self.worksheet.row_count:
+            self._call("resize", self.worksheet.resize, rows=last_row)
+        
+        def write_chunk(start: int, block: List[Tuple[int, list]]):
+            self._call(
+                "batch_update",
+                self.worksheet.batch_update,
+                self._contiguous_ranges([(None, row_number, row) for row_number, row in block], n_cols),
+                value_input_option="USER_ENTERED",
+            )
+        
+        self._write_in_chunks(updates, write_chunk, "diff")
+    
+    @staticmethod
+    def _contiguous_ranges(items: List[Tuple[Optional[str], int, list]], n_cols: int = None) -> List[dict]:
+        """
+        Agrupa linhas consecutivas da mesma aba em intervalos A1.
+        
+        Args:
+            items: Lista ordenada de (aba ou None, número da linha, valores)
+            n_cols: Largura fixa (None = largura da própria linha)
+            
+        Returns:
+            Lista de {"range", "values"} para values.batchUpdate
+        """
+        groups: List[list] = []
+        for title, row_number, row in items:
+            last = groups[-1] if groups else None
+            if last and last[0] == title and last[2] == row_number - 1:
+                last[2] = row_number
+                last[3].append(row)
+            else:
+                groups.append([title, row_number, row_number, [row]])
+        
+        ranges = []
+        for title, first, last, rows in groups:
+            width = n_cols or max(len(row) for row in rows)
+            a1 = f"A{first}:{rowcol_to_a1(last, width)}"
+            ranges.append({"range": absolute_range_name(title, a1) if title else a1, "values": rows})
+        return ranges
+    
+    def _delete_rows(self, row_numbers: List[int]):
+        """Remove linhas (números 1-based) em uma única requisição batchUpdate."""
+        # Intervalos contíguos, de baixo para cima (índices não se deslocam)
+        spans: List[List[int]] = []
+        for row_number in sorted(row_numbers):
+            if spans and spans[-1][1] == row_number - 1:
+                spans[-1][1] = row_number
+            else:
+                spans.append([row_number, row_number])
+        
+        requests = [
+            {
+                "deleteDimension": {
+                    "range": {
+                        "sheetId": self.worksheet.id,
+                        "dimension": "ROWS",
+                        "startIndex": first - 1,
+                        "endIndex": last,
+                    }
+                }
+            }
+            for first, last in reversed(spans)
+        ]
+        self._call("delete_rows", self.spreadsheet.batch_update, {"requests": requests})
+    
     def _format_header(self):
         """Aplica formatação no header da planilha."""
         try:
             # Formata primeira linha (header)
-            # Formata primeira linha (header)
-            self.worksheet.format("1:1", {
-                "textFormat": {
-                    "bold": True,
-                    "foregroundColor": {"red": 1.0, "green": 1.0, "blue": 1.0}
-                },
-                "backgroundColor": {"red": 0.263, "green": 0.263, "blue": 0.263}, # #434343
-                "horizontalAlignment": "CENTER",
-            })
+            self._call("format", self.worksheet.format, "1:1", HEADER_FORMAT)
             
             # Congela primeira linha
-            self.worksheet.freeze(rows=1)
+            self._call("freeze", self.worksheet.freeze, rows=1)
             
         except Exception as e:
             logger.debug(f"Não foi possível formatar header: {e}")
@@ -290,7 +761,7 @@ class GoogleSheetsLoader:
             return 0
         
         try:
-            return len(self.worksheet.get_all_values())
+            return len(self._call("get_all_values", self.worksheet.get_all_values))
         except Exception:
             return 0
     
@@ -299,7 +770,7 @@ class GoogleSheetsLoader:
         if not self.worksheet:
             return []
         try:
-            return self.worksheet.get_all_values()
+            return self._call("get_all_values", self.worksheet.get_all_values)
         except Exception as e:
             logger.error(f"❌ Erro ao ler valores: {e}")
             return []
@@ -312,7 +783,276 @@ class GoogleSheetsLoader:
         logger.debug("🔌 Conexões fechadas")
 
 
-def load_to_sheets(df: pd.DataFrame, config: Config, tab_name: str = None) -> bool:
+class SheetsSession:
+    """
+    Sessão do Google Sheets compartilhada pela execução inteira.
+    
+    Autentica a Service Account e abre a planilha uma única vez, lê os
+    metadados (todas as abas) em uma chamada e guarda os handles das
+    worksheets. Também grava várias abas de uma vez (write_tabs), com
+    uma única spreadsheets.batchUpdate e values.batchUpdate para todas.
+    """
+    
+    def __init__(self, config: Config):
+        """
+        Inicializa a sessão (a conexão é aberta sob demanda).
+        
+        Args:
+            config: Configurações do ETL
+        """
+        self.config = config
+        self._base = GoogleSheetsLoader(config)  # Conexão, rate limit e retentativas
+        self._worksheets: Dict[str, gspread.Worksheet] = {}
+        self._metadata_stale = True
+        self._lock = threading.RLock()
+    
+    @property
+    def spreadsheet(self) -> Optional[gspread.Spreadsheet]:
+        return self._base.spreadsheet
+    
+    def open(self) -> bool:
+        """
+        Autentica e abre a planilha (apenas na primeira chamada).
+        
+        Returns:
+            bool: True se a planilha está aberta
+        """
+        with self._lock:
+            if self._base.spreadsheet is not None:
+                return True
+            
+            if not self._base.client and not self._base.connect():
+                return False
+            
+            try:
+                logger.info(f"📂 Abrindo planilha: {self.config.google_sheet_id}")
+                self._base.spreadsheet = self._base._call(
+                    "open", self._base.client.open_by_key, self.config.google_sheet_id
+                )
+                return True
+            except gspread.SpreadsheetNotFound:
+                logger.error(f"❌ Planilha não encontrada: {self.config.google_sheet_id}")
+                logger.error("Verifique se o ID está correto e se a Service Account tem acesso.")
+            except Exception as e:
+                logger.error(f"❌ Erro ao abrir planilha: {e}")
+            return False
+    
+    def worksheet(self, tab_name: str, create: bool = True) -> Optional[gspread.Worksheet]:
+        """
+        Retorna o handle de uma aba (metadados lidos uma vez por sessão).
+        
+        Args:
+            tab_name: Nome da aba
+            create: Cria a aba se não existir
+            
+        Returns:
+            Worksheet, ou None se não foi possível abrir/criar
+        """
+        with self._lock:
+            if not self.open():
+                return None
+            
+            if self._metadata_stale:
+                try:
+                    worksheets = self._base._call("worksheets", self.spreadsheet.worksheets)
+                    self._worksheets = {ws.title: ws for ws in worksheets}
+                    self._metadata_stale = False
+                except Exception as e:
+                    logger.error(f"❌ Erro ao ler abas da planilha: {e}")
+                    return None
+            
+            worksheet = self._worksheets.get(tab_name)
+            if worksheet is None and create:
+                logger.info(f"📝 Aba não existe. Criando: {tab_name}")
+                try:
+                    worksheet = self._base._call(
+                        "add_worksheet", self.spreadsheet.add_worksheet, title=tab_name, rows=1000, cols=26
+                    )
+                    self._worksheets[tab_name] = worksheet
+                except Exception as e:
+                    logger.error(f"❌ Erro ao criar aba {tab_name}: {e}")
+            return worksheet
+    
+    def loader(self, tab_name: str = None) -> Optional[GoogleSheetsLoader]:
+        """
+        Retorna um GoogleSheetsLoader já vinculado a uma aba da sessão.
+        
+        Args:
+            tab_name: Nome da aba (usa config se None)
+        """
+        worksheet = self.worksheet(tab_name or self.config.sheet_tab_name)
+        if worksheet is None:
+            return None
+        
+        loader = GoogleSheetsLoader(self.config)
+        loader.client = self._base.client
+        loader.spreadsheet = self.spreadsheet
+        loader.worksheet = worksheet
+        return loader
+    
+    def read_tab(self, tab_name: str, create: bool = True) -> pd.DataFrame:
+        """
+        Lê uma aba como DataFrame (primeira linha = header).
+        
+        Args:
+            tab_name: Nome da aba
+            create: Cria a aba se não existir (False = DataFrame vazio)
+        """
+        if not create and self.worksheet(tab_name, create=False) is None:
+            logger.warning(f"⚠️ Aba não encontrada: {tab_name}")
+            return pd.DataFrame()
+        
+        loader = self.loader(tab_name)
+        data = loader.get_all_values() if loader else []
+        if not data:
+            return pd.DataFrame()
+        return pd.DataFrame(data[1:], columns=data[0])
+    
+    def write_tabs(self, frames: Dict[str, pd.DataFrame],
+                   key_columns: Dict[str, Sequence[str]] = None,
+                   write_modes: Dict[str, str] = None) -> Dict[str, bool]:
+        """
+        Grava várias abas.
+        
+        Abas em overwrite são gravadas juntas: uma spreadsheets.batchUpdate
+        (grade + header de todas), values.batchUpdate em blocos com linhas
+        de todas as abas e uma values.batchClear para as sobras. Abas em
+        diff (com chave) ou append seguem pelo GoogleSheetsLoader.
+        
+        Args:
+            frames: Aba -> DataFrame (vazios são ignorados)
+            key_columns: Aba -> colunas-chave (WRITE_MODE=diff)
+            write_modes: Aba -> modo de escrita, sobrescrevendo WRITE_MODE
+            
+        Returns:
+            Dict aba -> True se gravou com sucesso
+        """
+        key_columns = key_columns or {}
+        write_modes = write_modes or {}
+        results: Dict[str, bool] = {}
+        batched: List[Tuple[gspread.Worksheet, list]] = []
+        
+        for tab_name, df in frames.items():
+            if df.empty:
+                results[tab_name] = True
+                continue
+            
+            mode = write_modes.get(tab_name, self.config.write_mode)
+            if mode == "append" or (mode == "diff" and key_columns.get(tab_name)):
+                loader = self.loader(tab_name)
+                results[tab_name] = bool(loader) and loader.load(
+                    df, key_columns=key_columns.get(tab_name), write_mode=mode
+                )
+                continue
+            
+            worksheet = self.worksheet(tab_name)
+            if worksheet is None:
+                results[tab_name] = False
+                continue
+            batched.append((worksheet, self._base._dataframe_to_sheets_format(df)))
+        
+        if batched:
+            ok = self._write_batched(batched)
+            for worksheet, _ in batched:
+                results[worksheet.title] = ok
+        return results
+    
+    def _write_batched(self, tabs: List[Tuple[gspread.Worksheet, list]]) -> bool:
+        """Sobrescreve várias abas com o mínimo de requisições (ver write_tabs)."""
+        titles = ", ".join(ws.title for ws, _ in tabs)
+        logger.info(f"📝 Escrevendo {len(tabs)} abas em lote (modo: overwrite): {titles}")
+        
+        try:
+            # 1. Grade (só cresce) + header formatado e congelado, todas as abas
+            requests = []
+            stale_ranges = []
+            items: List[Tuple[str, int, list]] = []
+            for worksheet, data in tabs:
+                n_rows = len(data)
+                n_cols = max(len(row) for row in data)
+                old_rows, old_cols = worksheet.row_count, worksheet.col_count
+                
+                requests.append({
+                    "updateSheetProperties": {
+                        "properties": {
+                            "sheetId": worksheet.id,
+                            "gridProperties": {
+                                "rowCount": max(old_rows, n_rows),
+                                "columnCount": max(old_cols, n_cols),
+                                "frozenRowCount": 1,
+                            },
+                        },
+                        "fields": "gridProperties(rowCount,columnCount,frozenRowCount)",
+                    }
+                })
+                requests.append({
+                    "repeatCell": {
+                        "range": {"sheetId": worksheet.id, "startRowIndex": 0, "endRowIndex": 1},
+                        "cell": {"userEnteredFormat": HEADER_FORMAT},
+                        "fields": "userEnteredFormat(textFormat,backgroundColor,horizontalAlignment)",
+                    }
+                })
+                
+                items.extend((worksheet.title, i + 1, row) for i, row in enumerate(data))
+                
+                # Sobras do conteúdo anterior
+                if old_rows > n_rows:
+                    stale_ranges.append(absolute_range_name(
+                        worksheet.title, f"A{n_rows + 1}:{rowcol_to_a1(old_rows, max(old_cols, n_cols))}"
+                    ))
+                if old_cols > n_cols:
+                    stale_ranges.append(absolute_range_name(
+                        worksheet.title, f"{rowcol_to_a1(1, n_cols + 1)}:{rowcol_to_a1(n_rows, old_cols)}"
+                    ))
+            
+            self._base._call("batch_update", self.spreadsheet.batch_update, {"requests": requests})
+            self._metadata_stale = True  # Tamanho das grades mudou
+            
+            # 2. Valores de todas as abas, em blocos de SHEETS_CHUNK_ROWS linhas
+            def write_chunk(start: int, block: List[Tuple[str, int, list]]):
+                self._base._call(
+                    "values_batch_update",
+                    self.spreadsheet.values_batch_update,
+                    body={"valueInputOption": "USER_ENTERED", "data": self._base._contiguous_ranges(block)},
+                )
+            
+            self._base._write_in_chunks(items, write_chunk, "overwrite")
+            
+            # 3. Limpa as sobras de todas as abas
+            if stale_ranges:
+                self._base._call(
+                    "values_batch_clear", self.spreadsheet.values_batch_clear, body={"ranges": stale_ranges}
+                )
+            
+            logger.info("✅ Dados escritos com sucesso!")
+            return True
+            
+        except Exception as e:
+            logger.error(f"❌ Erro ao escrever abas em lote: {e}")
+            return False
+    
+    def close(self):
+        """Fecha a sessão (cleanup)."""
+        with self._lock:
+            self._base.close()
+            self._worksheets = {}
+            self._metadata_stale = True
+
+
+# Sessão compartilhada pelas funções helper (uma por execução)
+_sheets_session: Optional[SheetsSession] = None
+
+
+def get_sheets_session(config: Config) -> SheetsSession:
+    """Retorna a sessão do Google Sheets da execução (criada na primeira chamada)."""
+    global _sheets_session
+    if _sheets_session is None or _sheets_session.config is not config:
+        _sheets_session = SheetsSession(config)
+    return _sheets_session
+
+
+def load_to_sheets(df: pd.DataFrame, config: Config, tab_name: str = None,
+                   key_columns: Sequence[str] = None) -> bool:
     """
     Função helper para carregar dados no Google Sheets.
     
@@ -320,52 +1060,45 @@ def load_to_sheets(df: pd.DataFrame, config: Config, tab_name: str = None) -> bo
         df: DataFrame com dados
         config: Configurações do ETL
         tab_name: Nome da aba (opcional)
+        key_columns: Colunas que identificam uma linha (WRITE_MODE=diff)
         
     Returns:
         bool: True se carregou com sucesso
     """
-    loader = GoogleSheetsLoader(config)
+    loader = get_sheets_session(config).loader(tab_name)
+    if loader is None:
+        return False
+    return loader.load(df, key_columns=key_columns)
+
+
+def write_sheets_tabs(frames: Dict[str, pd.DataFrame], config: Config,
+                      key_columns: Dict[str, Sequence[str]] = None,
+                      write_modes: Dict[str, str] = None) -> Dict[str, bool]:
+    """
+    Função helper para gravar várias abas de uma vez (ver SheetsSession.write_tabs).
     
-    try:
-        if not loader.connect():
-            return False
-        
-        if not loader.open_spreadsheet(tab_name):
-            return False
-        
-        return loader.load(df)
+    Args:
+        frames: Aba -> DataFrame
+        config: Configurações do ETL
+        key_columns: Aba -> colunas-chave (WRITE_MODE=diff)
+        write_modes: Aba -> modo de escrita, sobrescrevendo WRITE_MODE
         
-    finally:
-        loader.close()
+    Returns:
+        Dict aba -> True se gravou com sucesso
+    """
+    return get_sheets_session(config).write_tabs(frames, key_columns, write_modes)
+
 
-def get_sheet_data(config: Config, tab_name: str) -> pd.DataFrame:
+def get_sheet_data(config: Config, tab_name: str, create: bool = True) -> pd.DataFrame:
     """
     Lê dados de uma aba específica e retorna como DataFrame.
     
     Args:
         config: Configurações do ETL
         tab_name: Nome da aba
+        create: Cria a aba se não existir (False = DataFrame vazio)
         
     Returns:
         pd.DataFrame: Dados da aba
     """
-    loader = GoogleSheetsLoader(config)
-    
-    try:
-        if not loader.connect():
-            return pd.DataFrame()
-        
-        if not loader.open_spreadsheet(tab_name):
-            return pd.DataFrame()
-            
-        data = loader.get_all_values()
-        
-        if not data:
-            return pd.DataFrame()
-            
-        # Converte para DataFrame usando a primeira linha como header
-        df = pd.DataFrame(data[1:], columns=data[0])
-        return df
-        
-    finally:
-        loader.close()
+    return get_sheets_session(config).read_tab(tab_name, create=create)
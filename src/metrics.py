@@ -0,0 +1,354 @@
+"""
+Instrumentação da execução do ETL (tempos, contadores e relatório).
+
+Registra, para cada chamada externa, a latência (histograma), os bytes
+e o status, agrupados por tipo e chave:
+
+- http: requisições à API MyCreator, por endpoint (MyCreatorExtractor)
+- sheets: chamadas gspread, por operação (GoogleSheetsLoader)
+- db: gravações no Supabase, por tabela (SupabaseDatabase)
+
+Além disso conta eventos (retentativas, re-autenticações 401, hits e
+misses de cache) e, para cada etapa do run_etl.py, o tempo, as chamadas
+feitas durante ela e o pico de memória residente. Ao final, o
+relatório é gravado em JSON (um arquivo por execução, para comparar
+execuções) e, opcionalmente, no formato textfile do Prometheus
+(node_exporter).
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+logger = logging.getLogger("mycreator_etl")
+
+# Limites superiores (segundos) dos buckets do histograma de latência
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+PROMETHEUS_PREFIX = "mycreator_etl"
+
+
+class CallStats:
+    """Agregado das chamadas de uma chave (ex: http /backend/plan/preview)."""
+
+    __slots__ = ("count", "errors", "seconds", "max_seconds", "bytes_sent",
+                 "bytes_received", "rows", "statuses", "buckets")
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.seconds = 0.0
+        self.max_seconds = 0.0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.rows = 0
+        self.statuses: Dict[str, int] = {}
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)  # Último = +Inf
+
+    def observe(self, seconds: float, bytes_sent: int, bytes_received: int, rows: int,
+                status: Optional[int], error: bool):
+        self.count += 1
+        self.errors += int(error)
+        self.seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+        self.bytes_sent += bytes_sent
+        self.bytes_received += bytes_received
+        self.rows += rows
+        if status is not None:
+            self.statuses[str(status)] = self.statuses.get(str(status), 0) + 1
+
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if seconds <= bound:
+                self.buckets[i] += 1
+                break
+        else:
+            self.buckets[-1] += 1
+
+    def quantile(self, q: float) -> float:
+        """Quantil aproximado: limite superior do bucket que o contém."""
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        cumulative = 0
+        for bound, n in zip(LATENCY_BUCKETS, self.buckets):
+            cumulative += n
+            if cumulative >= target:
+                return bound
+        return self.max_seconds
+
+    def to_dict(self) -> dict:
+        cumulative, histogram = 0, {}
+        for bound, n in zip(LATENCY_BUCKETS + (float("inf"),), self.buckets):
+            cumulative += n
+            histogram["+Inf" if bound == float("inf") else str(bound)] = cumulative
+
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "seconds_total": round(self.seconds, 3),
+            "seconds_avg": round(self.seconds / self.count, 4) if self.count else 0.0,
+            "seconds_p50": self.quantile(0.5),
+            "seconds_p95": self.quantile(0.95),
+            "seconds_max": round(self.max_seconds, 3),
+            "bytes_sent": self.bytes_sent,
+            "bytes_received": self.bytes_received,
+            "rows": self.rows,
+            "statuses": dict(sorted(self.statuses.items())),
+            "histogram": histogram,
+        }
+
+
+class RunMetrics:
+    """Métricas de uma execução (thread-safe)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Zera tudo (início de uma nova execução)."""
+        with self._lock:
+            self.started_at = datetime.now()
+            self.calls: Dict[Tuple[str, str], CallStats] = {}
+            self.counters: Dict[Tuple[str, str], int] = {}
+            self.stages: Dict[str, float] = {}
+            self.stage_calls: Dict[str, Dict[str, int]] = {}
+            self.stage_peak_rss: Dict[str, float] = {}
+            self._stage: Optional[Tuple[str, float]] = None
+
+    # =========================================================================
+    # REGISTRO
+    # =========================================================================
+    def observe(self, kind: str, key: str, seconds: float, bytes_sent: int = 0,
+                bytes_received: int = 0, rows: int = 0, status: Optional[int] = None,
+                error: bool = False):
+        """
+        Registra uma chamada externa.
+
+        Args:
+            kind: Tipo da chamada (http, sheets, db)
+            key: Endpoint, operação ou tabela
+            seconds: Latência da chamada
+            bytes_sent: Bytes enviados
+            bytes_received: Bytes recebidos
+            rows: Linhas gravadas/lidas
+            status: Status HTTP (se houver)
+            error: Se a chamada falhou (exceção ou status >= 400)
+        """
+        with self._lock:
+            stats = self.calls.get((kind, key))
+            if stats is None:
+                stats = self.calls[(kind, key)] = CallStats()
+            stats.observe(seconds, bytes_sent, bytes_received, rows, status, error)
+            if self._stage:
+                per_kind = self.stage_calls.setdefault(self._stage[0], {})
+                per_kind[kind] = per_kind.get(kind, 0) + 1
+
+    @contextmanager
+    def timed(self, kind: str, key: str):
+        """
+        Mede o bloco como uma chamada (exceções contam como erro).
+
+        O dict retornado aceita bytes_sent, bytes_received, rows e status,
+        preenchidos pelo chamador dentro do bloco.
+        """
+        call = {}
+        start = time.perf_counter()
+        error = False
+        try:
+            yield call
+        except BaseException:
+            error = True
+            raise
+        finally:
+            self.observe(kind, key, time.perf_counter() - start, error=error, **call)
+
+    def increment(self, counter: str, key: str = "", n: int = 1):
+        """Incrementa um contador (ex: retries, reauth, cache_hits) por chave."""
+        with self._lock:
+            self.counters[(counter, key)] = self.counters.get((counter, key), 0) + n
+
+    def start_stage(self, name: str):
+        """Inicia uma etapa, encerrando a anterior (etapas repetidas acumulam)."""
+        now = time.perf_counter()
+        with self._lock:
+            self._close_stage(now)
+            self._stage = (name, now)
+
+    def finish(self):
+        """Encerra a etapa em andamento."""
+        with self._lock:
+            self._close_stage(time.perf_counter())
+
+    def _close_stage(self, now: float):
+        if self._stage:
+            name, started = self._stage
+            self.stages[name] = self.stages.get(name, 0.0) + (now - started)
+            peak = peak_rss_mb()
+            if peak is not None:
+                self.stage_peak_rss[name] = round(max(self.stage_peak_rss.get(name, 0.0), peak), 1)
+            self._stage = None
+
+    # =========================================================================
+    # RELATÓRIO
+    # =========================================================================
+    def report(self, **extra) -> dict:
+        """
+        Relatório da execução.
+
+        Args:
+            **extra: Campos adicionais (ex: status, posts, throttle)
+
+        Returns:
+            Dict serializável em JSON
+        """
+        with self._lock:
+            calls: Dict[str, Dict[str, dict]] = {}
+            for (kind, key), stats in sorted(self.calls.items()):
+                calls.setdefault(kind, {})[key] = stats.to_dict()
+
+            counters: Dict[str, Dict[str, int]] = {}
+            for (counter, key), n in sorted(self.counters.items()):
+                counters.setdefault(counter, {})[key or "total"] = n
+
+            finished_at = datetime.now()
+            return {
+                "started_at": self.started_at.isoformat(timespec="seconds"),
+                "finished_at": finished_at.isoformat(timespec="seconds"),
+                "duration_seconds": round((finished_at - self.started_at).total_seconds(), 2),
+                **extra,
+                "peak_rss_mb": peak_rss_mb(),
+                "stages": {name: round(seconds, 3) for name, seconds in self.stages.items()},
+                "stage_calls": {name: dict(sorted(kinds.items())) for name, kinds in self.stage_calls.items()},
+                "stage_peak_rss_mb": dict(self.stage_peak_rss),
+                "calls": calls,
+                "counters": counters,
+            }
+
+    def to_prometheus(self, report: dict = None) -> str:
+        """Relatório no formato de exposição do Prometheus (textfile collector)."""
+        report = report or self.report()
+        p = PROMETHEUS_PREFIX
+        lines = [
+            f"# HELP {p}_call_duration_seconds Latência das chamadas externas.",
+            f"# TYPE {p}_call_duration_seconds histogram",
+        ]
+        totals = []
+        for kind, keys in report["calls"].items():
+            for key, stats in keys.items():
+                labels = f'kind="{_escape(kind)}",key="{_escape(key)}"'
+                for bound, cumulative in stats["histogram"].items():
+                    lines.append(f'{p}_call_duration_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+                lines.append(f"{p}_call_duration_seconds_sum{{{labels}}} {stats['seconds_total']}")
+                lines.append(f"{p}_call_duration_seconds_count{{{labels}}} {stats['count']}")
+                for field in ("errors", "bytes_sent", "bytes_received", "rows"):
+                    totals.append((field, labels, stats[field]))
+
+        for field in ("errors", "bytes_sent", "bytes_received", "rows"):
+            lines.append(f"# TYPE {p}_call_{field}_total counter")
+            lines.extend(f"{p}_call_{field}_total{{{labels}}} {value}"
+                         for name, labels, value in totals if name == field)
+
+        lines.append(f"# TYPE {p}_events_total counter")
+        for counter, keys in report["counters"].items():
+            for key, n in keys.items():
+                lines.append(f'{p}_events_total{{event="{_escape(counter)}",key="{_escape(key)}"}} {n}')
+
+        lines.append(f"# TYPE {p}_stage_duration_seconds gauge")
+        for name, seconds in report["stages"].items():
+            lines.append(f'{p}_stage_duration_seconds{{stage="{_escape(name)}"}} {seconds}')
+        if report.get("stage_peak_rss_mb"):
+            lines.append(f"# TYPE {p}_stage_peak_rss_megabytes gauge")
+            for name, peak in report["stage_peak_rss_mb"].items():
+                lines.append(f'{p}_stage_peak_rss_megabytes{{stage="{_escape(name)}"}} {peak}')
+
+        lines.append(f"# TYPE {p}_run_duration_seconds gauge")
+        lines.append(f"{p}_run_duration_seconds {report['duration_seconds']}")
+        if "success" in report:
+            lines.append(f"# TYPE {p}_run_success gauge")
+            lines.append(f"{p}_run_success {int(bool(report['success']))}")
+        lines.append(f"# TYPE {p}_run_finished_timestamp_seconds gauge")
+        lines.append(f"{p}_run_finished_timestamp_seconds "
+                     f"{int(datetime.fromisoformat(report['finished_at']).timestamp())}")
+        return "\n".join(lines) + "\n"
+
+    def log_summary(self, top: int = 5):
+        """Loga as chaves que mais consumiram tempo."""
+        with self._lock:
+            slowest = sorted(self.calls.items(), key=lambda kv: -kv[1].seconds)[:top]
+            stages = dict(self.stages)
+
+        if stages:
+            logger.info("⏱️ Etapas: " + " | ".join(f"{name} {seconds:.1f}s" for name, seconds in stages.items()))
+        for (kind, key), stats in slowest:
+            logger.info(
+                f"   ⏱️ {kind} {key}: {stats.count} chamadas, {stats.seconds:.1f}s "
+                f"(p95 ≤ {stats.quantile(0.95)}s, {stats.errors} erros)"
+            )
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Pico de memória residente do processo (MB), se disponível."""
+    if resource is None:
+        return None
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)  # KB no Linux
+
+
+def _escape(value: str) -> str:
+    """Escapa o valor de um label Prometheus."""
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _write_atomic(path: Path, content: str):
+    """Grava via arquivo temporário + rename (leitores nunca veem o arquivo pela metade)."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp_path.write_text(content, encoding="utf-8")
+    os.replace(tmp_path, path)
+
+
+# Métricas globais da execução (API MyCreator, Google Sheets e Supabase)
+RUN_METRICS = RunMetrics()
+
+
+def write_run_report(config, **extra) -> Optional[Path]:
+    """
+    Grava o relatório da execução (METRICS_REPORT_DIR / METRICS_PROMETHEUS_PATH).
+
+    Falhas não interrompem o ETL: apenas geram um aviso.
+
+    Args:
+        config: Configurações do ETL
+        **extra: Campos adicionais do relatório (ex: success, posts)
+
+    Returns:
+        Caminho do JSON gravado (None se desativado ou em caso de falha)
+    """
+    RUN_METRICS.finish()
+    RUN_METRICS.log_summary()
+    report = RUN_METRICS.report(**extra)
+
+    path = None
+    try:
+        if config.metrics_report_dir:
+            started_at = datetime.fromisoformat(report["started_at"])
+            path = Path(config.metrics_report_dir) / f"run_{started_at:%Y%m%d_%H%M%S}.json"
+            _write_atomic(path, json.dumps(report, ensure_ascii=False, indent=2))
+            logger.info(f"📋 Relatório da execução: {path}")
+        if config.metrics_prometheus_path:
+            _write_atomic(Path(config.metrics_prometheus_path), RUN_METRICS.to_prometheus(report))
+    except OSError as e:
+        logger.warning(f"⚠️ Não foi possível gravar o relatório da execução: {e}")
+        return None
+    return path
@@ -0,0 +1,62 @@
+"""
+Ranking dos Top Posts (abas top_posts_mycreator / top_posts_pessoais).
+
+Seleciona os N maiores posts por (tipo de ranking, workspace, fonte,
+perfil) em uma única passada: ordenação estável pelo valor da métrica
++ groupby(...).head(N), em vez de máscaras booleanas sobre o DataFrame
+inteiro para cada combinação de grupo.
+
+A saída reproduz a ordem do loop anterior: rank_tipo na ordem de
+RANK_TYPES, workspaces e perfis na ordem em que aparecem no DataFrame,
+fonte na ordem de SOURCES e, dentro do grupo, valor decrescente
+(empates na ordem original, como o nlargest). Linhas sem valor_metrica
+vão para o fim do grupo e só entram para completar N, como no nlargest
+(que não descarta NaN).
+"""
+
+import pandas as pd
+
+RANK_TYPES = ["alcance", "engajamento", "impressoes"]
+SOURCES = ["mycreator", "instagram_nativo"]
+GROUP_COLUMNS = ["rank_tipo", "workspace", "fonte", "perfil"]
+
+
+def top_posts_per_profile(df_combined: pd.DataFrame, n: int = 5) -> pd.DataFrame:
+    """
+    Top N posts por perfil, workspace, fonte e tipo de ranking.
+
+    Args:
+        df_combined: Posts candidatos (colunas GROUP_COLUMNS + valor_metrica)
+        n: Posts por grupo
+
+    Returns:
+        DataFrame com as linhas selecionadas (índice reiniciado). Linhas
+        com tipo/fonte fora das listas ou sem workspace/perfil são ignoradas.
+    """
+    df = df_combined.reset_index(drop=True)
+
+    valid = (
+        df["rank_tipo"].isin(RANK_TYPES)
+        & df["fonte"].isin(SOURCES)
+        & df["workspace"].notna()
+        & df["perfil"].notna()
+    )
+    candidates = df[valid]
+    if candidates.empty:
+        return df.iloc[0:0].reset_index(drop=True)
+
+    # Chaves de ordenação dos grupos (perfil: ordem de aparição no grupo)
+    workspaces = pd.unique(df["workspace"].dropna())
+    group_order = pd.DataFrame({
+        "rank": candidates["rank_tipo"].map({name: i for i, name in enumerate(RANK_TYPES)}),
+        "workspace": candidates["workspace"].map({name: i for i, name in enumerate(workspaces)}),
+        "fonte": candidates["fonte"].map({name: i for i, name in enumerate(SOURCES)}),
+        "perfil": candidates.groupby(GROUP_COLUMNS, sort=False).ngroup(),
+    })
+
+    # Top N de cada grupo: maiores valores, empates na ordem original
+    by_value = candidates.sort_values("valor_metrica", ascending=False, kind="stable")
+    top = by_value.groupby(GROUP_COLUMNS, sort=False).head(n)
+
+    ordered = group_order.loc[top.index].sort_values(["rank", "workspace", "fonte", "perfil"], kind="stable")
+    return df.loc[ordered.index].reset_index(drop=True)
@@ -0,0 +1,555 @@
+"""
+Harness offline do ETL (gravação/reprodução e dependências em memória).
+
+- Cassette + RecordingSession: envolvem a sessão curl_cffi real e
+  gravam cada resposta da API MyCreator em um cassete (JSONL com gzip)
+- HandlerSession: sessão com a interface do curl_cffi que responde sem
+  rede, a partir de um cassete (Cassette.replay) ou da API sintética
+  (src/synthetic.py)
+- FakeSheetsClient: planilha em memória com a parte da API gspread
+  usada por src/load.py
+- SQLiteStandIn: grava no SQLite local o que iria para o Supabase
+
+Os patches (record_http, serve_http, patch_sheets, patched) trocam as
+dependências externas durante um bloco with, para rodar o run_etl.py
+inteiro offline (ver run_benchmark.py etl).
+
+O cassete não guarda headers das requisições (cookie/token) e a
+resposta do login é gravada com credenciais fictícias.
+"""
+
+import gzip
+import json
+import logging
+import os
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List
+from urllib.parse import urlparse
+
+import gspread
+import pandas as pd
+from curl_cffi import requests as curl_requests
+from gspread.utils import a1_range_to_grid_range
+
+from . import load
+from .cache import CachedResponse, ResponseCache
+from .database import SQLiteDatabase, metrics_history_frame
+from .metrics import RUN_METRICS
+
+logger = logging.getLogger("mycreator_etl")
+
+# Campos do payload que mudam a cada dia (período relativo a "hoje") e
+# não entram na chave: o cassete continua válido em outras datas
+VOLATILE_FIELDS = ("date", "date_range")
+
+# Respostas gravadas sem o conteúdo real (credenciais)
+REDACTED_PATHS = {"/backend/login": {"token": "replay-token"}}
+
+# Headers de resposta preservados no cassete
+KEPT_HEADERS = ("Content-Type", "Retry-After")
+
+
+class ReplayResponse(CachedResponse):
+    """Resposta reproduzida (cassete ou API sintética), com cookies."""
+
+    from_cache = False
+
+    def __init__(self, status_code: int, content: bytes, headers: dict = None, url: str = "",
+                 cookies: dict = None):
+        super().__init__(status_code, content, headers, url)
+        self.cookies = cookies or {}
+
+    @classmethod
+    def from_json(cls, status_code: int, body, url: str = "", cookies: dict = None) -> "ReplayResponse":
+        content = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        return cls(status_code, content, {"Content-Type": "application/json"}, url, cookies)
+
+
+# =============================================================================
+# CASSETE
+# =============================================================================
+def request_key(method: str, url: str, params: dict = None, payload=None) -> str:
+    """Chave da requisição no cassete (ResponseCache.make_key sem VOLATILE_FIELDS)."""
+    if isinstance(payload, dict):
+        payload = {k: v for k, v in payload.items() if k not in VOLATILE_FIELDS}
+    if isinstance(params, dict):
+        params = {k: v for k, v in params.items() if k not in VOLATILE_FIELDS}
+    return ResponseCache.make_key(method, url, params, payload)
+
+
+class Cassette:
+    """
+    Respostas gravadas da API, na ordem em que foram recebidas.
+
+    Requisições repetidas (mesma chave) são reproduzidas na ordem da
+    gravação; depois da última, a última resposta se repete.
+    """
+
+    def __init__(self):
+        self.entries: List[dict] = []
+        self.misses = 0
+        self._by_key: Dict[str, List[dict]] = {}
+        self._cursor: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    @classmethod
+    def load(cls, path: str) -> "Cassette":
+        """Lê um cassete gravado por save()."""
+        cassette = cls()
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    cassette._add(json.loads(line))
+        logger.info(f"📼 Cassete carregado: {path} ({len(cassette)} respostas)")
+        return cassette
+
+    def save(self, path: str) -> int:
+        """
+        Grava o cassete (arquivo temporário + rename).
+
+        Returns:
+            Número de respostas gravadas
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        with self._lock:
+            entries = list(self.entries)
+        with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+            for entry in entries:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        os.replace(tmp_path, path)
+        logger.info(f"📼 Cassete gravado: {path} ({len(entries)} respostas)")
+        return len(entries)
+
+    def _add(self, entry: dict):
+        with self._lock:
+            self.entries.append(entry)
+            self._by_key.setdefault(entry["key"], []).append(entry)
+
+    def record(self, method: str, url: str, params: dict, payload, response):
+        """Grava a resposta de uma requisição."""
+        path = urlparse(url).path
+        content = response.content or b""
+        cookies = dict(getattr(response, "cookies", None) or {})
+        if path in REDACTED_PATHS:
+            content = json.dumps(REDACTED_PATHS[path]).encode("utf-8")
+            cookies = {name: "replay" for name in cookies}
+
+        self._add({
+            "key": request_key(method, url, params, payload),
+            "method": method.upper(),
+            "path": path,
+            "status": response.status_code,
+            "headers": {k: response.headers[k] for k in KEPT_HEADERS if k in response.headers},
+            "cookies": cookies,
+            "body": content.decode("utf-8", errors="replace"),
+        })
+
+    def replay(self, method: str, url: str, params: dict = None, payload=None) -> ReplayResponse:
+        """
+        Reproduz a resposta gravada para a requisição.
+
+        Returns:
+            ReplayResponse; requisições fora do cassete recebem 504 (como o
+            cache HTTP no modo offline), nada sai para a rede
+        """
+        key = request_key(method, url, params, payload)
+        with self._lock:
+            candidates = self._by_key.get(key)
+            if not candidates:
+                self.misses += 1
+                entry = None
+            else:
+                position = self._cursor.get(key, 0)
+                entry = candidates[min(position, len(candidates) - 1)]
+                self._cursor[key] = position + 1
+
+        if entry is None:
+            logger.debug(f"📼 Fora do cassete: {method.upper()} {urlparse(url).path}")
+            return ReplayResponse(504, b"", url=url)
+        return ReplayResponse(
+            entry["status"], entry["body"].encode("utf-8"), entry["headers"], url, entry["cookies"]
+        )
+
+
+# =============================================================================
+# SESSÕES HTTP
+# =============================================================================
+class HandlerSession:
+    """
+    Sessão com a interface do curl_cffi usada pelo extrator e pelo login,
+    respondida por `handler(method, url, params, payload)` sem rede.
+    """
+
+    def __init__(self, handler: Callable, **_options):
+        self.handler = handler
+
+    def request(self, method: str, url: str, params: dict = None, json=None, **_kwargs):
+        return self.handler(method.upper(), url, params, json)
+
+    def get(self, url: str, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class AsyncHandlerSession:
+    """Versão asyncio de HandlerSession (curl_cffi AsyncSession)."""
+
+    def __init__(self, handler: Callable, **_options):
+        self.handler = handler
+
+    async def request(self, method: str, url: str, params: dict = None, json=None, **_kwargs):
+        return self.handler(method.upper(), url, params, json)
+
+    async def get(self, url: str, **kwargs):
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url: str, **kwargs):
+        return await self.request("POST", url, **kwargs)
+
+    async def close(self):
+        pass
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+
+class RecordingSession:
+    """Sessão curl_cffi real que grava cada resposta no cassete."""
+
+    def __init__(self, cassette: Cassette, session):
+        self.cassette = cassette
+        self._session = session
+
+    def request(self, method: str, url: str, params: dict = None, json=None, **kwargs):
+        response = getattr(self._session, method.lower())(url, params=params, json=json, **kwargs)
+        self.cassette.record(method, url, params, json, response)
+        return response
+
+    def get(self, url: str, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+    def close(self):
+        self._session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class AsyncRecordingSession:
+    """Versão asyncio de RecordingSession."""
+
+    def __init__(self, cassette: Cassette, session):
+        self.cassette = cassette
+        self._session = session
+
+    async def request(self, method: str, url: str, params: dict = None, json=None, **kwargs):
+        response = await getattr(self._session, method.lower())(url, params=params, json=json, **kwargs)
+        self.cassette.record(method, url, params, json, response)
+        return response
+
+    async def get(self, url: str, **kwargs):
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url: str, **kwargs):
+        return await self.request("POST", url, **kwargs)
+
+    async def close(self):
+        await self._session.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+
+@contextmanager
+def patched(target, name: str, value):
+    """Substitui target.name por value durante o bloco."""
+    original = getattr(target, name)
+    setattr(target, name, value)
+    try:
+        yield value
+    finally:
+        setattr(target, name, original)
+
+
+@contextmanager
+def patch_http(session_factory: Callable, async_session_factory: Callable):
+    """Troca curl_cffi.requests.Session/AsyncSession (extrator e login) durante o bloco."""
+    with patched(curl_requests, "Session", session_factory), \
+            patched(curl_requests, "AsyncSession", async_session_factory):
+        yield
+
+
+def record_http(cassette: Cassette):
+    """Requisições vão para a API real e são gravadas em `cassette`."""
+    real_session, real_async_session = curl_requests.Session, curl_requests.AsyncSession
+    return patch_http(
+        lambda **options: RecordingSession(cassette, real_session(**options)),
+        lambda **options: AsyncRecordingSession(cassette, real_async_session(**options)),
+    )
+
+
+def serve_http(handler: Callable):
+    """
+    Requisições são respondidas por `handler` (sem rede).
+
+    Args:
+        handler: Função (method, url, params, payload) -> resposta, ex:
+                 Cassette.replay ou uma SyntheticAPI
+    """
+    return patch_http(
+        lambda **options: HandlerSession(handler, **options),
+        lambda **options: AsyncHandlerSession(handler, **options),
+    )
+
+
+# =============================================================================
+# GOOGLE SHEETS EM MEMÓRIA
+# =============================================================================
+def _display(value) -> str:
+    """Valor como exibido na planilha (FORMATTED_VALUE)."""
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "TRUE" if value else "FALSE"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+class FakeWorksheet:
+    """Aba em memória (linhas como listas), com a grade limitando as escritas."""
+
+    def __init__(self, title: str, sheet_id: int, rows: int = 1000, cols: int = 26):
+        self.title = title
+        self.id = sheet_id
+        self.row_count = rows
+        self.col_count = cols
+        self._rows: List[list] = []
+        self._lock = threading.Lock()
+
+    def _bounds(self, a1: str) -> tuple:
+        grid = a1_range_to_grid_range(a1.rsplit("!", 1)[-1])
+        return (
+            grid.get("startRowIndex", 0), grid.get("endRowIndex", self.row_count),
+            grid.get("startColumnIndex", 0), grid.get("endColumnIndex", self.col_count),
+        )
+
+    def _write(self, a1: str, values: List[list]):
+        row_start, _, col_start, _ = self._bounds(a1)
+        width = max((len(row) for row in values), default=0)
+        if row_start + len(values) > self.row_count or col_start + width > self.col_count:
+            raise ValueError(f"Range ({self.title}!{a1}) exceeds grid limits")
+
+        missing = row_start + len(values) - len(self._rows)
+        if missing > 0:
+            self._rows.extend([] for _ in range(missing))
+        for offset, values_row in enumerate(values):
+            row = self._rows[row_start + offset]
+            if len(row) < col_start + len(values_row):
+                row.extend([""] * (col_start + len(values_row) - len(row)))
+            row[col_start:col_start + len(values_row)] = values_row
+
+    def _clear(self, a1: str):
+        row_start, row_end, col_start, col_end = self._bounds(a1)
+        for row in self._rows[row_start:row_end]:
+            for col in range(col_start, min(col_end, len(row))):
+                row[col] = ""
+
+    def resize(self, rows: int = None, cols: int = None):
+        with self._lock:
+            self.row_count = rows or self.row_count
+            self.col_count = cols or self.col_count
+            del self._rows[self.row_count:]
+            for row in self._rows:
+                del row[self.col_count:]
+
+    def batch_update(self, data: List[dict], value_input_option: str = None, **_kwargs):
+        with self._lock:
+            for item in data:
+                self._write(item["range"], item["values"])
+
+    def batch_clear(self, ranges: List[str]):
+        with self._lock:
+            for a1 in ranges:
+                self._clear(a1)
+
+    def append_rows(self, values: List[list], value_input_option: str = None, **_kwargs):
+        with self._lock:
+            last = len(self._rows)
+            while last and not any(cell != "" for cell in self._rows[last - 1]):
+                last -= 1
+            del self._rows[last:]
+            self.row_count = max(self.row_count, last + len(values))
+            self.col_count = max(self.col_count, max((len(row) for row in values), default=0))
+            self._rows.extend(list(row) for row in values)
+
+    def delete_rows(self, start_index: int, end_index: int):
+        """Remove as linhas [start_index, end_index) (índices 0-based)."""
+        with self._lock:
+            del self._rows[start_index:end_index]
+            self.row_count -= end_index - start_index
+
+    def get_all_values(self, value_render_option=None, **_kwargs) -> List[list]:
+        with self._lock:
+            rows = [list(row) for row in self._rows]
+        while rows and not any(cell != "" for cell in rows[-1]):
+            rows.pop()
+        width = max((len(row) for row in rows), default=0)
+        render = _display if value_render_option in (None, "FORMATTED_VALUE") else (lambda v: v)
+        return [[render(cell) for cell in row] + [""] * (width - len(row)) for row in rows]
+
+    def format(self, *_args, **_kwargs):
+        pass
+
+    def freeze(self, *_args, **_kwargs):
+        pass
+
+
+class FakeSpreadsheet:
+    """Planilha em memória (spreadsheets.batchUpdate e values.batch*)."""
+
+    def __init__(self, key: str):
+        self.id = key
+        self._sheets: Dict[str, FakeWorksheet] = {}
+        self._lock = threading.Lock()
+
+    def worksheet(self, title: str) -> FakeWorksheet:
+        if title not in self._sheets:
+            raise gspread.WorksheetNotFound(title)
+        return self._sheets[title]
+
+    def worksheets(self) -> List[FakeWorksheet]:
+        return list(self._sheets.values())
+
+    def add_worksheet(self, title: str, rows: int, cols: int, index: int = None) -> FakeWorksheet:
+        with self._lock:
+            worksheet = FakeWorksheet(title, len(self._sheets), rows, cols)
+            self._sheets[title] = worksheet
+        return worksheet
+
+    def _by_id(self, sheet_id: int) -> FakeWorksheet:
+        return next(ws for ws in self._sheets.values() if ws.id == sheet_id)
+
+    def _split(self, a1: str) -> tuple:
+        title, _ = a1.rsplit("!", 1)
+        if title.startswith("'"):
+            title = title[1:-1].replace("''", "'")
+        return self.worksheet(title), a1
+
+    def batch_update(self, body: dict) -> dict:
+        for request in body.get("requests", []):
+            if "updateSheetProperties" in request:
+                properties = request["updateSheetProperties"]["properties"]
+                grid = properties.get("gridProperties", {})
+                self._by_id(properties["sheetId"]).resize(grid.get("rowCount"), grid.get("columnCount"))
+            elif "deleteDimension" in request:
+                span = request["deleteDimension"]["range"]
+                if span.get("dimension", "ROWS") == "ROWS":
+                    self._by_id(span["sheetId"]).delete_rows(span["startIndex"], span["endIndex"])
+        return {"replies": []}
+
+    def values_batch_update(self, body: dict) -> dict:
+        for item in body.get("data", []):
+            worksheet, a1 = self._split(item["range"])
+            worksheet.batch_update([{"range": a1, "values": item["values"]}])
+        return {}
+
+    def values_batch_clear(self, body: dict) -> dict:
+        for a1 in body.get("ranges", []):
+            worksheet, a1 = self._split(a1)
+            worksheet.batch_clear([a1])
+        return {}
+
+
+class FakeSheetsClient:
+    """Cliente gspread em memória (uma planilha por chave)."""
+
+    def __init__(self):
+        self.spreadsheets: Dict[str, FakeSpreadsheet] = {}
+        self._lock = threading.Lock()
+
+    def open_by_key(self, key: str) -> FakeSpreadsheet:
+        with self._lock:
+            if key not in self.spreadsheets:
+                self.spreadsheets[key] = FakeSpreadsheet(key)
+            return self.spreadsheets[key]
+
+
+@contextmanager
+def patch_sheets(client: FakeSheetsClient):
+    """GoogleSheetsLoader.connect passa a usar `client` (sem credenciais GCP)."""
+    def connect(self) -> bool:
+        self.client = client
+        return True
+
+    load._sheets_session = None
+    try:
+        with patched(load.GoogleSheetsLoader, "connect", connect):
+            yield client
+    finally:
+        load._sheets_session = None
+
+
+# =============================================================================
+# SUPABASE EM SQLITE
+# =============================================================================
+class SQLiteStandIn(SQLiteDatabase):
+    """
+    SQLite no lugar do SupabaseDatabase (mesmos métodos usados pelo run_etl.py).
+
+    save_posts substitui a tabela (equivale ao upsert com delete_missing da
+    base completa); o histórico de métricas é acumulado.
+    """
+
+    def save_posts(self, df: pd.DataFrame, table_name: str = "posts_final", delete_missing: bool = False):
+        with RUN_METRICS.timed("db", table_name) as call:
+            super().save_posts(df, table_name=table_name)
+            call["rows"] = len(df)
+
+    def append_metrics_history(self, df_posts: pd.DataFrame, extracted_at: datetime) -> dict:
+        history = metrics_history_frame(df_posts, extracted_at)
+        if history.empty:
+            return {"upserted": 0, "deleted": 0}
+        if not self.conn:
+            self.connect()
+        history = history.assign(extracted_at=history["extracted_at"].astype(str))
+        with RUN_METRICS.timed("db", "post_metrics_history") as call:
+            history.to_sql("post_metrics_history", self.conn, if_exists="append", index=False)
+            call["rows"] = len(history)
+        return {"upserted": len(history), "deleted": 0}
+
+
+def sqlite_stand_in(db_path: str) -> Callable[[str], SQLiteStandIn]:
+    """Fábrica com a assinatura de SupabaseDatabase(uri), gravando em `db_path`."""
+    return lambda _uri="": SQLiteStandIn(db_path)
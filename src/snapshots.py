@@ -0,0 +1,264 @@
+"""
+Snapshots locais (Parquet) dos DataFrames de cada execução.
+
+Cada execução grava seus DataFrames intermediários (posts, dados brutos,
+hashtags, crescimento, top posts) como datasets Parquet comprimidos,
+particionados pela data da execução:
+
+    <diretório>/<nome>/run_date=YYYY-MM-DD/<HHMMSS>[-<bloco>].parquet
+
+Cada arquivo ganha a coluna run_at (momento da execução), já que há
+várias execuções por dia. A leitura usa pyarrow.dataset: só as partições
+do período são abertas, e colunas/filtros são aplicados na leitura dos
+arquivos (projeção e predicate pushdown), permitindo backfills e
+auditorias sem voltar à API ou ao Sheets.
+
+Requer pyarrow (opcional: sem ele os snapshots ficam desativados).
+"""
+
+import logging
+import os
+from datetime import date, datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Union
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow é opcional (apenas para snapshots)
+    pa = ds = pq = None
+
+logger = logging.getLogger("mycreator_etl")
+
+DateLike = Union[date, datetime, str, None]
+
+PARTITION_PREFIX = "run_date="
+
+
+def _as_date(value: DateLike) -> Optional[date]:
+    """Converte date/datetime/'YYYY-MM-DD' em date (None = sem limite)."""
+    if value is None or isinstance(value, date) and not isinstance(value, datetime):
+        return value
+    if isinstance(value, datetime):
+        return value.date()
+    return date.fromisoformat(value)
+
+
+class SnapshotStore:
+    """Store de snapshots Parquet particionado por data de execução."""
+
+    def __init__(self, directory: str, compression: str = "zstd"):
+        """
+        Inicializa o store.
+
+        Args:
+            directory: Diretório raiz dos datasets
+            compression: Codec Parquet (zstd, snappy, gzip, none)
+
+        Raises:
+            ImportError: Se pyarrow não estiver instalado
+        """
+        if pa is None:
+            raise ImportError("pyarrow não instalado (pip install pyarrow)")
+
+        self.directory = Path(directory)
+        self.compression = compression
+
+    # =========================================================================
+    # ESCRITA
+    # =========================================================================
+    @staticmethod
+    def _to_table(df: pd.DataFrame, run_at: datetime) -> "pa.Table":
+        """
+        Converte o DataFrame em tabela Arrow com a coluna run_at.
+
+        Colunas object com tipos mistos (ex: números e "" vindos do
+        Sheets) são gravadas como texto.
+        """
+        df = df.reset_index(drop=True)
+        columns = {}
+        for col in df.columns:
+            series = df[col]
+            try:
+                columns[str(col)] = pa.array(series, from_pandas=True)
+            except (pa.ArrowInvalid, pa.ArrowTypeError):
+                columns[str(col)] = pa.array(series.map(lambda val: None if pd.isna(val) else str(val)), pa.string())
+
+        columns["run_at"] = pa.array([run_at] * len(df), pa.timestamp("us"))
+        return pa.table(columns)
+
+    def write(self, name: str, df: pd.DataFrame, run_at: datetime, part: Optional[int] = None) -> Optional[Path]:
+        """
+        Grava o snapshot de um DataFrame.
+
+        Args:
+            name: Nome do dataset (ex: "posts")
+            df: DataFrame da execução
+            run_at: Momento da execução (define a partição)
+            part: Número do bloco, para gravar a execução em vários arquivos
+                (modo streaming)
+
+        Returns:
+            Caminho do arquivo gravado (None se o DataFrame estiver vazio)
+        """
+        if df is None or df.empty:
+            return None
+
+        partition = self.directory / name / f"{PARTITION_PREFIX}{run_at:%Y-%m-%d}"
+        partition.mkdir(parents=True, exist_ok=True)
+        suffix = f"-{part:05d}" if part is not None else ""
+        path = partition / f"{run_at:%H%M%S}{suffix}.parquet"
+        tmp_path = partition / f".{path.name}.{os.getpid()}.tmp"
+
+        pq.write_table(self._to_table(df, run_at), tmp_path, compression=self.compression)
+        os.replace(tmp_path, path)
+        return path
+
+    def write_run(self, frames: Dict[str, pd.DataFrame], run_at: datetime) -> Dict[str, Path]:
+        """
+        Grava os snapshots de todos os DataFrames de uma execução.
+
+        Returns:
+            Dict nome -> arquivo gravado (DataFrames vazios são ignorados)
+        """
+        written = {}
+        for name, df in frames.items():
+            path = self.write(name, df, run_at)
+            if path:
+                written[name] = path
+        return written
+
+    # =========================================================================
+    # LEITURA
+    # =========================================================================
+    def run_dates(self, name: str) -> List[date]:
+        """Datas de execução disponíveis de um dataset (ordenadas)."""
+        base = self.directory / name
+        if not base.is_dir():
+            return []
+        return sorted(
+            date.fromisoformat(path.name[len(PARTITION_PREFIX):])
+            for path in base.iterdir()
+            if path.is_dir() and path.name.startswith(PARTITION_PREFIX)
+        )
+
+    def _files(self, name: str, start: DateLike, end: DateLike) -> List[str]:
+        """Arquivos das partições dentro do período (inclusivo)."""
+        start, end = _as_date(start), _as_date(end)
+        files = []
+        for run_date in self.run_dates(name):
+            if (start and run_date < start) or (end and run_date > end):
+                continue
+            partition = self.directory / name / f"{PARTITION_PREFIX}{run_date:%Y-%m-%d}"
+            files.extend(str(path) for path in sorted(partition.glob("*.parquet")))
+        return files
+
+    def dataset(self, name: str, start: DateLike = None, end: DateLike = None) -> Optional["ds.Dataset"]:
+        """
+        Dataset Arrow (lazy) das execuções no período.
+
+        Partições fora do período nem são abertas. O schema é unificado
+        entre execuções (colunas novas aparecem como nulas nas antigas).
+
+        Returns:
+            pyarrow.dataset.Dataset, ou None se não houver snapshots
+        """
+        files = self._files(name, start, end)
+        if not files:
+            return None
+
+        schemas = [pq.read_schema(path) for path in files]  # Só lê o rodapé
+        try:
+            schema = pa.unify_schemas(schemas, promote_options="permissive")
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            logger.warning(f"⚠️ Snapshots de '{name}' com tipos incompatíveis: usando o schema mais recente")
+            schema = schemas[-1]
+        schema = schema.append(pa.field("run_date", pa.date32()))
+
+        return ds.dataset(
+            files,
+            schema=schema,
+            format="parquet",
+            partitioning=ds.partitioning(pa.schema([("run_date", pa.date32())]), flavor="hive"),
+            partition_base_dir=str(self.directory / name),
+        )
+
+    @staticmethod
+    def _expression(filters):
+        """Aceita uma expressão pyarrow ou filtros no formato [(col, op, valor), ...]."""
+        if filters is None or isinstance(filters, ds.Expression):
+            return filters
+        return pq.filters_to_expression(filters)
+
+    def scan(self, name: str, start: DateLike = None, end: DateLike = None,
+             columns: Optional[List[str]] = None, filters=None,
+             batch_size: int = 65_536) -> Iterator[pd.DataFrame]:
+        """
+        Lê o período em lotes, sem carregar tudo em memória.
+
+        Args:
+            name: Nome do dataset
+            start: Primeira data de execução (inclusiva)
+            end: Última data de execução (inclusiva)
+            columns: Colunas a ler (projeção; None = todas)
+            filters: Expressão pyarrow ou [(col, op, valor), ...]
+            batch_size: Linhas máximas por lote
+
+        Yields:
+            DataFrames com até batch_size linhas
+        """
+        dataset = self.dataset(name, start, end)
+        if dataset is None:
+            return
+
+        scanner = dataset.scanner(columns=columns, filter=self._expression(filters), batch_size=batch_size)
+        for batch in scanner.to_batches():
+            if batch.num_rows:
+                yield batch.to_pandas()
+
+    def read(self, name: str, start: DateLike = None, end: DateLike = None,
+             columns: Optional[List[str]] = None, filters=None) -> pd.DataFrame:
+        """
+        Lê o período inteiro em um DataFrame.
+
+        Mesmos argumentos de scan (projeção e filtros aplicados na leitura).
+        """
+        dataset = self.dataset(name, start, end)
+        if dataset is None:
+            return pd.DataFrame(columns=columns or [])
+        return dataset.to_table(columns=columns, filter=self._expression(filters)).to_pandas()
+
+
+def save_run_snapshots(config, frames: Dict[str, pd.DataFrame], run_at: datetime) -> Dict[str, Path]:
+    """
+    Grava os snapshots da execução (se SNAPSHOT_DIR estiver configurado).
+
+    Falhas não interrompem o ETL: apenas geram um aviso.
+
+    Args:
+        config: Configurações do ETL
+        frames: Dict nome -> DataFrame
+        run_at: Momento da execução
+
+    Returns:
+        Dict nome -> arquivo gravado
+    """
+    if not config.snapshot_dir:
+        return {}
+
+    try:
+        store = SnapshotStore(config.snapshot_dir, config.snapshot_compression)
+        written = store.write_run(frames, run_at)
+    except ImportError as e:
+        logger.warning(f"⚠️ Snapshots desativados: {e}")
+        return {}
+    except Exception as e:
+        logger.warning(f"⚠️ Não foi possível gravar os snapshots: {e}")
+        return {}
+
+    total_mb = sum(path.stat().st_size for path in written.values()) / 1024 / 1024
+    logger.info(f"🗂️ Snapshots Parquet: {len(written)} datasets em {config.snapshot_dir} ({total_mb:.1f} MB)")
+    return written
@@ -0,0 +1,253 @@
+"""
+Estado local da extração incremental.
+
+Guarda, em SQLite, o último preview (/backend/plan/preview) de cada plano
+e as últimas métricas (getPlannerAnalytics) de cada post publicado. Com
+isso, execuções seguintes pulam o preview de planos já conhecidos e só
+atualizam os analytics de posts cuja política de refresh venceu:
+
+    48h:1h,30d:1d,*:7d  ->  de hora em hora nas primeiras 48h,
+                            diário até 30 dias, semanal depois disso.
+"""
+
+import hashlib
+import json
+import logging
+import re
+import sqlite3
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional, Tuple
+
+from .database import SQLiteDatabase
+
+logger = logging.getLogger("mycreator_etl")
+
+_DURATION_UNITS = {"m": "minutes", "h": "hours", "d": "days", "w": "weeks"}
+
+
+def parse_duration(text: str) -> timedelta:
+    """
+    Converte durações curtas em timedelta.
+
+    Args:
+        text: Ex: "30m", "1h", "48h", "30d", "1w"
+
+    Returns:
+        timedelta correspondente
+    """
+    match = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*([mhdw])\s*", text or "")
+    if not match:
+        raise ValueError(f"❌ Duração inválida: {text!r} (use ex: 30m, 1h, 30d, 1w)")
+    value, unit = match.groups()
+    return timedelta(**{_DURATION_UNITS[unit]: float(value)})
+
+
+def parse_datetime(value) -> Optional[datetime]:
+    """Interpreta datas da API (ISO ou 'YYYY-MM-DD HH:MM:SS'); naive = UTC."""
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(str(value).strip().replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+class RefreshPolicy:
+    """
+    Política de refresh dos analytics por idade do post.
+
+    Formato: "idade:intervalo" separados por vírgula, em ordem crescente
+    de idade; "*" representa qualquer idade acima da última faixa.
+    """
+
+    def __init__(self, tiers: List[Tuple[Optional[timedelta], timedelta]]):
+        """
+        Args:
+            tiers: Lista de (idade máxima ou None, intervalo de refresh)
+        """
+        self.tiers = tiers
+
+    @classmethod
+    def parse(cls, spec: str) -> "RefreshPolicy":
+        """Cria a política a partir de uma string (ex: "48h:1h,30d:1d,*:7d")."""
+        tiers = []
+        for part in (spec or "").split(","):
+            if not part.strip():
+                continue
+            age, _, interval = part.partition(":")
+            max_age = None if age.strip() == "*" else parse_duration(age)
+            tiers.append((max_age, parse_duration(interval)))
+
+        if not tiers:
+            raise ValueError("❌ REFRESH_POLICY vazia")
+        return cls(tiers)
+
+    def interval_for(self, age: timedelta) -> timedelta:
+        """Intervalo de refresh para um post com a idade informada."""
+        for max_age, interval in self.tiers:
+            if max_age is None or age <= max_age:
+                return interval
+        return self.tiers[-1][1]
+
+    def is_due(self, published_at, last_fetched_at: Optional[datetime], now: datetime = None) -> bool:
+        """
+        Indica se os analytics de um post devem ser buscados de novo.
+
+        Args:
+            published_at: Data de publicação (string da API ou datetime)
+            last_fetched_at: Última busca de analytics (None = nunca)
+            now: Momento de referência (padrão: agora, UTC)
+        """
+        if last_fetched_at is None:
+            return True
+
+        now = now or datetime.now(timezone.utc)
+        published = published_at if isinstance(published_at, datetime) else parse_datetime(published_at)
+        if published is None:
+            # Sem data de publicação: trata como post novo (refresh mais frequente)
+            return now - last_fetched_at >= self.tiers[0][1]
+
+        return now - last_fetched_at >= self.interval_for(now - published)
+
+
+def preview_hash(details: dict) -> str:
+    """Hash estável (JSON canônico) de uma resposta de preview."""
+    canonical = json.dumps(details, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class PostStateStore(SQLiteDatabase):
+    """
+    Estado de planos e posts já extraídos (SQLite local).
+
+    Tabelas:
+    - plan_state: último preview de cada plano (JSON + hash)
+    - post_state: últimas métricas cruas de cada post (por posted_id)
+    """
+
+    def __init__(self, db_path: str, policy: RefreshPolicy, preview_max_age: timedelta):
+        """
+        Inicializa o store.
+
+        Args:
+            db_path: Caminho do arquivo SQLite
+            policy: Política de refresh dos analytics
+            preview_max_age: Idade máxima de um preview antes de revalidar
+        """
+        super().__init__(db_path)
+        self.policy = policy
+        self.preview_max_age = preview_max_age
+        self._lock = threading.Lock()
+
+    def connect(self):
+        """Conecta (compartilhado entre as threads do extrator) e cria as tabelas."""
+        try:
+            self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            self.conn.executescript("""
+                CREATE TABLE IF NOT EXISTS plan_state (
+                    plan_id      TEXT PRIMARY KEY,
+                    workspace_id TEXT,
+                    preview_hash TEXT,
+                    details_json TEXT,
+                    previewed_at TEXT
+                );
+                CREATE TABLE IF NOT EXISTS post_state (
+                    posted_id    TEXT PRIMARY KEY,
+                    plan_id      TEXT,
+                    workspace_id TEXT,
+                    published_at TEXT,
+                    metrics_json TEXT,
+                    analytics_at TEXT
+                );
+            """)
+            logger.info(f"🗄️ Estado incremental: {self.db_path}")
+        except Exception as e:
+            logger.error(f"❌ Erro ao abrir estado incremental: {e}")
+            raise
+
+    def _execute(self, sql: str, params: tuple = ()) -> list:
+        with self._lock:
+            if not self.conn:
+                self.connect()
+            cursor = self.conn.execute(sql, params)
+            rows = cursor.fetchall()
+            self.conn.commit()
+            return rows
+
+    # =========================================================================
+    # PREVIEWS
+    # =========================================================================
+    def cached_details(self, plan_id: str, now: datetime = None) -> Optional[dict]:
+        """
+        Retorna o preview salvo de um plano, se ainda estiver válido.
+
+        Args:
+            plan_id: ID interno do plano
+            now: Momento de referência (padrão: agora, UTC)
+
+        Returns:
+            dict do preview, ou None se desconhecido/expirado
+        """
+        rows = self._execute(
+            "SELECT details_json, previewed_at FROM plan_state WHERE plan_id = ?", (plan_id,)
+        )
+        if not rows:
+            return None
+
+        details_json, previewed_at = rows[0]
+        now = now or datetime.now(timezone.utc)
+        previewed = parse_datetime(previewed_at)
+        if previewed is None or now - previewed > self.preview_max_age:
+            return None
+        return json.loads(details_json)
+
+    def save_details(self, plan_id: str, workspace_id: str, details: dict) -> bool:
+        """
+        Salva o preview de um plano.
+
+        Returns:
+            bool: True se o conteúdo mudou em relação ao salvo (ou é novo)
+        """
+        new_hash = preview_hash(details)
+        rows = self._execute("SELECT preview_hash FROM plan_state WHERE plan_id = ?", (plan_id,))
+        changed = not rows or rows[0][0] != new_hash
+
+        self._execute(
+            "INSERT OR REPLACE INTO plan_state VALUES (?, ?, ?, ?, ?)",
+            (plan_id, workspace_id, new_hash, json.dumps(details, ensure_ascii=False),
+             datetime.now(timezone.utc).isoformat())
+        )
+        return changed
+
+    # =========================================================================
+    # ANALYTICS
+    # =========================================================================
+    def cached_analytics(self, posted_id: str, published_at, now: datetime = None):
+        """
+        Retorna as métricas salvas de um post, se o refresh ainda não venceu.
+
+        Returns:
+            Resposta crua de analytics salva, ou None se deve buscar de novo
+        """
+        rows = self._execute(
+            "SELECT metrics_json, analytics_at FROM post_state WHERE posted_id = ?", (str(posted_id),)
+        )
+        if not rows:
+            return None
+
+        metrics_json, analytics_at = rows[0]
+        if self.policy.is_due(published_at, parse_datetime(analytics_at), now):
+            return None
+        return json.loads(metrics_json)
+
+    def save_analytics(self, posted_id: str, plan_id: str, workspace_id: str, published_at, analytics):
+        """Salva a resposta crua de analytics de um post."""
+        self._execute(
+            "INSERT OR REPLACE INTO post_state VALUES (?, ?, ?, ?, ?, ?)",
+            (str(posted_id), plan_id, workspace_id, str(published_at or ""),
+             json.dumps(analytics, ensure_ascii=False), datetime.now(timezone.utc).isoformat())
+        )
@@ -0,0 +1,256 @@
+"""
+Pipeline de transformação em streaming (lotes de PostData).
+
+O fluxo padrão materializa tudo de uma vez: lista de PostData -> lista de
+dicts (asdict) -> DataFrame. Em backfills grandes o pico de memória soma
+as três cópias. Aqui o extrator entrega um lote por página da listagem
+(MyCreatorExtractor.iter_post_batches), cada lote vira um DataFrame
+colunar na hora e é anexado aos sinks (Parquet, SQLite, Sheets), então a
+memória fica limitada a um lote.
+
+As transformações por lote (posts_to_frame, drop_failed_posts,
+to_dados_brutos) são as mesmas do run_etl.py.
+"""
+
+import logging
+import time
+from datetime import datetime
+from typing import Dict, Iterable, List, Tuple
+
+import pandas as pd
+
+from .database import SQLiteDatabase
+from .extract import PostData
+from .metrics import peak_rss_mb
+
+logger = logging.getLogger("mycreator_etl")
+
+# PostData -> colunas da aba de dados brutos (snake_case, em português)
+POSTS_COLUMN_MAPPING = {
+    # IDENTIFICAÇÃO
+    "workspace_name": "cidade",
+    "published_at": "data_publicacao",
+    "platform": "rede_social",
+    "profile_name": "perfil",
+    "follower_count": "seguidores",
+    "post_type": "formato",
+    "media_type": "tipo_midia",
+
+    # CONTEÚDO
+    "title": "titulo",
+    "caption": "legenda",
+
+    # ENGAJAMENTO
+    "likes": "curtidas",
+    "comments": "comentarios",
+    "saves": "salvos",
+    "shares": "compartilhamentos",
+    "engagement_rate": "taxa_engajamento",
+
+    # PERFORMANCE
+    "reach": "alcance",
+    "reach_rate": "taxa_alcance",
+
+    # TÉCNICO
+    "permalink": "link",
+    "external_id": "id_instagram",
+    "internal_id": "id_interno",
+    "analytics_error": "status_dados",
+    "extraction_timestamp": "timestamp",
+}
+
+
+# =============================================================================
+# TRANSFORMAÇÕES POR LOTE
+# =============================================================================
+def posts_to_frame(posts: Iterable[PostData]) -> pd.DataFrame:
+    """
+    Converte PostData em DataFrame coluna a coluna (PostData.to_columns).
+
+    Returns:
+        DataFrame com uma coluna por campo de PostData (mesmo se vazio)
+    """
+    return pd.DataFrame(PostData.to_columns(posts))
+
+
+def drop_failed_posts(df_posts: pd.DataFrame) -> Tuple[pd.DataFrame, int]:
+    """
+    Remove agendamentos falhos: posts que a API retorna como 'published',
+    mas sem link ou id externo (falharam na prática).
+
+    Returns:
+        tuple: (DataFrame filtrado, quantidade removida)
+    """
+    if df_posts.empty:
+        return df_posts, 0
+
+    valid = df_posts["permalink"].astype(str).str.strip().astype(bool) & df_posts["external_id"].notna()
+    return df_posts[valid].copy(), int((~valid).sum())
+
+
+def to_dados_brutos(df_posts: pd.DataFrame) -> pd.DataFrame:
+    """
+    Seleciona e renomeia as colunas da aba de dados brutos.
+
+    A ordenação (cidade, data) fica a cargo de quem tem o conjunto
+    completo; no streaming os lotes saem na ordem da extração.
+    """
+    df_posts = df_posts.copy()
+
+    # Garante que as colunas existam antes do mapeamento para evitar erros
+    for col in ["reach", "engagement_rate", "reach_rate", "follower_count"]:
+        if col not in df_posts.columns:
+            df_posts[col] = 0
+
+    # Seleciona e renomeia colunas (preserva a ordem do mapeamento)
+    columns_to_export = [col for col in POSTS_COLUMN_MAPPING if col in df_posts.columns]
+    df_final = df_posts[columns_to_export].rename(columns=POSTS_COLUMN_MAPPING)
+
+    # Formata Data de Publicação apenas como data (DD/MM/YYYY)
+    if "data_publicacao" in df_final.columns:
+        df_final["data_publicacao"] = pd.to_datetime(
+            df_final["data_publicacao"], errors="coerce"
+        ).dt.strftime("%d/%m/%Y")
+
+    return df_final
+
+
+# =============================================================================
+# SINKS
+# =============================================================================
+class ParquetSink:
+    """Anexa cada lote como um arquivo Parquet do snapshot da execução."""
+
+    def __init__(self, store, name: str, run_at: datetime, frame: str = "posts"):
+        """
+        Args:
+            store: SnapshotStore de destino
+            name: Nome do dataset
+            run_at: Momento da execução (partição)
+            frame: Qual DataFrame do lote gravar ("posts" ou "dados_brutos")
+        """
+        self.store = store
+        self.name = name
+        self.run_at = run_at
+        self.frame = frame
+        self._part = 0
+
+    def write(self, frames: Dict[str, pd.DataFrame]):
+        self.store.write(self.name, frames[self.frame], self.run_at, part=self._part)
+        self._part += 1
+
+    def close(self):
+        pass
+
+
+class SQLiteSink:
+    """Anexa cada lote a uma tabela SQLite (recriada no primeiro lote)."""
+
+    def __init__(self, db_path: str, table_name: str, frame: str = "dados_brutos"):
+        self.db = SQLiteDatabase(db_path)
+        self.table_name = table_name
+        self.frame = frame
+        self._first = True
+
+    def write(self, frames: Dict[str, pd.DataFrame]):
+        if not self.db.conn:
+            self.db.connect()
+
+        if_exists = "replace" if self._first else "append"
+        frames[self.frame].to_sql(self.table_name, self.db.conn, if_exists=if_exists, index=False)
+        self.db.conn.commit()
+        self._first = False
+
+    def close(self):
+        self.db.close()
+
+
+class SheetsSink:
+    """
+    Anexa cada lote a uma aba do Google Sheets.
+
+    O primeiro lote sobrescreve a aba (header + limpeza das linhas
+    antigas); os seguintes só adicionam linhas, sem reler a aba. O total
+    de linhas gravadas é acompanhado para o append retomar sem duplicar.
+    """
+
+    def __init__(self, session, tab_name: str, frame: str = "dados_brutos"):
+        """
+        Args:
+            session: SheetsSession (src.load.get_sheets_session)
+            tab_name: Aba de destino
+            frame: Qual DataFrame do lote gravar
+        """
+        self.loader = session.loader(tab_name)
+        if self.loader is None:
+            raise RuntimeError(f"Não foi possível abrir a aba '{tab_name}'")
+        self.tab_name = tab_name
+        self.frame = frame
+        self._rows = None  # Linhas na aba (header incluído); None = nada gravado
+
+    def write(self, frames: Dict[str, pd.DataFrame]):
+        df = frames[self.frame]
+        if df.empty:
+            return
+        if self._rows is None:
+            ok = self.loader.load(df, write_mode="overwrite")
+            rows = len(df) + 1
+        else:
+            ok = self.loader.append_rows(df, existing_rows=self._rows)
+            rows = self._rows + len(df)
+        if not ok:
+            raise RuntimeError(f"Falha ao gravar lote na aba '{self.tab_name}'")
+        self._rows = rows
+
+    def close(self):
+        pass
+
+
+# =============================================================================
+# PIPELINE
+# =============================================================================
+class StreamingPipeline:
+    """Transforma lotes de PostData e anexa o resultado a cada sink."""
+
+    def __init__(self, sinks: List):
+        self.sinks = sinks
+
+    def run(self, batches: Iterable[List[PostData]]) -> dict:
+        """
+        Consome os lotes até o fim.
+
+        Args:
+            batches: Iterável de listas de PostData (ex: iter_post_batches)
+
+        Returns:
+            Dict com batches, posts, removed (agendamentos falhos),
+            seconds e peak_rss_mb
+        """
+        stats = {"batches": 0, "posts": 0, "removed": 0}
+        start = time.perf_counter()
+
+        try:
+            for batch in batches:
+                df_posts, removed = drop_failed_posts(posts_to_frame(batch))
+                stats["removed"] += removed
+                if df_posts.empty:
+                    continue
+
+                frames = {"posts": df_posts, "dados_brutos": to_dados_brutos(df_posts)}
+                for sink in self.sinks:
+                    sink.write(frames)
+
+                stats["batches"] += 1
+                stats["posts"] += len(df_posts)
+                peak = peak_rss_mb()
+                logger.info(
+                    f"🌊 Lote {stats['batches']}: {len(df_posts)} posts "
+                    f"(total {stats['posts']:,}{f' | pico {peak:.0f} MB' if peak else ''})"
+                )
+        finally:
+            for sink in self.sinks:
+                sink.close()
+
+        stats["seconds"] = round(time.perf_counter() - start, 2)
+        stats["peak_rss_mb"] = peak_rss_mb()
+        return stats
@@ -0,0 +1,243 @@
+"""
+Etapa única de getSummary (/backend/analytics/overview/getSummary).
+
+Seguidores por post (fetch_workspace_follower_counts) e a aba de perfis
+(extract_profiles) usam o mesmo payload de 30 dias por conta. Aqui o
+resumo de cada conta é buscado uma única vez por execução e guardado em
+um índice por (workspace_id, platform_identifier), de onde saem tanto
+o mapa de seguidores quanto as linhas de ProfileData.
+"""
+
+import logging
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger("mycreator_etl")
+
+SUMMARY_ENDPOINT = "/backend/analytics/overview/getSummary"
+
+# Chave do índice: (workspace_id, platform_identifier)
+SummaryKey = Tuple[str, str]
+
+
+@dataclass
+class AccountSummary:
+    """Resumo de 30 dias de uma conta Instagram."""
+    workspace_id: str
+    platform_identifier: str
+    name: str
+    ok: bool = False  # True se o getSummary respondeu 200
+    summary: dict = field(default_factory=dict)
+
+    @property
+    def followers(self) -> int:
+        return self.summary.get("followers", 0)
+
+
+class SummaryIndex:
+    """
+    Índice de resumos por (workspace_id, platform_identifier).
+
+    Cada workspace é coletado sob demanda, uma única vez por execução,
+    mesmo com várias threads pedindo ao mesmo tempo.
+    """
+
+    def __init__(self, extractor, batch_size: int = 1, days: int = 30):
+        """
+        Inicializa o índice.
+
+        Args:
+            extractor: MyCreatorExtractor (requisições e registro de contas)
+            batch_size: Contas por chamada de getSummary (1 = uma por conta)
+            days: Janela do resumo em dias
+        """
+        self.extractor = extractor
+        self.batch_size = max(1, batch_size)
+
+        now = datetime.now(timezone(timedelta(hours=-3)))
+        start_date = (now - timedelta(days=days)).strftime("%Y-%m-%d")
+        self.date_range = f"{start_date} - {now.strftime('%Y-%m-%d')}"
+
+        self._entries: Dict[SummaryKey, AccountSummary] = {}
+        self._order: Dict[str, List[str]] = {}  # workspace -> ids na ordem da API
+        self._lock = threading.Lock()
+        self._workspace_locks: Dict[str, threading.Lock] = {}
+
+    # =========================================================================
+    # CONSULTA
+    # =========================================================================
+    def get(self, workspace_id: str, platform_identifier: str) -> Optional[AccountSummary]:
+        """Retorna o resumo de uma conta (coletando o workspace se necessário)."""
+        self.ensure(workspace_id)
+        return self._entries.get((workspace_id, str(platform_identifier)))
+
+    def workspace_summaries(self, workspace_id: str) -> List[AccountSummary]:
+        """Resumos de um workspace, na ordem retornada pelo fetchSocialAccounts."""
+        self.ensure(workspace_id)
+        return [self._entries[(workspace_id, ig_id)] for ig_id in self._order.get(workspace_id, [])]
+
+    def follower_map(self, workspace_id: str) -> dict:
+        """
+        Mapa de seguidores das contas ativas do workspace.
+
+        Returns:
+            Dict mapeando platform_identifier (str) -> {'followers': int, 'name': str}
+        """
+        return {
+            entry.platform_identifier: {"followers": entry.followers, "name": entry.name}
+            for entry in self.workspace_summaries(workspace_id)
+            if entry.ok
+        }
+
+    def profiles(self, workspace_id: str, workspace_name: str, extraction_ts: str) -> list:
+        """
+        Linhas de ProfileData do workspace (aba de perfis).
+
+        Returns:
+            Lista de ProfileData (métricas zeradas se o getSummary falhou)
+        """
+        from .extract import ProfileData
+
+        rows = []
+        for entry in self.workspace_summaries(workspace_id):
+            summary = entry.summary
+            rows.append(ProfileData(
+                workspace_name=workspace_name,
+                workspace_id=workspace_id,
+                profile_name=entry.name,
+                platform_id=entry.platform_identifier,
+                platform="Instagram",
+                followers=summary.get("followers", 0),
+                posts_count=summary.get("posts", 0),
+                engagement_total=summary.get("engagement", 0),
+                engagement_rate=summary.get("engagement_rate", 0.0),
+                reach_total=summary.get("reach", 0.0),
+                impressions_total=summary.get("impressions", 0.0),
+                extraction_timestamp=extraction_ts
+            ))
+        return rows
+
+    # =========================================================================
+    # COLETA
+    # =========================================================================
+    def ensure(self, workspace_id: str):
+        """Coleta os resumos do workspace, se ainda não coletados."""
+        if workspace_id in self._order:
+            return
+
+        with self._lock:
+            ws_lock = self._workspace_locks.setdefault(workspace_id, threading.Lock())
+
+        with ws_lock:
+            if workspace_id in self._order:
+                return
+            self._collect(workspace_id)
+
+    def _collect(self, workspace_id: str):
+        """Busca os resumos de todas as contas Instagram de um workspace."""
+        accounts = []
+        for acc in self.extractor.accounts.instagram_accounts(workspace_id):
+            ig_id = str(acc.get("platform_identifier") or acc.get("instagram_id") or "")
+            if ig_id:
+                accounts.append((ig_id, acc.get("name", "Unknown")))
+
+        for start in range(0, len(accounts), self.batch_size):
+            chunk = accounts[start:start + self.batch_size]
+            summaries = self._fetch_many([ig_id for ig_id, _ in chunk], workspace_id) if len(chunk) > 1 else {}
+
+            for ig_id, name in chunk:
+                if ig_id in summaries:
+                    entry = AccountSummary(workspace_id, ig_id, name, ok=True, summary=summaries[ig_id])
+                else:
+                    entry = self._fetch_one(workspace_id, ig_id, name)
+                if entry is not None:
+                    self._entries[(workspace_id, ig_id)] = entry
+                    logger.info(f"   👤 {entry.name}: {entry.followers:,} seguidores")
+
+        self._order[workspace_id] = [ig_id for ig_id, _ in accounts if (workspace_id, ig_id) in self._entries]
+
+    def _payload(self, workspace_id: str, ig_ids: List[str]) -> dict:
+        """Monta o payload do getSummary para uma ou mais contas Instagram."""
+        return {
+            "workspace_id": workspace_id,
+            "date": self.date_range,
+            "timezone": "America/Sao_Paulo",
+            "facebook_accounts": [],
+            "instagram_accounts": ig_ids,
+            "linkedin_accounts": [],
+            "tiktok_accounts": [],
+            "youtube_accounts": [],
+            "pinterest_accounts": [],
+            "twitter_accounts": [],
+            "gmb_accounts": [],
+            "tumblr_accounts": []
+        }
+
+    def _post(self, workspace_id: str, ig_ids: List[str]):
+        return self.extractor._handle_401_and_retry(
+            "post",
+            f"{self.extractor.config.base_url}{SUMMARY_ENDPOINT}",
+            json=self._payload(workspace_id, ig_ids),
+            timeout=10
+        )
+
+    def _fetch_one(self, workspace_id: str, ig_id: str, name: str) -> Optional[AccountSummary]:
+        """
+        Busca o resumo de uma conta.
+
+        Returns:
+            AccountSummary (ok=False se status != 200) ou None se a requisição falhou
+        """
+        try:
+            resp = self._post(workspace_id, [ig_id])
+            if resp.status_code == 200:
+                return AccountSummary(workspace_id, ig_id, name, ok=True, summary=resp.json().get("summary", {}))
+
+            logger.warning(f"   ⚠️ getSummary para {name}: {resp.status_code}")
+            return AccountSummary(workspace_id, ig_id, name, ok=False)
+        except Exception as e:
+            logger.warning(f"   ⚠️ Erro getSummary {name}: {e}")
+            return None
+
+    def _fetch_many(self, ig_ids: List[str], workspace_id: str) -> Dict[str, dict]:
+        """
+        Busca resumos de várias contas em uma chamada.
+
+        Só aproveita a resposta se ela vier separada por conta (dict indexado
+        pelo ID ou lista com o ID de cada conta); um resumo agregado não tem
+        como ser dividido, e as contas caem no fallback individual.
+
+        Returns:
+            Dict mapeando platform_identifier -> summary das contas identificadas
+        """
+        try:
+            resp = self._post(workspace_id, ig_ids)
+            if resp.status_code != 200:
+                return {}
+            data = resp.json()
+        except Exception as e:
+            logger.debug(f"getSummary em lote falhou ({len(ig_ids)} contas): {e}")
+            return {}
+
+        wanted = set(ig_ids)
+        found: Dict[str, dict] = {}
+        containers = [data.get("accounts"), data.get("summary")] if isinstance(data, dict) else [data]
+
+        for container in containers:
+            if isinstance(container, dict):
+                for key, value in container.items():
+                    if str(key) in wanted and isinstance(value, dict):
+                        found[str(key)] = value.get("summary", value)
+            elif isinstance(container, list):
+                for item in container:
+                    if not isinstance(item, dict):
+                        continue
+                    for id_key in ("platform_identifier", "instagram_id", "account_id", "id"):
+                        item_id = str(item.get(id_key) or "")
+                        if item_id in wanted:
+                            found[item_id] = item.get("summary", item)
+                            break
+
+        return found
@@ -31,15 +31,10 @@ def run_sync():
         
         try:
             # 2. Buscar contas sociais do workspace para pegar o account_id
-            url_accounts = f"{config.base_url}/backend/fetchSocialAccounts"
-            payload_accounts = {"workspace_id": ws_id}
-            
-            resp_accounts = extractor._handle_401_and_retry("post", url_accounts, json=payload_accounts, timeout=15)
-            if resp_accounts.status_code != 200:
-                logger.warning(f"⚠️ Falha ao buscar contas para {ws_name}: {resp_accounts.status_code}")
+            social_data = extractor.accounts.get(ws_id)
+            if social_data is None:
+                logger.warning(f"⚠️ Falha ao buscar contas para {ws_name}")
                 continue
-                
-            social_data = resp_accounts.json()
             
             # Contas do Instagram
             ig_data = social_data.get("instagram", {})
@@ -73,7 +68,8 @@ def run_sync():
                 
                 logger.info(f"   🔄 Disparando sync para {account_name} ({platform})...")
                 
-                resp_sync = extractor._handle_401_and_retry("post", url_sync, json=payload_sync, timeout=15)
+                # Dispara um job: sem retentativa em 5xx/timeout (poderia disparar o job de novo)
+                resp_sync = extractor._handle_401_and_retry("post", url_sync, json=payload_sync, timeout=15, retry=False)
                 
                 if resp_sync.status_code == 200:
                     try:
@@ -0,0 +1,772 @@
+"""
+API MyCreator sintética (harness offline, benchmarks e testes de carga).
+
+Responde aos endpoints usados pelo extrator com payloads no formato da
+API real: fetchSocialAccounts, fetchPlans (posts e stories),
+plan/preview (posting[], common_sharing_details, stories),
+getPlannerAnalytics, getSummary, instagram/audience_growth,
+instagram/top_posts e login.
+
+Tudo é derivado da semente e dos índices codificados nos IDs
+(workspace, post), sem guardar nada em memória: o mesmo post sempre
+gera o mesmo preview e as mesmas métricas, e o volume simulado (milhões
+de posts) não é limitado pela RAM.
+
+Distribuições:
+- Legendas: abertura + bairro + 0 a 3 características + chamada,
+  com emojis e quebras de linha
+- Hashtags: vocabulário com cauda longa (tags gerais, da cidade e dos
+  bairros) sorteado por Zipf, com variações de caixa e acento
+  (#Imóveis / #imoveis) e tags repetidas na mesma legenda
+- Métricas: seguidores e alcance log-normais, ~1% de posts virais,
+  reels com mais alcance, posts das últimas horas ainda amadurecendo
+  e ~2% de posts sem analytics
+- Publicações: reels compartilhados em stories, posts também
+  publicados no Facebook e postings de contas removidas (filtradas
+  pelo extrator)
+
+Chamadas com vários IDs (all_post_ids no getPlannerAnalytics, várias
+contas no getSummary) respondem um único objeto agregado, formato que o
+extrator já lê. A resposta separada por ID (per_id_batches=True) é
+hipotética: nunca foi vista na API real, então ganhos medidos com ela
+não valem como ganhos reais.
+
+Uso:
+- replay.serve_http(SyntheticAPI(...)): responde dentro do processo
+- SyntheticServer: servidor HTTP local (MYCREATOR_BASE_URL)
+- SyntheticAPI.dump: grava os payloads em JSONL (gzip se .gz)
+"""
+
+import bisect
+import gzip
+import itertools
+import json
+import logging
+import math
+import random
+import threading
+import time
+import unicodedata
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Iterator, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlparse
+
+from .replay import ReplayResponse
+
+logger = logging.getLogger("mycreator_etl")
+
+TZ_BRASILIA = timezone(timedelta(hours=-3))
+DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+CITY_NAMES = [
+    "Florianópolis", "Curitiba", "Goiânia", "Campinas", "Porto Alegre",
+    "Belo Horizonte", "Brasília", "Salvador", "Recife", "Fortaleza",
+]
+
+NEIGHBORHOODS = [
+    "Centro", "Jardim Botânico", "Água Verde", "Batel", "Ecoville", "Bigorrilho",
+    "Setor Bueno", "Setor Marista", "Cambuí", "Moinhos de Vento", "Savassi",
+    "Asa Sul", "Barra", "Boa Viagem", "Meireles", "Aldeota", "Jurerê",
+    "Campeche", "Trindade", "Itacorubi", "Lagoa da Conceição", "Coqueiros",
+    "Estreito", "Santa Mônica", "Pituba", "Cabral", "Mercês", "Petrópolis",
+]
+
+# Hashtags gerais, da mais para a menos usada (o ranking define o peso Zipf)
+BASE_HASHTAGS = [
+    "imóveis", "myside", "apartamento", "casa", "imobiliária", "corretordeimóveis",
+    "lançamento", "decoração", "arquitetura", "investimento", "casapropria",
+    "vendas", "aluguel", "morarbem", "financiamento", "cobertura", "studio",
+    "altopadrão", "minhacasaminhavida", "imóvelnovo", "construção", "interiores",
+    "vistamar", "condomínio", "lazer", "planta", "reforma", "mercadoimobiliário",
+    "dicasdeimóveis", "primeiroimóvel", "garden", "loft", "terreno", "permuta",
+    "sustentabilidade", "homeoffice", "petfriendly", "varandagourmet", "suíte",
+    "piscina", "academia", "coworking", "smarthome", "obraspronta",
+]
+CITY_HASHTAGS = ["imóveis{city}", "{city}", "apartamento{city}", "lançamento{city}", "vivaem{city}"]
+NEIGHBORHOOD_HASHTAGS = ["{bairro}", "imóveis{bairro}", "apartamento{bairro}"]
+ZIPF_EXPONENT = 1.1
+
+OPENINGS = [
+    "Conheça o novo lançamento em {bairro}!",
+    "Oportunidade única em {bairro} 🏡",
+    "Seu próximo endereço pode ser em {bairro}.",
+    "Acabou de chegar: apartamento em {bairro} ✨",
+    "Já imaginou morar em {bairro}?",
+    "Últimas unidades em {bairro} 🔑",
+    "Tour pelo decorado em {bairro} 🎥",
+    "Dica da semana para quem quer comprar em {city}",
+]
+FEATURES = [
+    "{rooms} quartos ({suites} com suíte).",
+    "{area} m² privativos com varanda gourmet.",
+    "Vista definitiva e sol da manhã ☀️",
+    "Condomínio com piscina, academia e coworking.",
+    "{vagas} vagas de garagem e depósito privativo.",
+    "Entrega prevista para {year}.",
+    "Aceita permuta e financiamento bancário.",
+    "Pertinho de escolas, mercados e parques 🌳",
+    "Acabamento de alto padrão e automação residencial.",
+]
+CALLS_TO_ACTION = [
+    "Fale com a gente pelo link da bio! 📲",
+    "Agende sua visita 👉 link na bio",
+    "Comente QUERO que enviamos os detalhes 💬",
+    "Salve este post para não esquecer 📌",
+    "",
+]
+EMOJIS = ["🏡", "✨", "🔑", "📍", "💙", "🏢", "🌅", "🛋️", "📲", "🔥"]
+
+# Tipos de ID (primeiro dígito hexadecimal do _id; 9 - tipo no media_id)
+POST_KIND, STORY_KIND, SHARED_STORY_KIND, FACEBOOK_KIND = 0, 1, 2, 3
+
+# Um post a cada POST_INTERVAL, do mais novo (índice 0) para o mais antigo
+POST_INTERVAL = timedelta(hours=6)
+
+# Stories publicados por post do feed (listagem com type=['story'])
+STORIES_RATIO = 0.1
+
+# Frequências das publicações
+POST_TYPES = [("FEED", "IMAGE", 0.45), ("REELS", "VIDEO", 0.35), ("CAROUSEL", "CAROUSEL_ALBUM", 0.20)]
+SHARED_TO_STORY_RATE = 0.2   # Reels também compartilhados em story
+FACEBOOK_RATE = 0.1          # Posts também publicados no Facebook
+GHOST_POSTING_RATE = 0.01    # Postings de contas removidas do workspace
+MISSING_ANALYTICS_RATE = 0.02
+VIRAL_RATE = 0.01
+
+# Alcance mediano (fração dos seguidores) e dispersão log-normal
+REACH_MEDIAN_RATIO = 0.3
+REACH_SIGMA = 0.8
+VIDEO_REACH_BOOST = 1.8
+MATURITY_HOURS = 72  # Posts mais novos ainda acumulam alcance
+
+# Seguidores por conta: log-normal (mediana ~8 mil)
+FOLLOWERS_MEDIAN = 8_000
+FOLLOWERS_SIGMA = 1.0
+
+# Posts mais recentes considerados pelo instagram/top_posts de cada conta
+TOP_POSTS_WINDOW = 200
+TOP_POSTS_LIMIT = 10
+
+
+def _slug(text: str) -> str:
+    """Texto sem espaços, em minúsculas (acentos preservados, como nas hashtags reais)."""
+    return text.lower().replace(" ", "")
+
+
+def _strip_accents(text: str) -> str:
+    return "".join(c for c in unicodedata.normalize("NFKD", text) if not unicodedata.combining(c))
+
+
+def _aggregate(items) -> dict:
+    """Soma os campos numéricos de vários itens (resposta única de uma chamada com vários IDs)."""
+    total = {}
+    for item in items:
+        for key, value in item.items():
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                total[key] = total.get(key, 0) + value
+    return total
+
+
+class SyntheticAPI:
+    """API MyCreator sintética para `cities` workspaces com `posts_per_city` posts."""
+
+    def __init__(self, cities: int = 1, posts_per_city: int = 50, accounts_per_city: int = 3,
+                 seed: int = 42, anchor: Optional[datetime] = None, per_id_batches: bool = False):
+        """
+        Args:
+            cities: Número de workspaces
+            posts_per_city: Posts publicados por workspace
+            accounts_per_city: Contas Instagram por workspace
+            seed: Semente (mesma semente = mesmas respostas)
+            anchor: Data do post mais recente (padrão: hoje, 12h de Brasília)
+            per_id_batches: Chamadas com vários IDs respondem um item por ID
+                (formato hipotético; padrão: um objeto agregado)
+        """
+        self.cities = cities
+        self.posts_per_city = posts_per_city
+        self.stories_per_city = int(posts_per_city * STORIES_RATIO)
+        self.accounts_per_city = accounts_per_city
+        self.seed = seed
+        self.per_id_batches = per_id_batches
+        self.anchor = anchor or datetime.now(TZ_BRASILIA).replace(hour=12, minute=0, second=0, microsecond=0)
+
+        self._post_types = [(post_type, media_type) for post_type, media_type, _ in POST_TYPES]
+        self._post_type_weights = list(itertools.accumulate(weight for _, _, weight in POST_TYPES))
+        self._vocabularies = {}  # ws -> (hashtags, pesos acumulados)
+        self._vocabulary_lock = threading.Lock()
+
+        self._routes = {
+            "/backend/login": self._login,
+            "/backend/fetchSocialAccounts": self._social_accounts,
+            "/backend/fetchPlans": self._plans,
+            "/backend/plan/preview": self._preview,
+            "/backend/analytics/campaignLabelAnalytics/getPlannerAnalytics": self._analytics,
+            "/backend/analytics/overview/getSummary": self._summary,
+            "/backend/analytics/overview/instagram/audience_growth": self._audience_growth,
+            "/backend/analytics/overview/instagram/top_posts": self._top_posts,
+        }
+
+    # =========================================================================
+    # IDS
+    # =========================================================================
+    @property
+    def workspaces(self) -> List[dict]:
+        """Workspaces no formato de TARGET_WORKSPACES."""
+        return [{"id": self.workspace_id(i), "name": self.city_name(i)} for i in range(self.cities)]
+
+    def workspace_id(self, ws: int) -> str:
+        return f"{self.seed % 0xFFFF:04x}{ws:020x}"
+
+    def _workspace_index(self, workspace_id: str) -> Optional[int]:
+        try:
+            ws = int(str(workspace_id)[4:], 16)
+        except ValueError:
+            return None
+        return ws if 0 <= ws < self.cities and workspace_id == self.workspace_id(ws) else None
+
+    @staticmethod
+    def city_name(ws: int) -> str:
+        name = CITY_NAMES[ws % len(CITY_NAMES)]
+        return name if ws < len(CITY_NAMES) else f"{name} {ws // len(CITY_NAMES) + 1}"
+
+    @staticmethod
+    def plan_id(kind: int, ws: int, index: int) -> str:
+        return f"{kind:x}{ws:07x}{index:016x}"
+
+    @staticmethod
+    def media_id(kind: int, ws: int, index: int) -> str:
+        return f"17{9 - kind}{ws:05d}{index:09d}"
+
+    @staticmethod
+    def _parse_plan_id(plan_id: str) -> Optional[Tuple[int, int, int]]:
+        try:
+            return int(plan_id[0], 16), int(plan_id[1:8], 16), int(plan_id[8:], 16)
+        except (ValueError, TypeError, IndexError):
+            return None
+
+    @staticmethod
+    def _parse_media_id(media_id: str) -> Optional[Tuple[int, int, int]]:
+        media_id = str(media_id)
+        if len(media_id) != 17 or not media_id.isdigit() or not media_id.startswith("17"):
+            return None
+        return 9 - int(media_id[2]), int(media_id[3:8]), int(media_id[8:])
+
+    def account(self, ws: int, k: int) -> dict:
+        """Conta Instagram k do workspace (fetchSocialAccounts)."""
+        platform_identifier = str(17841400000000000 + ws * 1000 + k)
+        return {
+            "_id": f"acc{ws:06d}{k:03d}",
+            "platform_identifier": platform_identifier,
+            "name": f"myside.{_slug(self.city_name(ws))}.{k + 1}",
+            "platform": "instagram",
+        }
+
+    def _account_by_identifier(self, platform_identifier: str) -> Optional[Tuple[int, int]]:
+        offset = int(platform_identifier) - 17841400000000000 if str(platform_identifier).isdigit() else -1
+        ws, k = divmod(offset, 1000)
+        if offset < 0 or ws >= self.cities or k >= self.accounts_per_city:
+            return None
+        return ws, k
+
+    def _rng(self, *parts) -> random.Random:
+        return random.Random(":".join(str(p) for p in (self.seed,) + parts))
+
+    def created_at(self, kind: int, index: int) -> datetime:
+        interval = POST_INTERVAL / STORIES_RATIO if kind == STORY_KIND else POST_INTERVAL
+        return self.anchor - index * interval
+
+    # =========================================================================
+    # CONTEÚDO
+    # =========================================================================
+    def _vocabulary(self, ws: int) -> tuple:
+        """Hashtags do workspace (gerais + cidade + bairros) e pesos Zipf acumulados."""
+        with self._vocabulary_lock:
+            if ws not in self._vocabularies:
+                city = _slug(CITY_NAMES[ws % len(CITY_NAMES)])
+                tags = list(BASE_HASHTAGS)
+                tags[2:2] = [template.format(city=city) for template in CITY_HASHTAGS]
+                tags += [template.format(bairro=_slug(bairro))
+                         for bairro in NEIGHBORHOODS for template in NEIGHBORHOOD_HASHTAGS]
+                tags = list(dict.fromkeys(tags))
+                weights = itertools.accumulate(1 / rank ** ZIPF_EXPONENT for rank in range(1, len(tags) + 1))
+                self._vocabularies[ws] = (tags, list(weights))
+            return self._vocabularies[ws]
+
+    def _hashtags(self, rng: random.Random, ws: int) -> List[str]:
+        """Hashtags de uma legenda (Zipf, com variações de caixa/acento e repetições)."""
+        if rng.random() < 0.2:
+            return []
+        tags, cum_weights = self._vocabulary(ws)
+        count = min(1 + int(rng.expovariate(1 / 6)), 30)  # Limite do Instagram: 30
+        chosen = rng.choices(tags, cum_weights=cum_weights, k=count)
+
+        result = []
+        for tag in chosen:
+            roll = rng.random()
+            if roll < 0.3:
+                tag = _strip_accents(tag)
+            elif roll < 0.45:
+                tag = tag.capitalize()
+            elif roll < 0.5:
+                tag = tag.upper()
+            result.append(f"#{tag}")
+        return result
+
+    def caption(self, rng: random.Random, ws: int) -> str:
+        """Legenda de um post (texto + hashtags)."""
+        rooms = rng.randint(2, 4)
+        values = {
+            "bairro": rng.choice(NEIGHBORHOODS),
+            "city": self.city_name(ws),
+            "rooms": rooms,
+            "suites": rng.randint(1, rooms),
+            "area": rng.randint(28, 320),
+            "vagas": rng.randint(1, 3),
+            "year": self.anchor.year + rng.randint(0, 3),
+        }
+        lines = [rng.choice(OPENINGS).format(**values)]
+        lines += [feature.format(**values) for feature in rng.sample(FEATURES, rng.randint(0, 3))]
+        lines.append(rng.choice(CALLS_TO_ACTION))
+        if rng.random() < 0.3:
+            lines.append("".join(rng.choices(EMOJIS, k=rng.randint(1, 4))))
+
+        text = "\n".join(line for line in lines if line)
+        hashtags = self._hashtags(rng, ws)
+        return f"{text}\n\n{' '.join(hashtags)}" if hashtags else text
+
+    def post(self, kind: int, ws: int, index: int) -> dict:
+        """
+        Atributos de uma publicação (determinísticos).
+
+        Stories compartilhados e cópias no Facebook herdam a conta, o tipo
+        de mídia e a legenda do post de origem (mesmo índice).
+        """
+        if kind in (SHARED_STORY_KIND, FACEBOOK_KIND):
+            source = self.post(POST_KIND, ws, index)
+            if kind == SHARED_STORY_KIND:
+                return dict(source, post_type="STORY", media_type="VIDEO")
+            return source
+
+        rng = self._rng("post", kind, ws, index)
+        if kind == STORY_KIND:
+            post_type, media_type = "STORY", rng.choice(["IMAGE", "VIDEO"])
+        else:
+            post_type, media_type = self._post_types[
+                bisect.bisect_left(self._post_type_weights, rng.random() * self._post_type_weights[-1])
+            ]
+        return {
+            "account": rng.randrange(self.accounts_per_city),
+            "post_type": post_type,
+            "media_type": media_type,
+            "caption": "" if kind == STORY_KIND else self.caption(rng, ws),
+            "shared_to_story": post_type == "REELS" and rng.random() < SHARED_TO_STORY_RATE,
+            "facebook": kind == POST_KIND and rng.random() < FACEBOOK_RATE,
+            "ghost": rng.random() < GHOST_POSTING_RATE,
+        }
+
+    def followers(self, ws: int, k: int) -> int:
+        """Seguidores da conta (log-normal)."""
+        rng = self._rng("followers", ws, k)
+        return max(int(rng.lognormvariate(math.log(FOLLOWERS_MEDIAN), FOLLOWERS_SIGMA)), 50)
+
+    def metrics(self, media_id: str) -> Optional[dict]:
+        """
+        Métricas de uma publicação (getPlannerAnalytics).
+
+        Returns:
+            Item de analytics, ou None para posts sem dados na API
+        """
+        parsed = self._parse_media_id(media_id)
+        if parsed is None or parsed[1] >= self.cities:
+            return None
+        kind, ws, index = parsed
+        rng = self._rng("metrics", media_id)
+        if rng.random() < MISSING_ANALYTICS_RATE:
+            return None
+
+        post = self.post(kind, ws, index)
+        is_video = post["media_type"] == "VIDEO"
+        age_hours = (self.anchor - self.created_at(kind, index)).total_seconds() / 3600
+
+        expected = self.followers(ws, post["account"]) * REACH_MEDIAN_RATIO
+        if is_video:
+            expected *= VIDEO_REACH_BOOST
+        if kind in (STORY_KIND, SHARED_STORY_KIND):
+            expected *= 0.4
+        if rng.random() < VIRAL_RATE:
+            expected *= rng.uniform(10, 60)
+        expected *= min(1.0, 0.3 + age_hours / MATURITY_HOURS)
+
+        reach = max(int(expected * rng.lognormvariate(0, REACH_SIGMA)), 1)
+        likes = int(reach * rng.betavariate(2, 60))
+        item = {
+            "id": str(media_id),
+            "likes": likes,
+            "comments": int(likes * rng.betavariate(1.2, 30)),
+            "shares": int(likes * rng.betavariate(1, 25)),
+            "saves": int(likes * rng.betavariate(1.5, 20)),
+            "reach": reach,
+            "impressions": int(reach * (1 + rng.lognormvariate(math.log(0.3), 0.5))),
+            "plays": int(reach * rng.uniform(1.1, 2.2)) if is_video else 0,
+            "media_type": post["media_type"],
+        }
+        if is_video:
+            duration = round(rng.uniform(7, 90), 1)
+            item["video_duration"] = duration
+            item["avg_watch_time"] = round(duration * rng.betavariate(2, 3), 1)
+            item["total_time_watched"] = int(item["plays"] * item["avg_watch_time"])
+        if kind in (STORY_KIND, SHARED_STORY_KIND):
+            item.update(
+                taps_forward=int(reach * rng.uniform(0.3, 0.7)),
+                taps_back=int(reach * rng.uniform(0.01, 0.05)),
+                exits=int(reach * rng.uniform(0.05, 0.15)),
+                replies=int(reach * rng.uniform(0.0, 0.01)),
+            )
+        return item
+
+    def preview(self, kind: int, ws: int, index: int) -> dict:
+        """Plano completo (plan/preview)."""
+        post = self.post(kind, ws, index)
+        account = self.account(ws, post["account"])
+        media_id = self.media_id(kind, ws, index)
+        created = self.created_at(kind, index).strftime(DATE_FORMAT)
+        is_video = post["media_type"] == "VIDEO"
+
+        posting = {
+            "posted_id": media_id,
+            "platform_type": "Instagram",
+            "published_post_type": post["post_type"],
+            "platform": account["name"],
+            "platform_id": account["platform_identifier"],
+            "link": f"https://www.instagram.com/p/{media_id}/",
+            "stories": [],
+        }
+        if post["shared_to_story"]:
+            story_id = self.media_id(SHARED_STORY_KIND, ws, index)
+            posting["stories"].append({
+                "id": story_id,
+                "preview": f"https://cdn.example.com/stories/{story_id}.jpg",
+                "link": f"https://www.instagram.com/stories/{account['name']}/{story_id}/",
+            })
+
+        postings = [posting]
+        if post["facebook"]:
+            facebook_id = self.media_id(FACEBOOK_KIND, ws, index)
+            postings.append(dict(
+                posting, posted_id=facebook_id, platform_type="Facebook", published_post_type="POST",
+                platform_id=f"fb{account['platform_identifier']}", stories=[],
+                link=f"https://www.facebook.com/{account['name']}/posts/{facebook_id}",
+            ))
+        if post["ghost"]:
+            postings.append(dict(
+                posting, platform=f"{account['name']}.antigo", platform_id="17841399999999999",
+                posted_id=f"9{media_id[1:]}", stories=[],
+            ))
+
+        multimedia = []
+        if post["media_type"] == "CAROUSEL_ALBUM":
+            multimedia = [{"name": f"foto_{index}_{i}.jpg"} for i in range(1, 4)]
+        return {
+            "_id": self.plan_id(kind, ws, index),
+            "common_sharing_details": {
+                "message": post["caption"],
+                "title": "",
+                "video": {"name": f"video_{index}.mp4"} if is_video else {},
+                "multimedia": multimedia,
+                "image": [] if is_video else [f"https://cdn.example.com/{media_id}.jpg"],
+            },
+            "execution_time": {"date": created},
+            "updated_at": created,
+            "posting": postings,
+        }
+
+    # =========================================================================
+    # ENDPOINTS
+    # =========================================================================
+    def __call__(self, method: str, url: str, params: dict = None, payload=None) -> ReplayResponse:
+        """Responde uma requisição (interface de handler do replay.serve_http)."""
+        route = self._routes.get(urlparse(url).path)
+        if route is None:
+            return ReplayResponse.from_json(404, {"message": "Not Found"}, url)
+        status, body = route(params or {}, payload if isinstance(payload, dict) else {})
+        cookies = {"mycreator_session": "synthetic"} if route == self._login else None
+        return ReplayResponse.from_json(status, body, url, cookies)
+
+    def _login(self, params: dict, payload: dict):
+        return 200, {"token": "synthetic-token"}
+
+    def _social_accounts(self, params: dict, payload: dict):
+        ws = self._workspace_index(payload.get("workspace_id"))
+        if ws is None:
+            return 404, {"message": "Workspace not found"}
+        accounts = [self.account(ws, k) for k in range(self.accounts_per_city)]
+        return 200, {"instagram": {"accounts": accounts}}
+
+    def _plans(self, params: dict, payload: dict):
+        ws = self._workspace_index(payload.get("workspace_id"))
+        if ws is None:
+            return 404, {"message": "Workspace not found"}
+        kind = STORY_KIND if "story" in (payload.get("type") or []) else POST_KIND
+        total = self.stories_per_city if kind == STORY_KIND else self.posts_per_city
+        limit = max(int(payload.get("limit") or 0), 0) or total
+        start = (max(int(payload.get("page") or 1), 1) - 1) * limit
+
+        plans = [
+            {
+                "_id": self.plan_id(kind, ws, index),
+                "post_created_at": self.created_at(kind, index).strftime(DATE_FORMAT),
+            }
+            for index in range(start, min(start + limit, total))
+        ]
+        return 200, {"plans": plans}
+
+    def _preview(self, params: dict, payload: dict):
+        parsed = self._parse_plan_id(params.get("id", ""))
+        ws = self._workspace_index(params.get("workspace_id"))
+        if parsed is None or ws is None or parsed[1] != ws or parsed[0] not in (POST_KIND, STORY_KIND):
+            return 404, {"message": "Plan not found"}
+        kind, ws, index = parsed
+        total = self.stories_per_city if kind == STORY_KIND else self.posts_per_city
+        if index >= total:
+            return 404, {"message": "Plan not found"}
+        return 200, {"plan": self.preview(kind, ws, index)}
+
+    def _analytics(self, params: dict, payload: dict):
+        post_ids = payload.get("all_post_ids") or [payload.get("id")]
+        items = [item for item in map(self.metrics, post_ids) if item is not None]
+        if len(post_ids) <= 1:
+            return 200, (items[0] if items else {})
+        if self.per_id_batches:
+            return 200, items
+        return 200, _aggregate(items)
+
+    def _summary_for(self, ws: int, k: int) -> dict:
+        followers = self.followers(ws, k)
+        rng = self._rng("summary", ws, k)
+        reach = int(followers * rng.lognormvariate(math.log(1.5), 0.5))
+        engagement = int(reach * rng.betavariate(2, 40))
+        return {
+            "followers": followers,
+            "posts": rng.randint(10, 60),
+            "engagement": engagement,
+            "engagement_rate": round(100 * engagement / max(reach, 1), 2),
+            "reach": reach,
+            "impressions": int(reach * rng.uniform(1.1, 1.6)),
+        }
+
+    def _summary(self, params: dict, payload: dict):
+        found = {}
+        for platform_identifier in payload.get("instagram_accounts") or []:
+            account = self._account_by_identifier(platform_identifier)
+            if account is not None:
+                found[str(platform_identifier)] = self._summary_for(*account)
+        if len(found) == 1:
+            return 200, {"summary": next(iter(found.values()))}
+        if not self.per_id_batches:
+            return 200, {"summary": _aggregate(found.values())}
+        return 200, {"accounts": {key: {"summary": value} for key, value in found.items()}}
+
+    def _audience_growth(self, params: dict, payload: dict):
+        account = self._account_by_identifier((payload.get("accounts") or [""])[0])
+        if account is None:
+            return 200, {"overview": {"audience_growth": {"buckets": [], "followers": [], "followers_daily": []}}}
+
+        try:
+            start, end = (datetime.strptime(part.strip(), "%Y-%m-%d") for part in payload["date"].split(" - "))
+        except (KeyError, ValueError):
+            return 422, {"message": "Invalid date"}
+
+        days = (end - start).days + 1
+        current = self.followers(*account)
+        rng = self._rng("growth", *account)
+        trend = current * rng.uniform(-0.0005, 0.003)  # Crescimento diário típico da conta
+        daily = [int(round(rng.gauss(trend, max(abs(trend), 2) * 1.5))) for _ in range(days)]
+        followers = [current - sum(daily[i + 1:]) for i in range(days)]
+
+        # Contas conectadas há pouco tempo: dias iniciais sem dados (zeros)
+        missing = rng.randint(1, days - 1) if days > 1 and rng.random() < 0.1 else 0
+        followers[:missing] = [0] * missing
+        daily[:missing] = [0] * missing
+        if missing < days:
+            daily[missing] = followers[missing]  # A API devolve o total no primeiro dia
+
+        return 200, {"overview": {"audience_growth": {
+            "buckets": [(start + timedelta(days=i)).strftime("%Y-%m-%d") for i in range(days)],
+            "followers": followers,
+            "followers_daily": daily,
+        }}}
+
+    def _top_posts(self, params: dict, payload: dict):
+        account = self._account_by_identifier((payload.get("accounts") or [""])[0])
+        if account is None:
+            return 200, {"top_posts": []}
+        ws, k = account
+        name = self.account(ws, k)["name"]
+
+        posts = []
+        for index in range(min(self.posts_per_city, TOP_POSTS_WINDOW)):
+            post = self.post(POST_KIND, ws, index)
+            media_id = self.media_id(POST_KIND, ws, index)
+            metrics = self.metrics(media_id) if post["account"] == k else None
+            if metrics is None:
+                continue
+            engagement = metrics["likes"] + metrics["comments"] + metrics["saves"] + metrics["shares"]
+            posts.append({
+                "media_id": media_id,
+                "post_created_at": self.created_at(POST_KIND, index).strftime(DATE_FORMAT),
+                "like_count": metrics["likes"],
+                "comments_count": metrics["comments"],
+                "saved": metrics["saves"],
+                "shares": metrics["shares"],
+                "reach": metrics["reach"],
+                "impressions": metrics["impressions"],
+                "total_engagement": engagement,
+                "media_type": post["media_type"],
+                "caption": post["caption"],
+                "permalink": f"https://www.instagram.com/p/{media_id}/",
+                "name": name,
+            })
+
+        posts.sort(key=lambda p: p["total_engagement"], reverse=True)
+        return 200, {"top_posts": posts[:TOP_POSTS_LIMIT]}
+
+    # =========================================================================
+    # GRAVAÇÃO EM DISCO
+    # =========================================================================
+    def iter_records(self) -> Iterator[dict]:
+        """
+        Percorre o conjunto inteiro, um registro por vez (memória constante).
+
+        Yields:
+            {"type": "workspace", ...} com contas e resumos, seguido de um
+            {"type": "plan", ...} por plano (preview + analytics por posted_id)
+        """
+        for ws in range(self.cities):
+            accounts = [self.account(ws, k) for k in range(self.accounts_per_city)]
+            yield {
+                "type": "workspace",
+                "id": self.workspace_id(ws),
+                "name": self.city_name(ws),
+                "accounts": accounts,
+                "summaries": {acc["platform_identifier"]: self._summary_for(ws, k)
+                              for k, acc in enumerate(accounts)},
+            }
+            for kind, total in ((POST_KIND, self.posts_per_city), (STORY_KIND, self.stories_per_city)):
+                for index in range(total):
+                    plan = self.preview(kind, ws, index)
+                    posted_ids = [p["posted_id"] for p in plan["posting"]]
+                    posted_ids += [s["id"] for p in plan["posting"] for s in p["stories"]]
+                    yield {
+                        "type": "plan",
+                        "workspace_id": self.workspace_id(ws),
+                        "plan": plan,
+                        "analytics": {pid: self.metrics(pid) for pid in posted_ids},
+                    }
+
+    def dump(self, path: str, log_every: int = 100_000) -> int:
+        """
+        Grava iter_records em JSONL (gzip se o caminho terminar em .gz).
+
+        Args:
+            path: Arquivo de saída
+            log_every: Registra o progresso a cada N planos
+
+        Returns:
+            Número de planos gravados
+        """
+        opener = gzip.open if str(path).endswith(".gz") else open
+        plans = 0
+        started = time.perf_counter()
+        with opener(path, "wt", encoding="utf-8") as f:
+            for record in self.iter_records():
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+                if record["type"] == "plan":
+                    plans += 1
+                    if log_every and plans % log_every == 0:
+                        rate = plans / (time.perf_counter() - started)
+                        logger.info(f"🧪 {plans:,} planos gravados ({rate:,.0f}/s)")
+        return plans
+
+
+# =============================================================================
+# SERVIDOR HTTP LOCAL
+# =============================================================================
+class _SyntheticRequestHandler(BaseHTTPRequestHandler):
+    """Traduz requisições HTTP para a SyntheticAPI do servidor."""
+
+    protocol_version = "HTTP/1.1"  # Keep-alive (sessões curl_cffi reaproveitam a conexão)
+    disable_nagle_algorithm = True  # Headers e corpo saem em escritas separadas
+
+    def do_GET(self):
+        self._respond("GET", dict(parse_qsl(urlparse(self.path).query)), None)
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        try:
+            payload = json.loads(self.rfile.read(length) or b"null")
+        except ValueError:
+            payload = None
+        self._respond("POST", {}, payload)
+
+    def _respond(self, method: str, params: dict, payload):
+        if self.server.latency > 0:
+            time.sleep(self.server.latency * random.lognormvariate(0, 0.5))
+
+        response = self.server.api(method, self.path, params, payload)
+        self.send_response(response.status_code)
+        for name, value in response.headers.items():
+            self.send_header(name, value)
+        for name, value in response.cookies.items():
+            self.send_header("Set-Cookie", f"{name}={value}; Path=/")
+        self.send_header("Content-Length", str(len(response.content)))
+        self.end_headers()
+        self.wfile.write(response.content)
+
+    def log_message(self, format, *args):
+        logger.debug(f"🧪 {self.address_string()} {format % args}")
+
+
+class SyntheticServer(ThreadingHTTPServer):
+    """
+    Servidor HTTP local com a SyntheticAPI.
+
+    Aponte o ETL para ele com MYCREATOR_BASE_URL=server.url (requisições
+    passam pelo curl_cffi de verdade, como em produção).
+    """
+
+    daemon_threads = True
+
+    def __init__(self, api: SyntheticAPI, host: str = "127.0.0.1", port: int = 0, latency: float = 0.0):
+        """
+        Args:
+            api: API sintética
+            host: Interface
+            port: Porta (0 = livre, escolhida pelo sistema)
+            latency: Latência mediana por resposta, em segundos (log-normal)
+        """
+        super().__init__((host, port), _SyntheticRequestHandler)
+        self.api = api
+        self.latency = latency
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "SyntheticServer":
+        """Atende em segundo plano (thread daemon)."""
+        self._thread = threading.Thread(target=self.serve_forever, name="synthetic-api", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+    def __enter__(self) -> "SyntheticServer":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
@@ -0,0 +1,404 @@
+"""
+Módulo de Controle de Taxa (Throttle) do ETL.
+
+Substitui as pausas fixas (time.sleep) entre chamadas por:
+
+- RateLimiter: token bucket por host, com orçamentos opcionais por
+  endpoint, seguro para múltiplas threads. É adaptativo: um 429 reduz a
+  taxa pela metade e respostas bem-sucedidas a recuperam aos poucos.
+- RetryPolicy: backoff exponencial com jitter em 429/5xx, respeitando o
+  header Retry-After quando presente.
+- ThrottleStats: contadores do tempo gasto aguardando, compartilhados
+  entre a API MyCreator e o Google Sheets.
+"""
+
+import asyncio
+import logging
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+from .metrics import RUN_METRICS
+
+logger = logging.getLogger("mycreator_etl")
+
+# Status HTTP que indicam sobrecarga ou falha transitória do servidor
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+# Status em que o servidor recusou a requisição sem aplicá-la: seguro
+# reenviar mesmo operações não idempotentes (append, disparo de job).
+# Em 5xx e falhas de conexão a requisição pode já ter sido aplicada.
+REJECTED_STATUSES = frozenset({429})
+
+
+class ThrottleStats:
+    """Contadores de throttling da execução (thread-safe)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.rate_limited_seconds = 0.0  # Espera por token (limite local)
+        self.backoff_seconds = 0.0  # Espera entre retentativas
+        self.retries = 0
+        self.throttled_responses = 0  # Respostas 429 recebidas
+        self.per_key: Dict[str, float] = {}
+
+    def record_wait(self, key: str, seconds: float):
+        """Registra espera do rate limiter local."""
+        if seconds <= 0:
+            return
+        with self._lock:
+            self.rate_limited_seconds += seconds
+            self.per_key[key] = self.per_key.get(key, 0.0) + seconds
+
+    def record_backoff(self, key: str, seconds: float, status: Optional[int] = None):
+        """Registra uma retentativa e o backoff aplicado."""
+        with self._lock:
+            self.retries += 1
+            self.backoff_seconds += seconds
+            self.per_key[key] = self.per_key.get(key, 0.0) + seconds
+            if status == 429:
+                self.throttled_responses += 1
+        RUN_METRICS.increment("retries", key)
+
+    @property
+    def total_seconds(self) -> float:
+        return self.rate_limited_seconds + self.backoff_seconds
+
+    def to_dict(self) -> dict:
+        """Resumo serializável (relatório da execução)."""
+        with self._lock:
+            return {
+                "rate_limited_seconds": round(self.rate_limited_seconds, 2),
+                "backoff_seconds": round(self.backoff_seconds, 2),
+                "retries": self.retries,
+                "throttled_responses": self.throttled_responses,
+                "seconds_by_key": {key: round(s, 2) for key, s in sorted(self.per_key.items())},
+            }
+
+    def log_summary(self):
+        """Loga o resumo do tempo gasto em throttling."""
+        logger.info(
+            f"⏳ Throttling: {self.total_seconds:.1f}s "
+            f"(rate limit {self.rate_limited_seconds:.1f}s | backoff {self.backoff_seconds:.1f}s) | "
+            f"{self.retries} retentativas | {self.throttled_responses} respostas 429"
+        )
+        for key, seconds in sorted(self.per_key.items(), key=lambda kv: -kv[1])[:5]:
+            logger.debug(f"   ⏳ {key}: {seconds:.1f}s")
+
+
+# Contadores globais da execução (API MyCreator + Google Sheets)
+THROTTLE_STATS = ThrottleStats()
+
+
+class TokenBucket:
+    """
+    Balde de tokens thread-safe.
+
+    Libera até `rate` requisições por segundo, com rajadas de até
+    `burst` requisições quando o balde está cheio.
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        """
+        Inicializa o balde.
+
+        Args:
+            rate: Tokens repostos por segundo (<= 0 desativa o limite)
+            burst: Capacidade máxima do balde
+        """
+        self.rate = rate
+        self.base_rate = rate
+        self.capacity = max(1, burst)
+        self._tokens = float(self.capacity)
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _try_take(self) -> float:
+        """
+        Tenta consumir um token sem bloquear.
+
+        Returns:
+            float: 0 se consumiu, senão os segundos até o próximo token
+        """
+        with self._lock:
+            now = time.monotonic()
+            elapsed = now - self._updated_at
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+            self._updated_at = now
+
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+
+            return (1 - self._tokens) / self.rate
+
+    def acquire(self) -> float:
+        """
+        Consome um token, bloqueando até que haja um disponível.
+
+        Returns:
+            float: Segundos aguardados
+        """
+        if self.rate <= 0:
+            return 0.0
+
+        waited = 0.0
+        while True:
+            wait = self._try_take()
+            if wait <= 0:
+                return waited
+            time.sleep(wait)
+            waited += wait
+
+    async def acquire_async(self) -> float:
+        """Versão assíncrona de acquire() (não bloqueia o event loop)."""
+        if self.rate <= 0:
+            return 0.0
+
+        waited = 0.0
+        while True:
+            wait = self._try_take()
+            if wait <= 0:
+                return waited
+            await asyncio.sleep(wait)
+            waited += wait
+
+    def slow_down(self, factor: float = 0.5, floor: float = 0.1):
+        """Reduz a taxa (após um 429), sem descer abaixo de `floor` req/s."""
+        if self.base_rate <= 0:
+            return
+        with self._lock:
+            self.rate = max(min(floor, self.base_rate), self.rate * factor)
+
+    def recover(self, step: float = 0.05):
+        """Recupera a taxa em `step` da taxa original, até atingi-la."""
+        if self.base_rate <= 0 or self.rate >= self.base_rate:
+            return
+        with self._lock:
+            self.rate = min(self.base_rate, self.rate + self.base_rate * step)
+
+
+class RateLimiter:
+    """
+    Limitador de taxa adaptativo por host e por endpoint.
+
+    Toda requisição consome um token do balde do host (ex:
+    mycreator.myside.com.br); endpoints com orçamento próprio (ex:
+    {"/backend/plan/preview": 3}) consomem também um token do seu balde.
+    Os baldes são compartilhados entre todas as threads.
+    """
+
+    def __init__(self, rate_per_second: float, burst: int = 1,
+                 endpoint_budgets: Dict[str, float] = None, stats: ThrottleStats = None):
+        """
+        Inicializa o limitador.
+
+        Args:
+            rate_per_second: Requisições por segundo permitidas por host
+            burst: Rajada máxima por balde
+            endpoint_budgets: Requisições por segundo por path de endpoint
+            stats: Contadores de throttling (padrão: THROTTLE_STATS)
+        """
+        self.rate_per_second = rate_per_second
+        self.burst = burst
+        self.endpoint_budgets = endpoint_budgets or {}
+        self.stats = stats or THROTTLE_STATS
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def _bucket_for(self, key: str, rate: float) -> TokenBucket:
+        """Retorna (criando se necessário) o balde de uma chave."""
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = TokenBucket(rate, self.burst)
+                self._buckets[key] = bucket
+            return bucket
+
+    def _buckets_for(self, url: str) -> List[Tuple[str, TokenBucket]]:
+        """Baldes que uma requisição à URL consome (host e, se houver, endpoint)."""
+        parsed = urlparse(url)
+        buckets = [(parsed.netloc, self._bucket_for(parsed.netloc, self.rate_per_second))]
+        budget = self.endpoint_budgets.get(parsed.path)
+        if budget is not None:
+            buckets.append((parsed.path, self._bucket_for(parsed.path, budget)))
+        return buckets
+
+    def acquire(self, url: str) -> float:
+        """
+        Aguarda permissão para requisitar a URL.
+
+        Args:
+            url: URL completa da requisição
+
+        Returns:
+            float: Segundos aguardados
+        """
+        waited = 0.0
+        for key, bucket in self._buckets_for(url):
+            wait = bucket.acquire()
+            self.stats.record_wait(key, wait)
+            waited += wait
+        if waited > 0:
+            logger.debug(f"⏳ Rate limit ({urlparse(url).path}): aguardou {waited:.2f}s")
+        return waited
+
+    async def acquire_async(self, url: str) -> float:
+        """Versão assíncrona de acquire()."""
+        waited = 0.0
+        for key, bucket in self._buckets_for(url):
+            wait = await bucket.acquire_async()
+            self.stats.record_wait(key, wait)
+            waited += wait
+        if waited > 0:
+            logger.debug(f"⏳ Rate limit ({urlparse(url).path}): aguardou {waited:.2f}s")
+        return waited
+
+    def penalize(self, url: str):
+        """Reduz a taxa dos baldes da URL (chamado ao receber 429)."""
+        for key, bucket in self._buckets_for(url):
+            bucket.slow_down()
+            logger.debug(f"🐢 Rate limit reduzido ({key}): {bucket.rate:.2f} req/s")
+
+    def reward(self, url: str):
+        """Recupera gradualmente a taxa dos baldes da URL após sucesso."""
+        for _, bucket in self._buckets_for(url):
+            bucket.recover()
+
+
+def parse_endpoint_budgets(spec: str) -> Dict[str, float]:
+    """
+    Converte "path=rps,path=rps" em dict.
+
+    Ex: "/backend/plan/preview=3,/backend/analytics/overview/getSummary=2"
+    """
+    budgets = {}
+    for part in (spec or "").split(","):
+        if not part.strip():
+            continue
+        path, sep, rate = part.partition("=")
+        if not sep:
+            raise ValueError(f"❌ Orçamento de endpoint inválido: {part!r} (use path=rps)")
+        budgets[path.strip()] = float(rate)
+    return budgets
+
+
+def parse_retry_after(value) -> Optional[float]:
+    """
+    Interpreta o header Retry-After (segundos ou data HTTP).
+
+    Returns:
+        Segundos a aguardar, ou None se ausente/inválido
+    """
+    if value is None or value == "":
+        return None
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        pass
+    try:
+        retry_at = parsedate_to_datetime(str(value))
+        return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+
+class RetryPolicy:
+    """Backoff exponencial com jitter ("full jitter") para 429/5xx."""
+
+    def __init__(self, max_retries: int = 4, base_delay: float = 1.0, max_delay: float = 60.0,
+                 statuses=RETRY_STATUSES):
+        """
+        Inicializa a política.
+
+        Args:
+            max_retries: Retentativas após a primeira tentativa
+            base_delay: Atraso base (segundos) da primeira retentativa
+            max_delay: Teto do atraso (inclusive para Retry-After)
+            statuses: Status HTTP que disparam retentativa
+        """
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.statuses = frozenset(statuses)
+
+    def only(self, statuses) -> "RetryPolicy":
+        """Mesma política, retentando só os status dados (ex: REJECTED_STATUSES)."""
+        return RetryPolicy(self.max_retries, self.base_delay, self.max_delay, statuses)
+
+    def should_retry(self, status_code: Optional[int], attempt: int) -> bool:
+        """Indica se deve retentar (attempt = tentativas já falhas - 1)."""
+        return status_code in self.statuses and attempt < self.max_retries
+
+    def delay_for(self, attempt: int, retry_after=None) -> float:
+        """
+        Atraso antes da próxima tentativa.
+
+        Args:
+            attempt: Tentativa que falhou (0 = primeira)
+            retry_after: Valor do header Retry-After (tem prioridade)
+
+        Returns:
+            float: Segundos a aguardar
+        """
+        server_delay = parse_retry_after(retry_after)
+        if server_delay is not None:
+            return min(self.max_delay, server_delay)
+        ceiling = min(self.max_delay, self.base_delay * (2 ** attempt))
+        return random.uniform(0, ceiling)
+
+
+def call_with_retry(func: Callable, policy: RetryPolicy, key: str,
+                    limiter: RateLimiter = None, url: str = None, stats: ThrottleStats = None):
+    """
+    Executa uma chamada de biblioteca (ex: gspread) com rate limit e backoff.
+
+    Retenta exceções que carregam uma resposta HTTP (atributo `response`,
+    como gspread.exceptions.APIError) com status retentável, respeitando
+    o Retry-After dessa resposta.
+
+    Args:
+        func: Função sem argumentos a executar
+        policy: Política de retentativa
+        key: Rótulo para logs e contadores (ex: "sheets:update")
+        limiter: Rate limiter consultado antes de cada tentativa
+        url: URL usada para escolher os baldes do limiter
+        stats: Contadores (padrão: THROTTLE_STATS)
+
+    Returns:
+        Retorno de func()
+    """
+    stats = stats or THROTTLE_STATS
+    attempt = 0
+    while True:
+        if limiter and url:
+            limiter.acquire(url)
+        try:
+            result = func()
+        except Exception as e:
+            response = getattr(e, "response", None)
+            status = getattr(response, "status_code", None)
+            if not policy.should_retry(status, attempt):
+                raise
+
+            headers = getattr(response, "headers", None) or {}
+            delay = policy.delay_for(attempt, headers.get("Retry-After"))
+            if status == 429 and limiter and url:
+                limiter.penalize(url)
+
+            stats.record_backoff(key, delay, status)
+            logger.warning(
+                f"⏳ {key}: HTTP {status}, nova tentativa em {delay:.1f}s "
+                f"({attempt + 1}/{policy.max_retries})"
+            )
+            time.sleep(delay)
+            attempt += 1
+            continue
+
+        if limiter and url:
+            limiter.reward(url)
+        return result
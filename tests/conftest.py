@@ -0,0 +1,25 @@
+"""
+Ambiente offline comum aos testes: credenciais fictícias, sem espera entre
+requisições/retentativas e sem cache ou estado em disco.
+
+Cada arquivo sobrescreve `offline_env` só com o que é específico dele
+(ex: PAGE_SIZE, SHEETS_CHUNK_ROWS).
+"""
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def offline_env(monkeypatch):
+    for name, value in {
+        "MYCREATOR_COOKIE": "offline",
+        "MYCREATOR_TOKEN": "Bearer offline",
+        "GOOGLE_SHEET_ID": "offline",
+        "RATE_LIMIT_RPS": "0",
+        "SHEETS_RATE_LIMIT_RPS": "0",
+        "RETRY_BASE_DELAY": "0",
+        "INCREMENTAL_MODE": "false",
+        "HTTP_CACHE_DIR": "",
+        "ACCOUNTS_CACHE_PATH": "",
+    }.items():
+        monkeypatch.setenv(name, value)
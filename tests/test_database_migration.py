@@ -0,0 +1,149 @@
+"""
+Migração da tabela legada (to_sql, chave antiga) para o esquema gerenciado.
+
+Sem PostgreSQL no ambiente de teste: um cursor falso registra o SQL emitido
+e os testes conferem a sequência de comandos.
+"""
+
+import pandas as pd
+from psycopg2 import sql
+
+from src.database import TABLE_SCHEMAS, SupabaseDatabase
+
+
+def _render(query) -> str:
+    """SQL composto (psycopg2.sql) como texto, sem precisar de conexão."""
+    if isinstance(query, str):
+        return query
+    if isinstance(query, sql.Composed):
+        return "".join(_render(part) for part in query.seq)
+    if isinstance(query, sql.Identifier):
+        return ".".join(f'"{name}"' for name in query.strings)
+    return query.string
+
+
+class FakeCursor:
+    """Cursor que registra os comandos; o SELECT em pg_constraint devolve `primary_key`."""
+
+    def __init__(self, primary_key):
+        self.primary_key = primary_key
+        self.statements = []
+        self.copied = ""
+        self.rowcount = 0
+
+    def execute(self, query, params=None):
+        self.statements.append(_render(query))
+        self.rowcount = 1
+
+    def fetchall(self):
+        return list(self.primary_key)
+
+    def copy_expert(self, query, stream):
+        self.statements.append(_render(query))
+        self.copied = stream.read()
+
+
+class FakeConnection:
+    def __init__(self, cursor):
+        self._cursor = cursor
+        self.committed = False
+        self.rolled_back = False
+
+    def cursor(self):
+        return self._cursor
+
+    def commit(self):
+        self.committed = True
+
+    def rollback(self):
+        self.rolled_back = True
+
+    def close(self):
+        pass
+
+
+class FakeEngine:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def raw_connection(self):
+        return self.conn
+
+
+LEGACY_KEY = [("seguidores_history_pkey", "data"), ("seguidores_history_pkey", "perfil")]
+
+
+def test_replaces_legacy_primary_key():
+    cursor = FakeCursor(LEGACY_KEY)
+
+    SupabaseDatabase._ensure_table(cursor, "seguidores_history", TABLE_SCHEMAS["seguidores_history"])
+
+    create, select, *migration = cursor.statements
+    assert create.startswith('CREATE TABLE IF NOT EXISTS "seguidores_history"')
+    assert "pg_constraint" in select
+    assert migration[0] == 'ALTER TABLE "seguidores_history" DROP CONSTRAINT "seguidores_history_pkey"'
+    assert migration[1:6] == [
+        f'ALTER TABLE "seguidores_history" ADD COLUMN IF NOT EXISTS "{name}" {pg_type}'
+        for name, pg_type in TABLE_SCHEMAS["seguidores_history"].columns
+    ]
+    assert migration[6] == (
+        'DELETE FROM "seguidores_history" WHERE "data" IS NULL OR "cidade" IS NULL OR "perfil" IS NULL'
+    )
+    assert migration[7] == (
+        'DELETE FROM "seguidores_history" a USING "seguidores_history" b WHERE a.ctid < b.ctid '
+        'AND a."data" = b."data" AND a."cidade" = b."cidade" AND a."perfil" = b."perfil"'
+    )
+    assert migration[8] == 'ALTER TABLE "seguidores_history" ADD PRIMARY KEY ("data", "cidade", "perfil")'
+    assert len(migration) == 9
+
+
+def test_table_without_primary_key_skips_drop():
+    # Tabela criada pelo to_sql: não há restrição a remover
+    cursor = FakeCursor([])
+
+    SupabaseDatabase._ensure_table(cursor, "seguidores_history", TABLE_SCHEMAS["seguidores_history"])
+
+    assert not any("DROP CONSTRAINT" in statement for statement in cursor.statements)
+    assert cursor.statements[-1] == 'ALTER TABLE "seguidores_history" ADD PRIMARY KEY ("data", "cidade", "perfil")'
+
+
+def test_current_schema_is_left_alone():
+    cursor = FakeCursor([("seguidores_history_pkey", name) for name in ["data", "cidade", "perfil"]])
+
+    SupabaseDatabase._ensure_table(cursor, "seguidores_history", TABLE_SCHEMAS["seguidores_history"])
+
+    assert len(cursor.statements) == 2
+    assert not any(statement.startswith(("ALTER", "DELETE")) for statement in cursor.statements)
+
+
+def test_upsert_with_delete_missing_after_migration():
+    cursor = FakeCursor(LEGACY_KEY)
+    conn = FakeConnection(cursor)
+    db = SupabaseDatabase("postgresql://offline")
+    db.engine = FakeEngine(conn)
+    # O mesmo perfil em duas cidades no mesmo dia: com a chave antiga, colidiam
+    df = pd.DataFrame({
+        "data": ["01/01/2026", "01/01/2026"],
+        "cidade": ["Florianópolis", "Curitiba"],
+        "perfil": ["myside", "myside"],
+        "seguidores": [100, 200],
+        "variacao_diaria": [1, 2],
+    })
+
+    db.upsert(df, "seguidores_history", delete_missing=True)
+
+    statements = cursor.statements
+    add_key = statements.index('ALTER TABLE "seguidores_history" ADD PRIMARY KEY ("data", "cidade", "perfil")')
+    insert = next(i for i, s in enumerate(statements) if s.startswith('INSERT INTO "seguidores_history"'))
+    delete = next(i for i, s in enumerate(statements) if s.startswith('DELETE FROM "seguidores_history" t'))
+    assert add_key < insert < delete
+    assert 'ON CONFLICT ("data", "cidade", "perfil") DO UPDATE SET' in statements[insert]
+    assert statements[delete].endswith(
+        'WHERE NOT EXISTS (SELECT 1 FROM "_staging_seguidores_history" s '
+        'WHERE s."data" = t."data" AND s."cidade" = t."cidade" AND s."perfil" = t."perfil")'
+    )
+    assert cursor.copied.splitlines() == [
+        "01/01/2026,Florianópolis,myside,100,1",
+        "01/01/2026,Curitiba,myside,200,2",
+    ]
+    assert conn.committed and not conn.rolled_back
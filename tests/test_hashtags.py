@@ -0,0 +1,40 @@
+"""
+HashtagIndex (HASHTAG_INDEX_PATH) contra a agregação em memória.
+
+A aba analise_hashtag tem de ser a mesma com ou sem o índice: posts que
+saíram da listagem não podem continuar nas somas.
+"""
+
+import pandas as pd
+
+from src.hashtags import HashtagIndex, hashtag_totals, to_hashtag_tab
+
+
+def _posts(rows) -> pd.DataFrame:
+    return pd.DataFrame(
+        [
+            {
+                "internal_id": internal_id, "external_id": f"ext_{internal_id}",
+                "workspace_name": "Curitiba", "published_at": "2026-01-10T12:00:00Z",
+                "caption": caption, "likes": likes, "comments": 1, "saves": 0,
+                "shares": 0, "reach": 10 * likes, "impressions": 20 * likes,
+            }
+            for internal_id, caption, likes in rows
+        ]
+    )
+
+
+def test_index_drops_posts_missing_from_the_run(tmp_path):
+    index = HashtagIndex(str(tmp_path / "hashtags.db"))
+    first = _posts([("p1", "#Imóveis #curitiba", 5), ("p2", "#imoveis", 3), ("p3", "#apagado", 7)])
+    # p3 apagado na rede e p2 com métricas novas
+    second = _posts([("p1", "#Imóveis #curitiba", 5), ("p2", "#imoveis", 4)])
+
+    index.update(first, delete_missing=True)
+    stats = index.update(second, delete_missing=True)
+    tab = to_hashtag_tab(index.totals())
+    index.close()
+
+    assert stats == {"new": 0, "changed": 1, "unchanged": 1, "removed": 1}
+    pd.testing.assert_frame_equal(tab, to_hashtag_tab(hashtag_totals(second)), check_dtype=False)
+    assert "apagado" not in tab["hashtag"].tolist()
@@ -0,0 +1,93 @@
+"""
+Paginação do fetchPlans contra a API sintética (modos síncrono e assíncrono).
+
+Uma página com erro ou menor que PAGE_SIZE não pode encerrar a listagem
+como se fosse a última, e um servidor que ignora `page` não pode prender a
+paginação em loop.
+"""
+
+import asyncio
+
+import pytest
+from curl_cffi import requests as curl_requests
+
+from src.async_extract import AsyncMyCreatorExtractor
+from src.config import get_config
+from src.extract import MyCreatorExtractor
+from src.replay import ReplayResponse, serve_http
+from src.synthetic import SyntheticAPI
+
+PLANS_PATH = "/backend/fetchPlans"
+
+
+@pytest.fixture(autouse=True)
+def offline_env(offline_env, monkeypatch):
+    for name, value in {
+        "POSTS_LIMIT": "0",
+        "PAGE_SIZE": "10",
+        "BACKFILL_SINCE": "",
+    }.items():
+        monkeypatch.setenv(name, value)
+
+
+async def _list_async(extractor: MyCreatorExtractor, workspace_id: str) -> list:
+    client = AsyncMyCreatorExtractor(extractor)
+    client._semaphore = asyncio.Semaphore(client.concurrency)
+    async with curl_requests.AsyncSession() as session:
+        client._session = session
+        return await client.fetch_posts_list(workspace_id)
+
+
+def _list_posts(handler, workspace_id: str, use_async: bool) -> list:
+    with serve_http(handler):
+        extractor = MyCreatorExtractor(get_config())
+        if use_async:
+            return asyncio.run(_list_async(extractor, workspace_id))
+        return extractor.fetch_posts_list(workspace_id)
+
+
+@pytest.fixture
+def api():
+    return SyntheticAPI(cities=1, posts_per_city=35)
+
+
+@pytest.mark.parametrize("use_async", [False, True])
+def test_lists_every_page(api, use_async):
+    plans = _list_posts(api, api.workspace_id(0), use_async)
+
+    assert [plan["_id"] for plan in plans] == [api.plan_id(0, 0, index) for index in range(35)]
+
+
+@pytest.mark.parametrize("use_async", [False, True])
+def test_page_error_raises_instead_of_truncating(api, use_async):
+    def handler(method, url, params=None, payload=None):
+        if url.endswith(PLANS_PATH) and payload.get("page") == 3:
+            return ReplayResponse.from_json(500, {"message": "boom"}, url)
+        return api(method, url, params, payload)
+
+    with pytest.raises(RuntimeError, match="página 3"):
+        _list_posts(handler, api.workspace_id(0), use_async)
+
+
+@pytest.mark.parametrize("use_async", [False, True])
+def test_server_page_cap_does_not_truncate(api, use_async):
+    def handler(method, url, params=None, payload=None):
+        if url.endswith(PLANS_PATH):
+            payload = dict(payload, limit=min(payload["limit"], 4))
+        return api(method, url, params, payload)
+
+    plans = _list_posts(handler, api.workspace_id(0), use_async)
+
+    assert [plan["_id"] for plan in plans] == [api.plan_id(0, 0, index) for index in range(35)]
+
+
+@pytest.mark.parametrize("use_async", [False, True])
+def test_stops_when_server_ignores_page(api, use_async):
+    def handler(method, url, params=None, payload=None):
+        if url.endswith(PLANS_PATH):
+            payload = dict(payload, page=1)
+        return api(method, url, params, payload)
+
+    plans = _list_posts(handler, api.workspace_id(0), use_async)
+
+    assert [plan["_id"] for plan in plans] == [api.plan_id(0, 0, index) for index in range(10)]
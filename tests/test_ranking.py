@@ -0,0 +1,73 @@
+"""
+top_posts_per_profile contra o loop anterior (máscaras + nlargest por grupo).
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.ranking import RANK_TYPES, SOURCES, top_posts_per_profile
+
+
+def _legacy_top_posts(df_combined: pd.DataFrame, n: int = 5) -> pd.DataFrame:
+    """Implementação anterior do run_etl.py (referência da saída esperada)."""
+    slices = []
+    for rank_tipo in RANK_TYPES:
+        for ws_name in df_combined['workspace'].dropna().unique():
+            for fonte in SOURCES:
+                mask = (
+                    (df_combined['workspace'] == ws_name) &
+                    (df_combined['rank_tipo'] == rank_tipo) &
+                    (df_combined['fonte'] == fonte)
+                )
+                for perfil in df_combined[mask]['perfil'].dropna().unique():
+                    subset = df_combined[mask & (df_combined['perfil'] == perfil)]
+                    top = subset.nlargest(n, 'valor_metrica')
+                    if not top.empty:
+                        slices.append(top)
+    return pd.concat(slices, ignore_index=True)
+
+
+def _candidates(n_rows: int, seed: int) -> pd.DataFrame:
+    """Candidatos com empates, valores ausentes, perfis/workspaces nulos e tipos desconhecidos."""
+    rng = np.random.default_rng(seed)
+    perfil = rng.choice([f"perfil_{i}" for i in range(12)], n_rows).astype(object)
+    perfil[rng.random(n_rows) < 0.05] = None
+    workspace = rng.choice(["Florianópolis", "Curitiba", "Goiânia"], n_rows).astype(object)
+    workspace[rng.random(n_rows) < 0.05] = None
+    valor = rng.integers(0, 20, n_rows).astype(float)
+    valor[rng.random(n_rows) < 0.15] = np.nan
+
+    return pd.DataFrame({
+        "rank_tipo": rng.choice(RANK_TYPES + ["outro"], n_rows),
+        "fonte": rng.choice(SOURCES, n_rows),
+        "workspace": workspace,
+        "perfil": perfil,
+        "valor_metrica": valor,
+        "link": [f"https://www.instagram.com/p/{i:011d}/" for i in range(n_rows)],
+    })
+
+
+@pytest.mark.parametrize("seed", range(5))
+@pytest.mark.parametrize("n", [1, 5])
+def test_matches_legacy_loop(seed, n):
+    df = _candidates(600, seed)
+
+    pd.testing.assert_frame_equal(top_posts_per_profile(df, n=n), _legacy_top_posts(df, n=n))
+
+
+def test_missing_values_only_fill_the_group():
+    # nlargest não descarta NaN: completa os N com as linhas sem valor, no fim
+    df = pd.DataFrame({
+        "rank_tipo": ["alcance"] * 4,
+        "fonte": ["mycreator"] * 4,
+        "workspace": ["Curitiba"] * 4,
+        "perfil": ["a", "b", "b", "b"],
+        "valor_metrica": [np.nan, np.nan, 3.0, 5.0],
+    })
+
+    result = top_posts_per_profile(df, n=2)
+
+    assert result["perfil"].tolist() == ["a", "b", "b"]
+    assert result["valor_metrica"].tolist()[1:] == [5.0, 3.0]
+    pd.testing.assert_frame_equal(result, _legacy_top_posts(df, n=2))
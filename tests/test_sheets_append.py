@@ -0,0 +1,70 @@
+"""
+Append em blocos retomado após falha (GoogleSheetsLoader._append_rows).
+
+append_rows não é idempotente: se a conexão cai depois de o bloco ser
+gravado, a retomada não pode reenviá-lo.
+"""
+
+import pandas as pd
+import pytest
+
+from src.config import get_config
+from src.load import GoogleSheetsLoader
+from src.replay import FakeSheetsClient
+
+
+@pytest.fixture
+def loader(monkeypatch):
+    monkeypatch.setenv("SHEETS_CHUNK_ROWS", "2")
+
+    loader = GoogleSheetsLoader(get_config())
+    loader.client = FakeSheetsClient()
+    assert loader.open_spreadsheet("dados")
+    assert loader.load(pd.DataFrame({"id": ["a", "b"]}), write_mode="overwrite")
+    return loader
+
+
+def _fail_once(worksheet, applied: bool):
+    """A segunda chamada de append_rows falha (depois ou antes de gravar o bloco)."""
+    original = worksheet.append_rows
+    calls = []
+
+    def append_rows(values, **kwargs):
+        calls.append(values)
+        if len(calls) == 2:
+            if applied:
+                original(values, **kwargs)
+            raise ConnectionError("connection reset")
+        return original(values, **kwargs)
+
+    worksheet.append_rows = append_rows
+    return calls
+
+
+@pytest.mark.parametrize("applied", [True, False])
+def test_streaming_append_resumes_without_duplicates(loader, applied):
+    calls = _fail_once(loader.worksheet, applied)
+    new_rows = pd.DataFrame({"id": ["c", "d", "e", "f", "g"]})
+
+    assert loader.append_rows(new_rows, existing_rows=3)
+
+    values = loader.worksheet.get_all_values()
+    assert [row[0] for row in values] == ["id", "a", "b", "c", "d", "e", "f", "g"]
+    assert len(calls) == (3 if applied else 4)
+
+
+@pytest.mark.parametrize("applied", [True, False])
+def test_append_mode_resumes_without_duplicates(loader, applied):
+    _fail_once(loader.worksheet, applied)
+
+    assert loader.load(pd.DataFrame({"id": ["c", "d", "e", "f", "g"]}), write_mode="append")
+
+    assert [row[0] for row in loader.worksheet.get_all_values()] == ["id", "a", "b", "c", "d", "e", "f", "g"]
+
+
+def test_append_without_row_count_does_not_resend(loader):
+    _fail_once(loader.worksheet, applied=True)
+
+    assert not loader.append_rows(pd.DataFrame({"id": ["c", "d", "e", "f", "g"]}))
+
+    assert [row[0] for row in loader.worksheet.get_all_values()] == ["id", "a", "b", "c", "d", "e", "f"]
@@ -0,0 +1,42 @@
+"""
+WRITE_MODE=diff (GoogleSheetsLoader._write_diff): chave comparada como
+texto e inserções no fim da aba.
+"""
+
+import pandas as pd
+import pytest
+
+from src.config import get_config
+from src.load import GoogleSheetsLoader
+from src.replay import FakeSheetsClient
+
+
+@pytest.fixture
+def loader():
+    loader = GoogleSheetsLoader(get_config())
+    loader.client = FakeSheetsClient()
+    assert loader.open_spreadsheet("dados")
+    return loader
+
+
+def _posts(ids, likes) -> pd.DataFrame:
+    return pd.DataFrame({"id_instagram": ids, "curtidas": likes})
+
+
+def test_long_ids_do_not_collide(loader, monkeypatch):
+    # Iguais como float (18 dígitos > 2^53), distintos como texto
+    ids = ["179123456789012345", "179123456789012346"]
+    assert loader.load(_posts(ids, [1, 2]), write_mode="overwrite")
+    monkeypatch.setattr(loader, "_write_overwrite", lambda data: pytest.fail("diff caiu para overwrite"))
+
+    assert loader.load(_posts(ids, [1, 3]), key_columns=["id_instagram"], write_mode="diff")
+
+    assert loader.worksheet.get_all_values()[1:] == [[ids[0], "1"], [ids[1], "3"]]
+
+
+def test_inserts_go_to_the_end(loader):
+    assert loader.load(_posts(["a", "b", "c"], [1, 2, 3]), write_mode="overwrite")
+
+    assert loader.load(_posts(["d", "a", "c"], [4, 1, 5]), key_columns=["id_instagram"], write_mode="diff")
+
+    assert loader.worksheet.get_all_values()[1:] == [["a", "1"], ["c", "5"], ["d", "4"]]